@@ -6,3 +6,23 @@ load_dotenv()
 MONGO_URL = os.getenv("MONGO_URL")
 MODEL_NAME = os.getenv("MODEL_NAME")
 API_URL = os.getenv("API_URL")
+
+# Mongo connection pool and timeouts
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# Background database health probe
+MONGO_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("MONGO_HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+MONGO_RECONNECT_INTERVAL_SECONDS = float(os.getenv("MONGO_RECONNECT_INTERVAL_SECONDS", "5"))
+
+# Which routers this process serves: "api-only", "transcription-worker" or "all"
+APP_ROLE_API = "api-only"
+APP_ROLE_TRANSCRIPTION_WORKER = "transcription-worker"
+APP_ROLE_ALL = "all"
+APP_ROLES = (APP_ROLE_API, APP_ROLE_TRANSCRIPTION_WORKER, APP_ROLE_ALL)
+APP_ROLE = os.getenv("APP_ROLE", APP_ROLE_ALL)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
 
 
-def create_router(prefix: str = "", tags: list = None) -> APIRouter:
-    return APIRouter(prefix=prefix, tags=tags or [])
+def create_router(prefix: str = "", tags: list = None, dependencies: list = None) -> APIRouter:
+    return APIRouter(prefix=prefix, tags=tags or [], dependencies=dependencies or [])
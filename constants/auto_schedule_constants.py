@@ -0,0 +1,11 @@
+# constants/auto_schedule_constants.py
+
+# Steps of a meeting's background auto-schedule workflow (meeting.auto_schedule.status)
+AUTO_SCHEDULE_PENDING = "pending"
+AUTO_SCHEDULE_ANALYZING = "analyzing"
+AUTO_SCHEDULE_SCHEDULING = "scheduling"
+AUTO_SCHEDULE_COMPLETED = "completed"
+AUTO_SCHEDULE_NO_ACTION = "no_action"
+AUTO_SCHEDULE_FAILED = "failed"
+
+AUTO_SCHEDULE_ACTIVE_STATUSES = [AUTO_SCHEDULE_PENDING, AUTO_SCHEDULE_ANALYZING, AUTO_SCHEDULE_SCHEDULING]
@@ -7,11 +7,17 @@ HTTP_CREATED = status.HTTP_201_CREATED
 HTTP_ACCEPTED = status.HTTP_202_ACCEPTED
 HTTP_NO_CONTENT = status.HTTP_204_NO_CONTENT
 
+# Redirection
+HTTP_NOT_MODIFIED = status.HTTP_304_NOT_MODIFIED
+
 # Client Errors
 HTTP_BAD_REQUEST = status.HTTP_400_BAD_REQUEST
 HTTP_UNAUTHORIZED = status.HTTP_401_UNAUTHORIZED
 HTTP_FORBIDDEN = status.HTTP_403_FORBIDDEN
 HTTP_NOT_FOUND = status.HTTP_404_NOT_FOUND
+HTTP_CONFLICT = status.HTTP_409_CONFLICT
+HTTP_PRECONDITION_FAILED = status.HTTP_412_PRECONDITION_FAILED
 
 # Server Errors
 HTTP_INTERNAL_SERVER_ERROR = status.HTTP_500_INTERNAL_SERVER_ERROR
+HTTP_SERVICE_UNAVAILABLE = status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,9 @@
+# constants/transcription_constants.py
+
+# Lifecycle of a meeting's background transcription (meeting.transcription_status)
+TRANSCRIPTION_PENDING = "pending"
+TRANSCRIPTION_PROCESSING = "processing"
+TRANSCRIPTION_COMPLETED = "completed"
+TRANSCRIPTION_FAILED = "failed"
+
+TRANSCRIPTION_ACTIVE_STATUSES = [TRANSCRIPTION_PENDING, TRANSCRIPTION_PROCESSING]
@@ -4,9 +4,19 @@ from services.calendar_service import (
     create_calendar_event,
     get_calendar_event,
     update_calendar_event,
-    delete_calendar_event
+    delete_calendar_event,
+    execute_calendar_batch,
+    CalendarEventConflict,
+    GOOGLE_CALENDAR_BATCH_MAX_OPERATIONS
+)
+from schemas.calendar_schema import (
+    CalendarEventCreate,
+    CalendarEventUpdate,
+    CalendarEventResponse,
+    CalendarBatchRequest,
+    CalendarBatchResult,
+    CalendarBatchResponse
 )
-from schemas.calendar_schema import CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse
 from schemas.response_schema import BaseResponse
 from datetime import datetime, timedelta
 
@@ -62,7 +72,7 @@ def get_event(event_id: str) -> BaseResponse[CalendarEventResponse]:
         )
 
 
-def update_event(event_id: str, event_data: CalendarEventUpdate) -> BaseResponse[CalendarEventResponse]:
+def update_event(event_id: str, event_data: CalendarEventUpdate, if_match: str = None) -> BaseResponse[CalendarEventResponse]:
     """Update an existing calendar event"""
     try:
         # Calculate end_time_iso if duration_minutes provided but end_time_iso not provided
@@ -80,7 +90,8 @@ def update_event(event_id: str, event_data: CalendarEventUpdate) -> BaseResponse
             end_time_iso=end_time_iso,
             duration_minutes=event_data.duration_minutes,
             attendees=event_data.attendees,
-            location=event_data.location
+            location=event_data.location,
+            etag=if_match
         )
 
         return BaseResponse[CalendarEventResponse](
@@ -89,6 +100,11 @@ def update_event(event_id: str, event_data: CalendarEventUpdate) -> BaseResponse
             statusCode=status_code.HTTP_OK
         )
 
+    except CalendarEventConflict as e:
+        raise HTTPException(
+            status_code=status_code.HTTP_PRECONDITION_FAILED,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
@@ -124,3 +140,85 @@ def delete_event(event_id: str) -> BaseResponse[None]:
                 status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to delete calendar event: {str(e)}"
             )
+
+
+def _batch_operation_kwargs(operation) -> dict:
+    """Service-level operation dict for one batch item; raises ValueError when it is incomplete."""
+    if operation.operation == "create":
+        if operation.event is None:
+            raise ValueError("create requires event")
+        event_data = operation.event
+        end_time_iso = event_data.end_time_iso
+        if not end_time_iso and event_data.duration_minutes:
+            start_dt = datetime.fromisoformat(event_data.start_time_iso.replace("Z", ""))
+            end_time_iso = (start_dt + timedelta(minutes=event_data.duration_minutes)).isoformat() + "Z"
+        return {"operation": "create", "event_id": operation.event_id, "event": {
+            "title": event_data.title,
+            "description": event_data.description,
+            "start_time_iso": event_data.start_time_iso,
+            "duration_minutes": event_data.duration_minutes or 30,
+            "attendees": event_data.attendees or [],
+            "location": event_data.location,
+            "end_time_iso": end_time_iso
+        }}
+    if operation.operation == "update":
+        if not operation.event_id or operation.changes is None:
+            raise ValueError("update requires event_id and changes")
+        return {"operation": "update", "event_id": operation.event_id,
+                "changes": operation.changes.dict(exclude_none=True)}
+    if operation.operation == "delete":
+        if not operation.event_id:
+            raise ValueError("delete requires event_id")
+        return {"operation": "delete", "event_id": operation.event_id}
+    raise ValueError('operation must be "create", "update" or "delete"')
+
+
+def batch_events(batch: CalendarBatchRequest) -> BaseResponse[CalendarBatchResponse]:
+    """Apply many calendar operations at once; each item succeeds or fails on its own"""
+    if not batch.operations or len(batch.operations) > GOOGLE_CALENDAR_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail=f"Send between 1 and {GOOGLE_CALENDAR_BATCH_MAX_OPERATIONS} operations"
+        )
+
+    results = {}
+    valid = []
+    for index, operation in enumerate(batch.operations):
+        try:
+            valid.append((index, _batch_operation_kwargs(operation)))
+        except (ValueError, TypeError) as e:
+            results[index] = CalendarBatchResult(index=index, operation=operation.operation, status="invalid",
+                                                 event_id=operation.event_id, error=str(e))
+
+    try:
+        outcomes = execute_calendar_batch([kwargs for _, kwargs in valid]) if valid else []
+    except Exception as e:
+        raise HTTPException(
+            status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to run calendar batch: {str(e)}"
+        )
+
+    for (index, kwargs), outcome in zip(valid, outcomes):
+        event = outcome.get("event")
+        results[index] = CalendarBatchResult(
+            index=index,
+            operation=kwargs["operation"],
+            status="succeeded" if outcome["success"] else "failed",
+            event_id=event["event_id"] if event else kwargs.get("event_id"),
+            event=CalendarEventResponse(**event) if event else None,
+            status_code=outcome.get("status_code"),
+            error=outcome.get("error")
+        )
+
+    ordered = [results[index] for index in range(len(batch.operations))]
+    succeeded = sum(1 for result in ordered if result.status == "succeeded")
+    return BaseResponse[CalendarBatchResponse](
+        data=CalendarBatchResponse(
+            total=len(ordered),
+            succeeded=succeeded,
+            failed=len(ordered) - succeeded,
+            results=ordered
+        ),
+        message=f"{succeeded} of {len(ordered)} calendar operations succeeded",
+        statusCode=status_code.HTTP_OK
+    )
@@ -0,0 +1,29 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+import constants.status_code_constants as status_code
+from database.transcript_database import wait_for_database, get_database_state
+from schemas.response_schema import BaseResponse
+
+
+async def require_database() -> None:
+    """Router dependency: fail fast with 503 while the database is unreachable."""
+    if not await wait_for_database():
+        raise HTTPException(
+            status_code=status_code.HTTP_SERVICE_UNAVAILABLE,
+            detail="Database is unavailable, please retry shortly"
+        )
+
+
+async def health() -> JSONResponse:
+    database = get_database_state()
+    # Roles that never touch Mongo (transcription-worker) do not probe it and stay healthy without it
+    healthy = database["available"] or not database["monitored"]
+    code = status_code.HTTP_OK if healthy else status_code.HTTP_SERVICE_UNAVAILABLE
+    return JSONResponse(
+        status_code=code,
+        content=BaseResponse[dict](
+            data={"status": "ok" if healthy else "degraded", "database": database},
+            message="Service healthy" if healthy else "Database unavailable",
+            statusCode=code
+        ).dict()
+    )
@@ -1,23 +1,57 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, UploadFile, Response
+from pydantic import ValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 import constants.status_code_constants as status_code
+from constants.transcription_constants import TRANSCRIPTION_ACTIVE_STATUSES
 from repository.transcriprion_repo import (
     create_meeting,
     get_all_meetings,
+    get_meeting_detail,
     get_particular_meeting,
     archive_meeting,
-    update_meeting
+    update_meeting,
+    create_meetings_bulk,
+    claim_auto_schedule,
+    get_auto_schedule_states,
+    MEETING_PROJECTION
 )
 
-from schemas.meeting_schema import MeetingCreate, MeetingResponse
-from schemas.response_schema import BaseResponse
+from schemas.meeting_schema import (
+    MeetingCreate,
+    MeetingResponse,
+    SemanticSearchHit,
+    TranscriptChunksResponse,
+    MeetingImportRow,
+    MeetingImportResponse,
+    AutoScheduleState,
+    AutoScheduleBatchItem,
+    AutoScheduleBatchResponse
+)
+from schemas.response_schema import BaseResponse, PaginatedResponse
+from services.transcription_worker_service import submit_meeting_transcription, submit_meeting_transcriptions
+from services.auto_schedule_service import submit_auto_schedules
 from utils.validations import validate_id
+from utils.pagination_utils import encode_cursor, decode_cursor, parse_fields
+from utils.import_utils import detect_manifest_format, parse_manifest
+from services.audio_clip_service import resolve_clip_range, get_clip, local_audio_path, SEGMENT_SECONDS
+from services.storage_lifecycle_service import resolve_stored_path
+from services.transcript_format_service import (
+    TRANSCRIPT_FORMATS,
+    TRANSCRIPT_MEDIA_TYPES,
+    transcript_from_text,
+    render_transcript,
+    render_transcript_file
+)
+import mimetypes
+import os
 from typing import List
 
 router = APIRouter(prefix="/meetings", tags=MeetingCreate)
 
 
-def create(meeting: MeetingCreate):
-    new_meeting = create_meeting(
+async def create(meeting: MeetingCreate) -> BaseResponse[MeetingResponse]:
+    new_meeting = await create_meeting(
         meeting_data=meeting.dict())
 
     if not new_meeting:
@@ -25,15 +59,108 @@ def create(meeting: MeetingCreate):
             status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
             detail="Failed to create meeting"
         )
-    return BaseResponse[MeetingCreate](
-        data=MeetingCreate(**new_meeting),
+    if new_meeting.get("audio_recording_url"):
+        submit_meeting_transcription(
+            meeting_id=new_meeting["id"],
+            audio_path=new_meeting["audio_recording_url"]
+        )
+    return BaseResponse[MeetingResponse](
+        data=MeetingResponse(**new_meeting),
         message="New meeting created successfully",
         statusCode=status_code.HTTP_CREATED
     )
 
 
-def get_all(search: str = None) -> BaseResponse[List[MeetingResponse]]:
-    meetings = get_all_meetings(search=search)
+async def import_meetings(file: UploadFile, batch_size: int = 500) -> BaseResponse[MeetingImportResponse]:
+    manifest_format = detect_manifest_format(file.filename, getattr(file, "content_type", None))
+    try:
+        rows = parse_manifest(await file.read(), manifest_format)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Manifest must be UTF-8 encoded"
+        )
+    if not rows:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Manifest contains no rows"
+        )
+
+    # Validate every row first; only valid ones are written
+    results = {}
+    valid = []
+    for row_number, record in rows:
+        if isinstance(record, Exception):
+            results[row_number] = MeetingImportRow(row=row_number, status="invalid", errors=[str(record)])
+            continue
+        try:
+            valid.append((row_number, MeetingCreate(**record).dict()))
+        except ValidationError as e:
+            errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+            results[row_number] = MeetingImportRow(row=row_number, status="invalid", errors=errors)
+
+    inserted = await create_meetings_bulk([meeting for _, meeting in valid], batch_size=batch_size)
+
+    transcription_jobs = []
+    for (row_number, meeting), (meeting_id, error) in zip(valid, inserted):
+        if error:
+            results[row_number] = MeetingImportRow(row=row_number, status="failed", errors=[error])
+            continue
+        audio_path = meeting.get("audio_recording_url")
+        if audio_path:
+            transcription_jobs.append((meeting_id, audio_path))
+        results[row_number] = MeetingImportRow(
+            row=row_number,
+            status="created",
+            id=meeting_id,
+            transcription_queued=bool(audio_path)
+        )
+
+    submit_meeting_transcriptions(transcription_jobs)
+
+    ordered = [results[row_number] for row_number, _ in rows]
+    created = sum(1 for row in ordered if row.status == "created")
+    return BaseResponse[MeetingImportResponse](
+        data=MeetingImportResponse(
+            total=len(ordered),
+            created=created,
+            failed=len(ordered) - created,
+            transcriptions_queued=len(transcription_jobs),
+            rows=ordered
+        ),
+        message=f"Imported {created} of {len(ordered)} meetings",
+        statusCode=status_code.HTTP_CREATED
+    )
+
+
+async def get_all(search: str = None, cursor: str = None, limit: int = 20, fields: str = None,
+                  include_archived: bool = False, owner: str = None, attendee: str = None,
+                  date_from: int = None, date_to: int = None) -> PaginatedResponse[List[MeetingResponse]]:
+    try:
+        after = decode_cursor(cursor) if cursor else None
+        selected_fields = parse_fields(fields, allowed=list(MEETING_PROJECTION))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail=str(e)
+        )
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+
+    meetings, next_key = await get_all_meetings(
+        search=search,
+        after=after,
+        limit=limit,
+        fields=selected_fields,
+        include_archived=include_archived,
+        owner=owner,
+        attendee=attendee,
+        date_from=date_from,
+        date_to=date_to
+    )
 
     if not meetings:
         raise HTTPException(
@@ -41,26 +168,54 @@ def get_all(search: str = None) -> BaseResponse[List[MeetingResponse]]:
             detail="No meeting data found"
         )
 
-    return BaseResponse[List[MeetingResponse]](
-        data=[MeetingResponse.model_validate(
-            meet).model_dump() for meet in meetings],
+    return PaginatedResponse[List[MeetingResponse]](
+        data=[MeetingResponse.model_validate(meet) for meet in meetings],
         message="Data returned successfully",
+        statusCode=status_code.HTTP_OK,
+        nextCursor=encode_cursor(next_key) if next_key else None
+    )
+
+
+async def semantic_search(query: str, k: int = 5, meeting_id: str = None) -> BaseResponse[List[SemanticSearchHit]]:
+    if meeting_id and validate_id(meeting_id=meeting_id) is False:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Invalid id"
+        )
+    from services.semantic_search_service import search_segments
+    hits = await run_in_threadpool(search_segments, query=query, k=k, meeting_id=meeting_id)
+    return BaseResponse[List[SemanticSearchHit]](
+        data=[SemanticSearchHit(**hit) for hit in hits],
+        message="Search results returned successfully",
         statusCode=status_code.HTTP_OK
     )
 
 
-def get_particular(meeting_id: str) -> BaseResponse[list[MeetingResponse]]:
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def get_particular(meeting_id: str, response: Response = None,
+                         if_none_match: str = None) -> BaseResponse[list[MeetingResponse]]:
     if validate_id(meeting_id=meeting_id) is False:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
             detail="Invalid id"
         )
-    meeting = get_particular_meeting(meeting_id=meeting_id)
+    meeting, etag = await get_meeting_detail(meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(
             status_code=status_code.HTTP_NOT_FOUND,
             detail="No meeting detail not found"
         )
+    # Clients that already hold this version get an empty 304 instead of the payload
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status_code.HTTP_NOT_MODIFIED, headers={"ETag": etag})
+    if response is not None:
+        response.headers["ETag"] = etag
     return BaseResponse[list[MeetingResponse]](
         data=[MeetingResponse(**meeting)],
         message="Meeting returned successfully",
@@ -68,14 +223,106 @@ def get_particular(meeting_id: str) -> BaseResponse[list[MeetingResponse]]:
     )
 
 
-def update(meeting_id: str, meeting: MeetingCreate) -> BaseResponse[MeetingCreate]:
+async def get_audio_clip(meeting_id: str, start: float = None, end: float = None,
+                         segment: int = None, chunk: int = None) -> FileResponse:
+    if validate_id(meeting_id=meeting_id) is False:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Invalid id"
+        )
+    try:
+        clip_start, clip_end = resolve_clip_range(start=start, end=end, segment=segment, chunk=chunk)
+    except ValueError as e:
+        raise HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail=str(e))
+
+    meeting = await get_particular_meeting(meeting_id=meeting_id, include_notes=False)
+    if not meeting:
+        raise HTTPException(
+            status_code=status_code.HTTP_NOT_FOUND,
+            detail="No meeting detail not found"
+        )
+    audio_path = await run_in_threadpool(local_audio_path, meeting.get("audio_recording_url"))
+    if not audio_path:
+        raise HTTPException(
+            status_code=status_code.HTTP_NOT_FOUND,
+            detail="Meeting has no stored recording"
+        )
+
+    try:
+        clip_path = await run_in_threadpool(get_clip, audio_path, clip_start, clip_end)
+    except ValueError as e:
+        raise HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail=str(e))
+    # FileResponse answers Range requests itself, so players can seek within the clip
+    return FileResponse(
+        clip_path,
+        media_type=mimetypes.guess_type(clip_path)[0] or "application/octet-stream",
+        filename=f"meeting-{meeting_id}-{clip_start:g}-{clip_end:g}{os.path.splitext(clip_path)[1]}",
+        content_disposition_type="inline",
+        headers={"Cache-Control": "private, max-age=3600"}
+    )
+
+
+async def get_transcript(meeting_id: str, start: int = 0, end: int = None) -> BaseResponse[TranscriptChunksResponse]:
+    if validate_id(meeting_id=meeting_id) is False:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Invalid id"
+        )
+    from repository.transcript_store_repo import get_transcript_chunks
+    transcript = await get_transcript_chunks(meeting_id=meeting_id, start=start, end=end)
+    if transcript is None:
+        raise HTTPException(
+            status_code=status_code.HTTP_NOT_FOUND,
+            detail="Meeting not found"
+        )
+    return BaseResponse[TranscriptChunksResponse](
+        data=TranscriptChunksResponse(meeting_id=meeting_id, start=start, **transcript),
+        message="Transcript returned successfully",
+        statusCode=status_code.HTTP_OK
+    )
+
+
+async def export_transcript(meeting_id: str, fmt: str = "json") -> Response:
+    if validate_id(meeting_id=meeting_id) is False:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Invalid id"
+        )
+    if fmt not in TRANSCRIPT_FORMATS:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(TRANSCRIPT_FORMATS)}"
+        )
+    meeting = await get_particular_meeting(meeting_id=meeting_id, include_notes=False)
+    if not meeting:
+        raise HTTPException(
+            status_code=status_code.HTTP_NOT_FOUND,
+            detail="Meeting not found"
+        )
+    structured_path = meeting.get("structured_path")
+    if structured_path and await run_in_threadpool(resolve_stored_path, structured_path):
+        content = await run_in_threadpool(render_transcript_file, structured_path, fmt)
+    else:
+        # Meetings transcribed before structured transcripts existed: derive one from the stored text
+        meeting = await get_particular_meeting(meeting_id=meeting_id)
+        doc = transcript_from_text(meeting.get("notes") or "", None, "llm", meeting.get("audio_recording_url"),
+                                   SEGMENT_SECONDS)
+        content = await run_in_threadpool(render_transcript, doc, fmt)
+    return Response(
+        content=content,
+        media_type=TRANSCRIPT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="meeting-{meeting_id}.{fmt}"'}
+    )
+
+
+async def update(meeting_id: str, meeting: MeetingCreate) -> BaseResponse[MeetingCreate]:
     if validate_id(meeting_id=meeting_id) is False:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
             detail="Invalid ID"
         )
-    updated = update_meeting(student_id=meeting_id,
-                             update_meeting_data=meeting.dict())
+    updated = await update_meeting(meeting_id=meeting_id,
+                                   update_meeting_data=meeting.dict())
     if not updated:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
@@ -88,13 +335,13 @@ def update(meeting_id: str, meeting: MeetingCreate) -> BaseResponse[MeetingCreat
     )
 
 
-def archive(meeting_id: str) -> BaseResponse[None]:
+async def archive(meeting_id: str) -> BaseResponse[None]:
     if validate_id(meeting_id=meeting_id) is False:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
             detail="Invalid Id detected"
         )
-    deleted = archive_meeting(meeting_id=meeting_id)
+    deleted = await archive_meeting(meeting_id=meeting_id)
     if not deleted:
         raise HTTPException(
             status_code=status_code.HTTP_NOT_FOUND,
@@ -110,14 +357,14 @@ def archive(meeting_id: str) -> BaseResponse[None]:
  
 
 
-def set_participants(meeting_id: str, owner: str, attendees: list[str]) -> BaseResponse[MeetingResponse]:
+async def set_participants(meeting_id: str, owner: str, attendees: list[str]) -> BaseResponse[MeetingResponse]:
     if validate_id(meeting_id=meeting_id) is False:
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
             detail="Invalid Id detected"
         )
     from repository.transcriprion_repo import set_owner_and_attendees
-    updated = set_owner_and_attendees(meeting_id=meeting_id, owner=owner, attendees=attendees)
+    updated = await set_owner_and_attendees(meeting_id=meeting_id, owner=owner, attendees=attendees)
     if not updated:
         raise HTTPException(
             status_code=status_code.HTTP_NOT_FOUND,
@@ -130,49 +377,86 @@ def set_participants(meeting_id: str, owner: str, attendees: list[str]) -> BaseR
     )
 
 
-def auto_schedule_meeting(meeting_id: str) -> BaseResponse[dict]:
-    if validate_id(meeting_id=meeting_id) is False:
+def _auto_schedule_state(meeting_id: str, state: dict) -> AutoScheduleState:
+    return AutoScheduleState(meeting_id=meeting_id, **{
+        field: state.get(field) for field in AutoScheduleState.model_fields if field != "meeting_id"
+    })
+
+
+async def _queue_auto_schedules(meeting_ids: List[str]) -> List[AutoScheduleBatchItem]:
+    """Claim and queue each meeting; one item per id, in order."""
+    valid_ids = [meeting_id for meeting_id in dict.fromkeys(meeting_ids) if validate_id(meeting_id=meeting_id) is not False]
+    states = await get_auto_schedule_states(valid_ids) if valid_ids else {}
+
+    items = []
+    queued = []
+    for meeting_id in meeting_ids:
+        if validate_id(meeting_id=meeting_id) is False:
+            status = "invalid"
+        elif meeting_id not in states:
+            status = "not_found"
+        elif meeting_id in queued:
+            status = "already_running"
+        elif states[meeting_id]["transcription_status"] in TRANSCRIPTION_ACTIVE_STATUSES:
+            status = "transcription_in_progress"
+        elif await claim_auto_schedule(meeting_id):
+            status = "queued"
+            queued.append(meeting_id)
+        else:
+            status = "already_running"
+        items.append(AutoScheduleBatchItem(meeting_id=meeting_id, status=status))
+
+    submit_auto_schedules(queued)
+    return items
+
+
+async def auto_schedule_meeting(meeting_id: str) -> BaseResponse[AutoScheduleState]:
+    """Start the auto-schedule workflow in the background. Calling it again while it runs is a
+    no-op, and re-running a finished workflow never creates a second calendar event.
+    """
+    item = (await _queue_auto_schedules([meeting_id]))[0]
+    if item.status == "invalid":
         raise HTTPException(
             status_code=status_code.HTTP_BAD_REQUEST,
             detail="Invalid Id detected"
         )
-    from repository.transcriprion_repo import get_particular_meeting, update_meeting
-    from services.ai_actions_service import analyze_for_meeting_action
-    from services.calendar_service import create_calendar_event
-
-    meeting = get_particular_meeting(meeting_id=meeting_id)
-    if not meeting:
+    if item.status == "not_found":
         raise HTTPException(status_code=status_code.HTTP_NOT_FOUND, detail="Meeting not found")
+    if item.status == "transcription_in_progress":
+        raise HTTPException(
+            status_code=status_code.HTTP_CONFLICT,
+            detail="Meeting transcription is still in progress"
+        )
 
-    analysis = analyze_for_meeting_action(notes=meeting.get("notes", ""))
-    if not analysis.get("should_schedule"):
-        return BaseResponse[dict](
-            data=analysis,
-            message="No meeting scheduling action detected",
-            statusCode=status_code.HTTP_OK
-        )
-
-    # Collect participants
-    attendees = meeting.get("attendees", []) or []
-    owner = meeting.get("owner")
-    if owner:
-        attendees = list({owner, *attendees})
-
-    event = create_calendar_event(
-        title=analysis.get("title") or meeting.get("title") or "Follow-up Meeting",
-        description=analysis.get("description") or "",
-        start_time_iso=analysis.get("start_time_iso"),
-        duration_minutes=analysis.get("duration_minutes", 30),
-        attendees=attendees
+    states = await get_auto_schedule_states([meeting_id])
+    return BaseResponse[AutoScheduleState](
+        data=_auto_schedule_state(meeting_id, states.get(meeting_id, {}).get("auto_schedule", {})),
+        message="Auto-schedule queued" if item.status == "queued" else "Auto-schedule is already in progress",
+        statusCode=status_code.HTTP_ACCEPTED
     )
 
-    # Persist event info on meeting
-    updated = update_meeting(meeting_id=meeting_id, update_meeting_data={
-        "calendar_event": event
-    })
 
-    return BaseResponse[dict](
-        data={"analysis": analysis, "event": event},
-        message="Auto-schedule completed",
+async def auto_schedule_meetings(meeting_ids: List[str]) -> BaseResponse[AutoScheduleBatchResponse]:
+    items = await _queue_auto_schedules(meeting_ids)
+    queued = sum(1 for item in items if item.status == "queued")
+    return BaseResponse[AutoScheduleBatchResponse](
+        data=AutoScheduleBatchResponse(total=len(items), queued=queued, items=items),
+        message=f"Queued auto-schedule for {queued} of {len(items)} meetings",
+        statusCode=status_code.HTTP_ACCEPTED
+    )
+
+
+async def get_auto_schedule_status(meeting_id: str) -> BaseResponse[AutoScheduleState]:
+    if validate_id(meeting_id=meeting_id) is False:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="Invalid Id detected"
+        )
+    states = await get_auto_schedule_states([meeting_id])
+    if meeting_id not in states:
+        raise HTTPException(status_code=status_code.HTTP_NOT_FOUND, detail="Meeting not found")
+    return BaseResponse[AutoScheduleState](
+        data=_auto_schedule_state(meeting_id, states[meeting_id]["auto_schedule"]),
+        message="Auto-schedule status retrieved successfully",
         statusCode=status_code.HTTP_OK
-    )
\ No newline at end of file
+    )
@@ -1,41 +1,154 @@
-from fastapi import UploadFile, Request
-from services.upload_service import save_audio_file
+from fastapi import UploadFile, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from services.upload_service import store_upload, store_upload_stream, find_upload
+from services.upload_session_service import (
+    create_session,
+    get_session_status,
+    write_part,
+    complete_session,
+    delete_session
+)
 from schemas.response_schema import BaseResponse, UploadedFileResponse
+from schemas.upload_schema import (
+    UploadSessionCreate,
+    UploadSessionResponse,
+    UploadPartResponse,
+    CompletedUploadResponse
+)
+import constants.status_code_constants as status_code
+import os
 
 
-async def upload_audio_controller(request: Request, file: UploadFile) -> BaseResponse[UploadedFileResponse]:
-    relative_url = await save_audio_file(file)  # e.g., "/uploads/filename.ext"
+def _uploaded_response(stored: dict, name: str) -> BaseResponse[UploadedFileResponse]:
+    payload = UploadedFileResponse(
+        url=stored["url"],
+        name=name,
+        size=stored["size"],
+        contentType=stored["content_type"],
+        sha256=stored["sha256"],
+        deduplicated=stored["deduplicated"]
+    )
 
-    # Return relative path instead of full URL
-    if relative_url.startswith("/uploads/"):
-        filename = relative_url.split("/uploads/", 1)[1]
-        url = f"/uploads/{filename}"  # Just relative path
-    else:
-        url = relative_url.lstrip("/")  # Remove leading slash if present
+    return BaseResponse[UploadedFileResponse](
+        data=payload,
+        message="File already uploaded" if stored["deduplicated"] else "File uploaded successfully",
+        statusCode=status_code.HTTP_OK if stored["deduplicated"] else status_code.HTTP_CREATED
+    )
 
-    # Some clients may not send content_type; default to None
-    content_type = getattr(file, "content_type", None)
 
-    # Try to get size by seeking the underlying SpooledTemporaryFile if available
-    size = None
+async def upload_audio_controller(request: Request, file: UploadFile,
+                                  content_sha256: str = None) -> BaseResponse[UploadedFileResponse]:
+    # Stored under its content hash; a duplicate (or a known X-Content-SHA256) is not written again
     try:
-        file_spool = file.file
-        current_pos = file_spool.tell()
-        file_spool.seek(0, 2)
-        size = file_spool.tell()
-        file_spool.seek(current_pos)
-    except Exception:
-        size = None
+        stored = await store_upload(file, expected_sha256=content_sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail=str(e))
+    return _uploaded_response(stored, file.filename)
 
-    payload = UploadedFileResponse(
-        url=url,
-        name=file.filename,
-        size=size if size is not None else 0,
-        contentType=content_type
-    )
 
+async def upload_raw_audio_controller(request: Request, filename: str,
+                                      content_sha256: str = None) -> BaseResponse[UploadedFileResponse]:
+    # The hash is checked before the body is read, so known content is never transferred
+    filename = os.path.basename(filename or "")
+    if not filename:
+        raise HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail="filename is required")
+    try:
+        stored = await store_upload_stream(
+            request.stream(), filename, request.headers.get("content-type"), expected_sha256=content_sha256
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail=str(e))
+    return _uploaded_response(stored, filename)
+
+
+async def get_upload_by_hash(sha256: str) -> BaseResponse[UploadedFileResponse]:
+    stored = await run_in_threadpool(find_upload, sha256)
+    if stored is None:
+        raise HTTPException(status_code=status_code.HTTP_NOT_FOUND, detail="No upload with this content hash")
     return BaseResponse[UploadedFileResponse](
-        data=payload,
+        data=UploadedFileResponse(
+            url=f"/uploads/{stored['sha256']}{stored['ext']}",
+            name=f"{stored['sha256']}{stored['ext']}",
+            size=stored["size"],
+            contentType=stored["content_type"],
+            sha256=stored["sha256"],
+            deduplicated=True
+        ),
+        message="Upload found",
+        statusCode=status_code.HTTP_OK
+    )
+
+
+def _session_error(e: Exception) -> HTTPException:
+    if isinstance(e, LookupError):
+        return HTTPException(status_code=status_code.HTTP_NOT_FOUND, detail=str(e.args[0]) if e.args else "Upload session not found")
+    return HTTPException(status_code=status_code.HTTP_BAD_REQUEST, detail=str(e))
+
+
+async def create_upload_session(payload: UploadSessionCreate) -> BaseResponse[UploadSessionResponse]:
+    try:
+        session = await run_in_threadpool(
+            create_session,
+            filename=payload.filename,
+            size=payload.size,
+            part_size=payload.part_size,
+            sha256=payload.sha256,
+            content_type=payload.content_type
+        )
+    except ValueError as e:
+        raise _session_error(e)
+    return BaseResponse[UploadSessionResponse](
+        data=UploadSessionResponse(**session, missing_parts=list(range(session["part_count"]))),
+        message="Upload session created",
+        statusCode=status_code.HTTP_CREATED
+    )
+
+
+async def get_upload_session(session_id: str) -> BaseResponse[UploadSessionResponse]:
+    try:
+        session = await run_in_threadpool(get_session_status, session_id)
+    except LookupError as e:
+        raise _session_error(e)
+    return BaseResponse[UploadSessionResponse](
+        data=UploadSessionResponse(**session),
+        message="Upload session returned successfully",
+        statusCode=status_code.HTTP_OK
+    )
+
+
+async def upload_part(request: Request, session_id: str, part_number: int,
+                      part_sha256: str = None) -> BaseResponse[UploadPartResponse]:
+    try:
+        part = await write_part(session_id, part_number, request.stream(), expected_sha256=part_sha256)
+    except (LookupError, ValueError) as e:
+        raise _session_error(e)
+    return BaseResponse[UploadPartResponse](
+        data=UploadPartResponse(**part),
+        message="Part uploaded successfully",
+        statusCode=status_code.HTTP_OK
+    )
+
+
+async def complete_upload_session(session_id: str) -> BaseResponse[CompletedUploadResponse]:
+    try:
+        uploaded = await run_in_threadpool(complete_session, session_id)
+    except (LookupError, ValueError) as e:
+        raise _session_error(e)
+    return BaseResponse[CompletedUploadResponse](
+        data=CompletedUploadResponse(**uploaded),
         message="File uploaded successfully",
-        statusCode=201
+        statusCode=status_code.HTTP_CREATED
+    )
+
+
+async def abort_upload_session(session_id: str) -> BaseResponse[None]:
+    try:
+        await run_in_threadpool(get_session_status, session_id)
+        await run_in_threadpool(delete_session, session_id)
+    except LookupError as e:
+        raise _session_error(e)
+    return BaseResponse[None](
+        data=None,
+        message="Upload session aborted",
+        statusCode=status_code.HTTP_OK
     )
@@ -1,82 +1,124 @@
-from fastapi import UploadFile, Request, HTTPException
-from services.upload_service import save_audio_file
-from services.whisper_service import transcribe_audio_with_whisper
+from fastapi import UploadFile, Request, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from services.upload_service import store_upload, store_upload_stream, resolve_upload_path
+from services.whisper_service import transcribe_audio_with_whisper, get_cached_transcription, cache_transcription
+from services.streaming_transcription_service import StreamingWhisperTranscriber
+from services.storage_lifecycle_service import resolve_stored_path, read_text_output, OUTPUT_DIR
+from services.transcript_format_service import (
+    TRANSCRIPT_FORMATS,
+    TRANSCRIPT_MEDIA_TYPES,
+    structured_path_for,
+    transcript_from_text,
+    render_transcript,
+    render_transcript_file
+)
+from services.semantic_search_service import queue_transcript_for_indexing
 from schemas.response_schema import BaseResponse
 import constants.status_code_constants as status_code
 import os
+from typing import Awaitable, Callable
 
 
-async def upload_and_transcribe_with_whisper(request: Request, file: UploadFile) -> BaseResponse[dict]:
-    """Upload audio file with chunked upload and transcribe using Whisper model."""
-    
+async def _store_and_transcribe(store: Callable[..., Awaitable[dict]]) -> tuple:
+    """Save an upload with store(on_chunk) and transcribe it.
+    Returns (stored upload, file path, transcription result).
+    """
+    # Step 1: Save the uploaded file, teeing the bytes into a streaming decoder so 30 s
+    # windows are transcribed as soon as they have been received
+    streamer = StreamingWhisperTranscriber.start_if_available()
+    on_chunk = None
+    if streamer is not None:
+        async def on_chunk(chunk: bytes):
+            await run_in_threadpool(streamer.feed, chunk)
     try:
-        # Step 1: Save the uploaded file using existing chunked upload service
-        relative_url = await save_audio_file(file)  # e.g., "/uploads/filename.ext"
-        
-        # Step 2: Get the actual file path for transcription
-        if relative_url.startswith("/uploads/"):
-            filename = relative_url.split("/uploads/", 1)[1]
-            file_path = os.path.join("uploads", filename)
-        else:
-            raise HTTPException(
-                status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
-                detail="Invalid file path returned from upload"
-            )
-        
-        # Step 3: Transcribe the uploaded file using Whisper
-        transcription_result = transcribe_audio_with_whisper(file_path)
-        
-        # Step 4: Check for transcription errors
-        if "error" in transcription_result:
-            raise HTTPException(
-                status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
-                detail=f"Transcription failed: {transcription_result['error']}"
-            )
-        
-        # Step 5: Build relative path for the uploaded file
-        url = f"uploads/{filename}"
-        
-        # Step 6: Get file metadata
-        content_type = getattr(file, "content_type", None)
-        
-        # Try to get size by seeking the underlying SpooledTemporaryFile if available
-        size = None
-        try:
-            file_spool = file.file
-            current_pos = file_spool.tell()
-            file_spool.seek(0, 2)
-            size = file_spool.tell()
-            file_spool.seek(current_pos)
-        except Exception:
-            size = None
-        
-        # Step 7: Prepare response data
-        response_data = {
-            "upload_info": {
-                "url": url,
-                "name": file.filename,
-                "size": size if size is not None else 0,
-                "content_type": content_type,
-                "file_path": file_path
-            },
-            "transcription": {
-                "text": transcription_result["transcription"],
-                "model_used": transcription_result["model_used"],
-                "chunks_processed": transcription_result["chunks_processed"],
-                "transcript_file_path": transcription_result["file_path"]
-            }
+        stored = await store(on_chunk)
+    except BaseException:
+        if streamer is not None:
+            streamer.abort()
+        raise
+    relative_url = stored["url"]  # e.g., "/uploads/<sha256>.ext"
+
+    # Step 2: Get the actual file path for transcription
+    if relative_url.startswith("/uploads/"):
+        filename = relative_url.split("/uploads/", 1)[1]
+        file_path = os.path.join("uploads", filename)
+    else:
+        raise HTTPException(
+            status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
+            detail="Invalid file path returned from upload"
+        )
+
+    # Step 3: Use a cached result for known content, else the streamed transcription;
+    # fall back to transcribing the stored file when the stream could not be decoded
+    transcription_result = await run_in_threadpool(get_cached_transcription, file_path)
+    if transcription_result is not None:
+        if streamer is not None:
+            streamer.abort()
+    elif streamer is not None:
+        transcription_result = await run_in_threadpool(streamer.finish, file_path)
+        if transcription_result is not None:
+            await run_in_threadpool(cache_transcription, file_path, transcription_result)
+    if transcription_result is None:
+        transcription_result = await run_in_threadpool(transcribe_audio_with_whisper, file_path)
+
+    # Step 4: Check for transcription errors
+    if "error" in transcription_result:
+        raise HTTPException(
+            status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription failed: {transcription_result['error']}"
+        )
+
+    queue_transcript_for_indexing(
+        source_id=f"whisper:{transcription_result['file_path']}",
+        text=transcription_result["transcription"],
+        source="whisper"
+    )
+    return stored, file_path, transcription_result
+
+
+def _upload_transcription_response(stored: dict, name: str, content_type: str, file_path: str,
+                                   transcription_result: dict) -> BaseResponse[dict]:
+    response_data = {
+        "upload_info": {
+            "url": f"uploads/{os.path.basename(file_path)}",
+            "name": name,
+            "size": stored["size"],
+            "content_type": content_type,
+            "file_path": file_path
+        },
+        "transcription": {
+            "text": transcription_result["transcription"],
+            "model_used": transcription_result["model_used"],
+            "chunks_processed": transcription_result["chunks_processed"],
+            "transcript_file_path": transcription_result["file_path"],
+            "structured_file_path": transcription_result.get("structured_path")
         }
-        
-        return BaseResponse[dict](
-            data=response_data,
-            message="File uploaded and transcribed successfully with Whisper",
-            statusCode=status_code.HTTP_CREATED
+    }
+
+    return BaseResponse[dict](
+        data=response_data,
+        message="File uploaded and transcribed successfully with Whisper",
+        statusCode=status_code.HTTP_CREATED
+    )
+
+
+async def upload_and_transcribe_with_whisper(request: Request, file: UploadFile) -> BaseResponse[dict]:
+    """Upload audio file with chunked upload and transcribe using Whisper model.
+    The multipart body has been received in full before this runs, so the streaming decoder
+    only overlaps with writing the file; upload_raw_and_transcribe_with_whisper overlaps the upload.
+    """
+    try:
+        stored, file_path, transcription_result = await _store_and_transcribe(
+            lambda on_chunk: store_upload(file, on_chunk=on_chunk)
         )
-        
+        return _upload_transcription_response(
+            stored, file.filename, getattr(file, "content_type", None), file_path, transcription_result
+        )
+
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
-        
+
     except Exception as e:
         # Handle any other unexpected errors
         raise HTTPException(
@@ -85,11 +127,39 @@ async def upload_and_transcribe_with_whisper(request: Request, file: UploadFile)
         )
 
 
+async def upload_raw_and_transcribe_with_whisper(request: Request, filename: str) -> BaseResponse[dict]:
+    """Transcribe audio sent as the raw request body, decoding it as it arrives off the socket
+    so inference runs while the rest of the upload is still in flight.
+    """
+    filename = os.path.basename(filename or "")
+    if not filename:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail="filename is required"
+        )
+    content_type = request.headers.get("content-type")
+    try:
+        stored, file_path, transcription_result = await _store_and_transcribe(
+            lambda on_chunk: store_upload_stream(request.stream(), filename, content_type, on_chunk=on_chunk)
+        )
+        return _upload_transcription_response(stored, filename, content_type, file_path, transcription_result)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
+            detail=f"Upload and transcription failed: {str(e)}"
+        )
+
+
 async def transcribe_existing_file_with_whisper(file_path: str) -> BaseResponse[dict]:
     """Transcribe an existing audio file using Whisper model."""
     
     try:
-        # Check if file exists
+        # Uploads are stored under their content hash; accept the original filename too
+        file_path = resolve_stored_path(file_path) or resolve_upload_path(file_path) or file_path
         if not os.path.exists(file_path):
             raise HTTPException(
                 status_code=status_code.HTTP_NOT_FOUND,
@@ -106,6 +176,12 @@ async def transcribe_existing_file_with_whisper(file_path: str) -> BaseResponse[
                 detail=f"Transcription failed: {transcription_result['error']}"
             )
         
+        queue_transcript_for_indexing(
+            source_id=f"whisper:{transcription_result['file_path']}",
+            text=transcription_result["transcription"],
+            source="whisper"
+        )
+
         response_data = {
             "file_info": {
                 "file_path": file_path,
@@ -115,7 +191,8 @@ async def transcribe_existing_file_with_whisper(file_path: str) -> BaseResponse[
                 "text": transcription_result["transcription"],
                 "model_used": transcription_result["model_used"],
                 "chunks_processed": transcription_result["chunks_processed"],
-                "transcript_file_path": transcription_result["file_path"]
+                "transcript_file_path": transcription_result["file_path"],
+                "structured_file_path": transcription_result.get("structured_path")
             }
         }
         
@@ -135,3 +212,42 @@ async def transcribe_existing_file_with_whisper(file_path: str) -> BaseResponse[
             status_code=status_code.HTTP_INTERNAL_SERVER_ERROR,
             detail=f"Transcription failed: {str(e)}"
         )
+
+
+def _render_whisper_transcript(file_path: str, fmt: str) -> str:
+    structured_path = structured_path_for(file_path)
+    if resolve_stored_path(structured_path):
+        return render_transcript_file(structured_path, fmt)
+    # Transcripts saved before structured output existed: parse the text file's chunk headers
+    text = read_text_output(os.path.splitext(file_path)[0] + ".txt")
+    body = text.split("-" * 50 + "\n", 1)[-1]
+    return render_transcript(transcript_from_text(body, None, "whisper", None, 30), fmt)
+
+
+async def export_whisper_transcript(file_path: str, fmt: str = "json") -> Response:
+    """A saved Whisper transcript (transcript_file_path or structured_file_path) in the requested format."""
+    if fmt not in TRANSCRIPT_FORMATS:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(TRANSCRIPT_FORMATS)}"
+        )
+    output_dir = os.path.realpath(OUTPUT_DIR)
+    resolved = os.path.realpath(file_path)
+    if os.path.dirname(resolved) != output_dir:
+        raise HTTPException(
+            status_code=status_code.HTTP_BAD_REQUEST,
+            detail=f"Only transcripts saved in {OUTPUT_DIR}/ can be exported"
+        )
+    try:
+        content = await run_in_threadpool(_render_whisper_transcript, resolved, fmt)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status_code.HTTP_NOT_FOUND,
+            detail=f"File not found: {file_path}"
+        )
+    filename = os.path.splitext(os.path.basename(resolved))[0]
+    return Response(
+        content=content,
+        media_type=TRANSCRIPT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -1,16 +1,124 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-from configs.file_configs import MONGO_URL
-
-try:
-    client = MongoClient(MONGO_URL)
-    client.admin.command("ping")
-    print("Connected Successfully")
-    db = client["transcript_db"]
-    transcript_collection = db["meeting_summary"]
-
-except ConnectionFailure as e:
-    print("Failed to connect to database", e)
-    client = None
-    db = None
-    transcript_collection = None
+import asyncio
+import logging
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+from configs.file_configs import (
+    MONGO_URL,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_HEALTH_CHECK_INTERVAL_SECONDS,
+    MONGO_RECONNECT_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# The async client connects lazily; creating it does not touch the network
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS
+)
+db = client["transcript_db"]
+transcript_collection = db["meeting_summary"]
+transcript_chunks_collection = db["transcript_chunks"]
+
+
+# Last known reachability, maintained by the background probe so requests can fail fast
+_database_state = {"monitored": False, "available": False, "last_checked": None, "last_error": None}
+_monitor_task = None
+# Set by requests that saw a connection failure, so the probe re-checks at once instead of
+# sleeping out the healthy-state interval
+_monitor_wake = None
+_first_probe_done = None
+
+
+def is_database_available() -> bool:
+    return _database_state["available"]
+
+
+def get_database_state() -> dict:
+    return dict(_database_state)
+
+
+def mark_database_unavailable(error: Exception) -> None:
+    """Record a connection failure seen by a request; the probe flips the state back once a ping succeeds."""
+    was_available = _database_state["available"]
+    _database_state["available"] = False
+    _database_state["last_error"] = str(error)
+    if was_available:
+        logger.warning(f"Database became unavailable: {error}")
+        if _monitor_wake is not None:
+            _monitor_wake.set()
+
+
+async def wait_for_database() -> bool:
+    """Availability, waiting for the first probe when it has not finished yet (e.g. right after startup)."""
+    if not _database_state["available"] and _first_probe_done is not None and not _first_probe_done.is_set():
+        try:
+            await asyncio.wait_for(_first_probe_done.wait(), timeout=MONGO_SERVER_SELECTION_TIMEOUT_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+    return _database_state["available"]
+
+
+async def ping_database() -> bool:
+    try:
+        await client.admin.command("ping")
+        if not _database_state["available"]:
+            logger.info("Connected Successfully")
+        _database_state["available"] = True
+        _database_state["last_error"] = None
+        return True
+    except PyMongoError as e:
+        if _database_state["available"] or _database_state["last_checked"] is None:
+            logger.error(f"Failed to connect to database: {e}")
+        _database_state["available"] = False
+        _database_state["last_error"] = str(e)
+        return False
+    finally:
+        _database_state["last_checked"] = time.time()
+        if _first_probe_done is not None:
+            _first_probe_done.set()
+
+
+async def _monitor_database(on_first_connect) -> None:
+    connected_once = False
+    while True:
+        available = await ping_database()
+        if available and not connected_once:
+            connected_once = True
+            if on_first_connect is not None:
+                try:
+                    await on_first_connect()
+                except Exception:
+                    logger.exception("Database startup tasks failed")
+        interval = MONGO_HEALTH_CHECK_INTERVAL_SECONDS if available else MONGO_RECONNECT_INTERVAL_SECONDS
+        try:
+            await asyncio.wait_for(_monitor_wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        _monitor_wake.clear()
+
+
+def start_database_monitor(on_first_connect=None) -> None:
+    """Probe the database in the background instead of blocking startup on it.
+    `on_first_connect` (an async callable) runs once, after the first successful ping.
+    """
+    global _monitor_task, _monitor_wake, _first_probe_done
+    _database_state["monitored"] = True
+    if _monitor_wake is None:
+        _monitor_wake = asyncio.Event()
+        _first_probe_done = asyncio.Event()
+    if _monitor_task is None or _monitor_task.done():
+        _monitor_task = asyncio.get_running_loop().create_task(_monitor_database(on_first_connect))
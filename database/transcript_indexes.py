@@ -0,0 +1,60 @@
+import logging
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+from database.transcript_database import transcript_collection, transcript_chunks_collection
+
+logger = logging.getLogger(__name__)
+
+MEETING_TEXT_INDEX = "meeting_text_search"
+TRANSCRIPT_CHUNK_TEXT_INDEX = "transcript_chunk_text_search"
+
+# Compound indexes follow equality -> sort -> range ordering so the list filters
+# (owner, attendee, date range, archived) never need a collection scan or in-memory sort.
+MEETING_INDEXES = [
+    IndexModel(
+        [("meeting_date", DESCENDING), ("_id", DESCENDING), ("is_archived", ASCENDING)],
+        name="meeting_date_archived"
+    ),
+    IndexModel(
+        [("owner", ASCENDING), ("meeting_date", DESCENDING), ("_id", DESCENDING), ("is_archived", ASCENDING)],
+        name="owner_meeting_date_archived"
+    ),
+    IndexModel(
+        [("attendees", ASCENDING), ("meeting_date", DESCENDING), ("_id", DESCENDING), ("is_archived", ASCENDING)],
+        name="attendees_meeting_date_archived"
+    ),
+    IndexModel(
+        [("transcription_status", ASCENDING)],
+        name="transcription_status",
+        partialFilterExpression={"transcription_status": {"$exists": True}}
+    ),
+    IndexModel(
+        [("auto_schedule.status", ASCENDING)],
+        name="auto_schedule_status",
+        partialFilterExpression={"auto_schedule.status": {"$exists": True}}
+    ),
+]
+
+
+async def ensure_indexes() -> None:
+    """Idempotently create the indexes used by the meeting queries (safe to run on every startup)."""
+    try:
+        await transcript_collection.create_indexes(MEETING_INDEXES)
+        await transcript_collection.create_index(
+            [("title", TEXT), ("location", TEXT), ("notes", TEXT)],
+            name=MEETING_TEXT_INDEX,
+            weights={"title": 10, "location": 5, "notes": 1},
+            default_language="english"
+        )
+        await transcript_chunks_collection.create_index(
+            [("meeting_id", ASCENDING), ("version", ASCENDING), ("index", ASCENDING)],
+            name="meeting_version_index",
+            unique=True
+        )
+        await transcript_chunks_collection.create_index(
+            [("text", TEXT)],
+            name=TRANSCRIPT_CHUNK_TEXT_INDEX,
+            default_language="english"
+        )
+    except PyMongoError as e:
+        logger.error(f"Failed to create meeting indexes: {e}")
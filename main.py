@@ -1,28 +1,44 @@
+import time
+
+_process_started = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Request
-from routes.transcription_routes import meeting_routes
-from routes.calendar_routes import calendar_routes
-from routes.whisper_routes import whisper_routes
 from schemas.response_schema import BaseResponse
 from constants.status_code_constants import status as status_code
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from routes.upload_file_routes import upload_file_routes
+from routes.health_routes import health_routes
+from services.storage_lifecycle_service import CompactionAwareStaticFiles
+from configs.file_configs import APP_ROLE, APP_ROLE_API, APP_ROLE_TRANSCRIPTION_WORKER, APP_ROLES
+from pymongo.errors import ConnectionFailure
 import os
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import resource
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s - %(message)s')
+if APP_ROLE not in APP_ROLES:
+    raise RuntimeError(f"APP_ROLE must be one of {', '.join(APP_ROLES)}, got {APP_ROLE!r}")
 app = FastAPI()
 
-app.include_router(
-    meeting_routes,
-    prefix="/assistant/meetings",
-    tags=["Meetings"]
-)
+# Routers are imported per role so a pod only loads the dependencies of the traffic it serves:
+# "api-only" serves meetings, calendar and uploads; "transcription-worker" serves Whisper
+if APP_ROLE != APP_ROLE_TRANSCRIPTION_WORKER:
+    from routes.transcription_routes import meeting_routes
+    from routes.calendar_routes import calendar_routes
+    app.include_router(
+        meeting_routes,
+        prefix="/assistant/meetings",
+        tags=["Meetings"]
+    )
+    app.include_router(calendar_routes, prefix="/assistant", tags=["Calendar"])
+from routes.upload_file_routes import upload_file_routes
 app.include_router(upload_file_routes, prefix="/assistant/files", tags=["Uploads"])
-app.include_router(whisper_routes, prefix="/assistant", tags=["Whisper Transcription"])
-app.include_router(calendar_routes, prefix="/assistant", tags=["Calendar"])
+if APP_ROLE != APP_ROLE_API:
+    from routes.whisper_routes import whisper_routes
+    app.include_router(whisper_routes, prefix="/assistant", tags=["Whisper Transcription"])
+app.include_router(health_routes, tags=["Health"])
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,10 +52,57 @@ os.makedirs("uploads", exist_ok=True)
 os.makedirs("static", exist_ok=True)
 
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Old recording URLs keep working after the lifecycle manager re-encodes the files behind them
+app.mount("/uploads", CompactionAwareStaticFiles(directory="uploads"), name="uploads")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+async def _on_database_connected():
+    from database.transcript_indexes import ensure_indexes
+    from services.transcription_worker_service import resume_pending_transcriptions
+    from services.auto_schedule_service import resume_pending_auto_schedules
+    await ensure_indexes()
+    resumed = await resume_pending_transcriptions()
+    if resumed:
+        logging.getLogger(__name__).info(f"Re-queued {resumed} interrupted meeting transcriptions")
+    resumed = await resume_pending_auto_schedules()
+    if resumed:
+        logging.getLogger(__name__).info(f"Resumed {resumed} interrupted auto-schedule workflows")
+
+
+@app.on_event("startup")
+async def connect_database():
+    # Never block startup on Mongo: a background probe connects, reconnects and reports health,
+    # and runs index creation and transcription recovery once the database is first reachable
+    if APP_ROLE == APP_ROLE_TRANSCRIPTION_WORKER:
+        return
+    from database.transcript_database import start_database_monitor
+    start_database_monitor(on_first_connect=_on_database_connected)
+
+
+@app.on_event("startup")
+async def start_storage_lifecycle():
+    from services.storage_lifecycle_service import start_storage_lifecycle_manager
+    start_storage_lifecycle_manager()
+
+
+@app.on_event("startup")
+async def start_calendar_mirror():
+    if APP_ROLE == APP_ROLE_TRANSCRIPTION_WORKER:
+        return
+    from services.calendar_service import start_event_mirror_sync
+    start_event_mirror_sync()
+
+
+@app.on_event("startup")
+async def report_startup():
+    # ru_maxrss is reported in KB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    logging.getLogger(__name__).info(
+        f"Started role {APP_ROLE} in {time.perf_counter() - _process_started:.2f}s (peak RSS {peak_rss_mb:.0f} MB)"
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exceptions: RequestValidationError):
     errors = []
@@ -71,3 +134,17 @@ async def http_exception_handler(request: Request, exception: HTTPException):
             statusCode=exception.status_code
         ).dict()
     )
+
+
+@app.exception_handler(ConnectionFailure)
+async def database_unavailable_handler(request: Request, exception: ConnectionFailure):
+    from database.transcript_database import mark_database_unavailable
+    mark_database_unavailable(exception)
+    return JSONResponse(
+        status_code=status_code.HTTP_503_SERVICE_UNAVAILABLE,
+        content=BaseResponse[None](
+            data=None,
+            message="Database is unavailable, please retry shortly",
+            statusCode=status_code.HTTP_503_SERVICE_UNAVAILABLE
+        ).dict()
+    )
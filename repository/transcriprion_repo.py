@@ -1,103 +1,357 @@
-from bson import ObjectId
-from database.transcript_database import transcript_collection
-from pymongo import ReturnDocument
-from services.transcript_services import transcript_audio
+from datetime import timedelta
+from bson import ObjectId, json_util
+from database.transcript_database import transcript_collection, transcript_chunks_collection
+from pymongo import ReturnDocument, InsertOne
+from pymongo.errors import BulkWriteError
+from constants.transcription_constants import TRANSCRIPTION_PENDING, TRANSCRIPTION_ACTIVE_STATUSES
+from constants.auto_schedule_constants import AUTO_SCHEDULE_PENDING, AUTO_SCHEDULE_ACTIVE_STATUSES
+from repository.transcript_store_repo import save_transcript, load_transcripts
+from services.meeting_cache_service import get_meeting_cache, invalidate_meeting, compute_etag
+from utils.transcript_utils import make_snippet
 from utils.validations import now
 
 currentTime = now()
 
 
-def create_meeting(meeting_data: dict):
-    audio_path = meeting_data.get("audio_recording_url")
-    if audio_path:
-        transcript_data = transcript_audio(
-            audio_file_path=f".{audio_path}"
-        )
-        meeting_data['notes'] = transcript_data.get("transcription", "")
-        print(transcript_data.get("file_path", ""))
-        meeting_data['file_path'] = transcript_data.get(
-            "file_path", "")
-    result = transcript_collection.insert_one(meeting_data)
+async def create_meeting(meeting_data: dict):
+    # Transcription runs in the background worker; the meeting is stored right away
+    if meeting_data.get("audio_recording_url"):
+        meeting_data["transcription_status"] = TRANSCRIPTION_PENDING
+        meeting_data["transcription_progress"] = None
+    result = await transcript_collection.insert_one(meeting_data)
     meeting_data["id"] = str(result.inserted_id)
     return meeting_data
 
 
-def get_all_meetings(search: str = None):
-    pipeline = []
+async def create_meetings_bulk(meetings: list, batch_size: int = 500) -> list:
+    """Insert many meetings with unordered bulk writes of batch_size documents.
+    Returns, in input order, (meeting_id, None) for inserted meetings or (None, error) for failed ones.
+    """
+    results = []
+    for start in range(0, len(meetings), batch_size):
+        batch = meetings[start:start + batch_size]
+        operations = []
+        for meeting_data in batch:
+            meeting_data["_id"] = ObjectId()
+            if meeting_data.get("audio_recording_url"):
+                meeting_data["transcription_status"] = TRANSCRIPTION_PENDING
+                meeting_data["transcription_progress"] = None
+            operations.append(InsertOne(meeting_data))
 
-    if search:
-        pipeline.append({
-            "$match": {
-                "$or": [
-                    {"title": {"$regex": search, "$options": "i"}},
-                    {"location": {"$regex": search, "$options": "i"}},
-                ]
+        write_errors = {}
+        try:
+            await transcript_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            write_errors = {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+
+        for index, meeting_data in enumerate(batch):
+            if index in write_errors:
+                results.append((None, write_errors[index]))
+            else:
+                meeting_data["id"] = str(meeting_data.pop("_id"))
+                results.append((meeting_data["id"], None))
+    return results
+
+
+MEETING_PROJECTION = {
+    "id": {"$toString": "$_id"},
+    "title": 1,
+    "meeting_date": 1,
+    "meeting_duration": 1,
+    "location": 1,
+    "notes": 1,
+    "audio_recording_url": 1,
+    "file_path": 1,
+    "structured_path": 1,
+    "owner": 1,
+    "attendees": {"$ifNull": ["$attendees", []]},
+    "attendee_count": {"$size": {"$ifNull": ["$attendees", []]}},
+    "created_at": 1,
+    "updated_at": 1,
+    "is_archived": {"$ifNull": ["$is_archived", False]},
+    "transcription_status": 1,
+    "transcription_progress": 1,
+    "transcription_error": 1,
+    "transcript": 1
+}
+
+# The list view leaves out the (potentially multi-MB) transcript
+MEETING_LIST_FIELDS = [field for field in MEETING_PROJECTION if field != "notes"]
+
+# Upper bound on text-search candidates taken from each collection before ranking
+SEARCH_CANDIDATE_LIMIT = 500
+
+
+def _build_projection(fields: list = None) -> dict:
+    selected = fields or MEETING_LIST_FIELDS
+    projection = {field: MEETING_PROJECTION[field] for field in selected if field in MEETING_PROJECTION}
+    projection["id"] = MEETING_PROJECTION["id"]
+    # Always needed to build the next page cursor
+    projection["meeting_date"] = 1
+    if "notes" in projection:
+        # Transcripts live in the chunk store; the metadata tells load_transcripts where
+        projection["transcript"] = 1
+    return projection
+
+
+SNIPPET_CONTEXT_CHARS = 80
+SNIPPET_LENGTH_CHARS = 240
+
+
+def _search_terms(search: str) -> list:
+    """Plain lower-cased terms of a $text query (phrases and negations are ignored for snippets)."""
+    terms = []
+    for word in search.replace('"', " ").split():
+        if word.startswith("-"):
+            continue
+        word = word.lower()
+        if len(word) >= 3 and word not in terms:
+            terms.append(word)
+    return terms[:5]
+
+
+def _snippet_expression(terms: list) -> dict:
+    """Aggregation expression returning the notes around the first matching term (or null)."""
+    return {
+        "$let": {
+            "vars": {"notes": {"$ifNull": ["$notes", ""]}},
+            "in": {
+                "$let": {
+                    "vars": {
+                        "pos": {
+                            "$reduce": {
+                                "input": terms,
+                                "initialValue": -1,
+                                "in": {
+                                    "$cond": [
+                                        {"$gte": ["$$value", 0]},
+                                        "$$value",
+                                        {"$indexOfCP": [{"$toLower": "$$notes"}, "$$this"]}
+                                    ]
+                                }
+                            }
+                        }
+                    },
+                    "in": {
+                        "$cond": [
+                            {"$gte": ["$$pos", 0]},
+                            {"$substrCP": [
+                                "$$notes",
+                                {"$max": [0, {"$subtract": ["$$pos", SNIPPET_CONTEXT_CHARS]}]},
+                                SNIPPET_LENGTH_CHARS
+                            ]},
+                            None
+                        ]
+                    }
+                }
             }
-        })
-
-    pipeline.append({
-        "$project": {
-            "id": {"$toString": "$_id"},
-            "title": 1,
-            "meeting_date": 1,
-            "meeting_duration": 1,
-            "location": 1,
-            "notes": 1,
-            "audio_recording_url": 1,
-            "file_path": 1,
-            "owner": 1,
-            "attendees": {"$ifNull": ["$attendees", []]},
-            "attendee_count": {"$size": {"$ifNull": ["$attendees", []]}},
-            "created_at": 1,
-            "updated_at": 1,
-            "is_archived": {"$ifNull": ["$is_archived", False]}
         }
-    })
+    }
+
+
+def _keyset_match(sort_field: str, after: tuple) -> dict:
+    """Match documents strictly after the (sort value, _id) key in descending order."""
+    after_value, after_id = after
+    keyset = [{sort_field: after_value, "_id": {"$lt": ObjectId(after_id)}}]
+    if after_value is None:
+        return {"$or": keyset}
+    # Null/missing values sort after every date in descending order, so they always follow a dated key
+    keyset[:0] = [{sort_field: {"$lt": after_value}}, {sort_field: None}]
+    # The outer bound lets the planner scan index ranges instead of an $or plan; $not keeps nulls in it
+    return {sort_field: {"$not": {"$gt": after_value}}, "$or": keyset}
+
+
+async def _search_meetings(search: str, after: tuple, limit: int, fields: list, match: dict):
+    """Rank meetings by text score over their metadata and their transcript chunks."""
+    terms = _search_terms(search)
+    scores = {}
+    snippets = {}
 
-    return list(transcript_collection.aggregate(pipeline))
+    async for doc in transcript_collection.aggregate([
+        {"$match": {"$text": {"$search": search}}},
+        {"$project": {"score": {"$meta": "textScore"}}},
+        {"$sort": {"score": -1}},
+        {"$limit": SEARCH_CANDIDATE_LIMIT}
+    ]):
+        meeting_id = str(doc["_id"])
+        scores[meeting_id] = scores.get(meeting_id, 0.0) + doc["score"]
+
+    async for doc in transcript_chunks_collection.aggregate([
+        {"$match": {"$text": {"$search": search}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$sort": {"score": -1}},
+        {"$limit": SEARCH_CANDIDATE_LIMIT},
+        {"$group": {"_id": "$meeting_id", "score": {"$sum": "$score"}, "text": {"$first": "$text"}}}
+    ]):
+        meeting_id = doc["_id"]
+        scores[meeting_id] = scores.get(meeting_id, 0.0) + doc["score"]
+        snippets[meeting_id] = make_snippet(doc["text"], terms, SNIPPET_CONTEXT_CHARS, SNIPPET_LENGTH_CHARS)
+
+    ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    if after:
+        after_score, after_id = after
+        ranked = [
+            (meeting_id, score) for meeting_id, score in ranked
+            if score < after_score or (score == after_score and meeting_id < after_id)
+        ]
+    if not ranked:
+        return [], None
+
+    visible_match = dict(match)
+    visible_match["_id"] = {"$in": [ObjectId(meeting_id) for meeting_id, _ in ranked]}
+    visible = {str(doc["_id"]) async for doc in transcript_collection.find(visible_match, {"_id": 1})}
+    page = [(meeting_id, score) for meeting_id, score in ranked if meeting_id in visible][:limit + 1]
+
+    projection = _build_projection(fields)
+    projection["snippet"] = _snippet_expression(terms)
+    docs = {
+        str(doc["_id"]): doc
+        async for doc in transcript_collection.aggregate([
+            {"$match": {"_id": {"$in": [ObjectId(meeting_id) for meeting_id, _ in page]}}},
+            {"$project": projection}
+        ])
+    }
+
+    meetings = []
+    for meeting_id, score in page:
+        meeting = docs.get(meeting_id)
+        if not meeting:
+            continue
+        meeting["score"] = score
+        # Inline notes of older meetings are excerpted in the pipeline; chunked transcripts here
+        legacy_snippet = " ".join(meeting["snippet"].split()) if meeting.get("snippet") else None
+        meeting["snippet"] = snippets.get(meeting_id) or legacy_snippet
+        meetings.append(meeting)
+
+    next_key = None
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        next_key = (meetings[-1]["score"], str(meetings[-1]["_id"]))
+    return meetings, next_key
+
+
+def build_meeting_filter(include_archived: bool = False, owner: str = None, attendee: str = None,
+                         date_from: int = None, date_to: int = None) -> dict:
+    """$match filter for the list filters; each one is served by a compound index (see database/transcript_indexes.py)."""
+    match = {}
+    if owner:
+        match["owner"] = owner
+    if attendee:
+        match["attendees"] = attendee
+    if date_from is not None or date_to is not None:
+        match["meeting_date"] = {}
+        if date_from is not None:
+            match["meeting_date"]["$gte"] = date_from
+        if date_to is not None:
+            match["meeting_date"]["$lte"] = date_to
+    if not include_archived:
+        match["is_archived"] = {"$ne": True}
+    return match
+
+
+def build_meeting_list_pipeline(match: dict, after: tuple = None, limit: int = 20, fields: list = None) -> list:
+    if after:
+        keyset = _keyset_match("meeting_date", after)
+        match = {"$and": [match, keyset]} if match else keyset
+    return [
+        {"$match": match},
+        {"$sort": {"meeting_date": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": _build_projection(fields)}
+    ]
+
+
+async def get_all_meetings(search: str = None, after: tuple = None, limit: int = 20,
+                           fields: list = None, include_archived: bool = False, owner: str = None,
+                           attendee: str = None, date_from: int = None, date_to: int = None):
+    """Return one page of meetings plus the key of the last item when more pages follow.
+
+    Without search, meetings are sorted by (meeting_date, _id) descending. With search, the
+    text indexes are used and meetings are ranked by (score, _id) descending with a snippet of
+    the matching transcript. `after` is the key returned for the previous page.
+    """
+    match = build_meeting_filter(
+        include_archived=include_archived,
+        owner=owner,
+        attendee=attendee,
+        date_from=date_from,
+        date_to=date_to
+    )
+    if search:
+        meetings, next_key = await _search_meetings(search, after, limit, fields, match)
+    else:
+        meetings = await transcript_collection.aggregate(
+            build_meeting_list_pipeline(match, after=after, limit=limit, fields=fields)
+        ).to_list(length=None)
+        next_key = None
+        if len(meetings) > limit:
+            meetings = meetings[:limit]
+            last = meetings[-1]
+            next_key = (last.get("meeting_date"), str(last["_id"]))
 
+    if fields and "notes" in fields:
+        await load_transcripts(meetings)
+    return meetings, next_key
 
-def get_particular_meeting(meeting_id: str):
+
+async def _load_meeting(meeting_id: str, include_notes: bool = True):
+    projection = MEETING_PROJECTION if include_notes else _build_projection(MEETING_LIST_FIELDS)
     pipeline = [
         {"$match": {"_id": ObjectId(meeting_id)}},
-        {
-            "$project": {
-                "id": {"$toString": "$_id"},
-                "title": 1,
-                "meeting_date": 1,
-                "meeting_duration": 1,
-                "location": 1,
-                "notes": 1,
-                "audio_recording_url": 1,
-                "file_path": 1,
-                "owner": 1,
-                "attendees": {"$ifNull": ["$attendees", []]},
-                "attendee_count": {"$size": {"$ifNull": ["$attendees", []]}},
-                "created_at": 1,
-                "updated_at": 1,
-                "is_archived": {"$ifNull": ["$is_archived", False]}
-            }
-        }
+        {"$project": projection}
     ]
-    meeting = list(transcript_collection.aggregate(pipeline))
+    meeting = await transcript_collection.aggregate(pipeline).to_list(length=None)
+    if meeting and include_notes:
+        await load_transcripts(meeting)
     return meeting[0] if meeting else None
 
 
-def update_meeting(meeting_id: str, update_meeting_data: dict):
+async def get_meeting_detail(meeting_id: str):
+    """Return (meeting, etag) for the detail endpoint, read through the meeting cache.
+    Returns (None, None) when the meeting does not exist.
+    """
+    cache = get_meeting_cache()
+    generation = None
+    if cache is not None:
+        cached = await cache.get(meeting_id)
+        if cached is not None:
+            return cached
+        generation = await cache.generation(meeting_id)
+    meeting = await _load_meeting(meeting_id)
+    if not meeting:
+        return None, None
+    if cache is not None:
+        return meeting, await cache.set(meeting_id, meeting, generation)
+    return meeting, compute_etag(json_util.dumps(meeting, sort_keys=True))
+
+
+async def get_particular_meeting(meeting_id: str, include_notes: bool = True):
+    if include_notes:
+        meeting, _ = await get_meeting_detail(meeting_id)
+        return meeting
+    return await _load_meeting(meeting_id, include_notes=False)
+
+
+async def update_meeting(meeting_id: str, update_meeting_data: dict):
+    # Transcripts are written to the chunk store, never inline on the meeting
+    notes = update_meeting_data.pop("notes", None)
+    if notes is not None:
+        await save_transcript(meeting_id, notes)
     update_meeting_data['updated_at'] = now()
-    result = transcript_collection.find_one_and_update(
+    result = await transcript_collection.find_one_and_update(
         {"_id": ObjectId(meeting_id)},
         {"$set": update_meeting_data},
         return_document=ReturnDocument.AFTER
     )
+    await invalidate_meeting(meeting_id)
     if result:
         result["id"] = str(result["_id"])
         result.pop("_id", None)
     return result
 
 
-def archive_meeting(meeting_id: str) -> bool:
-    result = transcript_collection.update_one(
+async def archive_meeting(meeting_id: str) -> bool:
+    result = await transcript_collection.update_one(
         {"_id": ObjectId(meeting_id)},
         {
             "$set": {
@@ -106,13 +360,14 @@ def archive_meeting(meeting_id: str) -> bool:
             }
         }
     )
+    await invalidate_meeting(meeting_id)
     return result.modified_count > 0
 
 
  
 
 
-def set_owner_and_attendees(meeting_id: str, owner: str, attendees: list[str]):
+async def set_owner_and_attendees(meeting_id: str, owner: str, attendees: list[str]):
     attendees = [a for a in attendees if isinstance(a, str) and a.strip()]
     update_doc = {
         "$set": {
@@ -124,13 +379,127 @@ def set_owner_and_attendees(meeting_id: str, owner: str, attendees: list[str]):
         update_doc["$set"]["attendees"] = attendees
     else:
         update_doc["$unset"] = {"attendees": ""}
-    result = transcript_collection.find_one_and_update(
+    result = await transcript_collection.find_one_and_update(
         {"_id": ObjectId(meeting_id)},
         update_doc,
         return_document=ReturnDocument.AFTER
     )
+    await invalidate_meeting(meeting_id)
     if result:
         # Normalize id field for response models
         result["id"] = str(result["_id"]) if isinstance(result.get("_id"), ObjectId) else str(result.get("_id"))
         result.pop("_id", None)
     return result
+
+
+async def update_transcription_state(meeting_id: str, fields: dict) -> bool:
+    """Set transcription fields (status, progress, notes, file_path, ...) written by the background worker."""
+    notes = fields.pop("notes", None)
+    if notes is not None:
+        await save_transcript(meeting_id, notes)
+    fields["updated_at"] = now()
+    result = await transcript_collection.update_one(
+        {"_id": ObjectId(meeting_id)},
+        {"$set": fields}
+    )
+    await invalidate_meeting(meeting_id)
+    return result.matched_count > 0
+
+
+def _job_unleased(lease_field: str) -> dict:
+    # Never claimed, released, or left behind by a process that stopped renewing it
+    return {"$or": [{lease_field: None}, {f"{lease_field}.expires_at": {"$lt": now()}}]}
+
+
+async def claim_job_leases(meeting_ids: list, status_field: str, active_statuses: list, lease_field: str,
+                           owner: str, lease_seconds: int) -> list:
+    """Take queued or interrupted background jobs for owner in one write. Each meeting is claimed
+    atomically: of several processes claiming it only one gets it, the others skip it until its
+    lease expires. meeting_ids must not include jobs owner already holds. Returns the ids claimed.
+    """
+    if not meeting_ids:
+        return []
+    object_ids = [ObjectId(meeting_id) for meeting_id in meeting_ids]
+    await transcript_collection.update_many(
+        {"_id": {"$in": object_ids}, status_field: {"$in": active_statuses}, **_job_unleased(lease_field)},
+        {"$set": {lease_field: {"owner": owner, "expires_at": now() + timedelta(seconds=lease_seconds)}}}
+    )
+    claimed = await transcript_collection.find(
+        {"_id": {"$in": object_ids}, f"{lease_field}.owner": owner},
+        {"_id": 1}
+    ).to_list(length=None)
+    return [str(meeting["_id"]) for meeting in claimed]
+
+
+async def renew_job_leases(meeting_ids: list, lease_field: str, owner: str, lease_seconds: int) -> None:
+    """Extend the leases owner still holds on meeting_ids."""
+    if not meeting_ids:
+        return
+    await transcript_collection.update_many(
+        {"_id": {"$in": [ObjectId(meeting_id) for meeting_id in meeting_ids]}, f"{lease_field}.owner": owner},
+        {"$set": {f"{lease_field}.expires_at": now() + timedelta(seconds=lease_seconds)}}
+    )
+
+
+async def release_job_lease(meeting_id: str, lease_field: str, owner: str) -> None:
+    """Give up owner's lease once its job has ended."""
+    await transcript_collection.update_one(
+        {"_id": ObjectId(meeting_id), f"{lease_field}.owner": owner},
+        {"$set": {lease_field: None}}
+    )
+
+
+async def get_meetings_pending_transcription() -> list:
+    """Meetings whose transcription is queued or was interrupted, and that no live worker holds."""
+    return await transcript_collection.find(
+        {"transcription_status": {"$in": TRANSCRIPTION_ACTIVE_STATUSES}, **_job_unleased("transcription_lease")},
+        {"_id": 1, "audio_recording_url": 1}
+    ).to_list(length=None)
+
+
+async def claim_auto_schedule(meeting_id: str) -> bool:
+    """Queue the auto-schedule workflow unless it is already queued or running for this meeting.
+    Returns False when another run holds it.
+    """
+    result = await transcript_collection.update_one(
+        {"_id": ObjectId(meeting_id), "auto_schedule.status": {"$nin": AUTO_SCHEDULE_ACTIVE_STATUSES}},
+        {"$set": {
+            "auto_schedule.status": AUTO_SCHEDULE_PENDING,
+            "auto_schedule.error": None,
+            "auto_schedule.lease": None,
+            "auto_schedule.requested_at": now(),
+            "auto_schedule.updated_at": now()
+        }}
+    )
+    return result.matched_count > 0
+
+
+async def update_auto_schedule_state(meeting_id: str, fields: dict) -> bool:
+    """Checkpoint fields of the auto-schedule workflow (status, analysis, event, ...)."""
+    update = {f"auto_schedule.{key}": value for key, value in fields.items()}
+    update["auto_schedule.updated_at"] = now()
+    result = await transcript_collection.update_one({"_id": ObjectId(meeting_id)}, {"$set": update})
+    return result.matched_count > 0
+
+
+async def get_auto_schedule_states(meeting_ids: list) -> dict:
+    """{meeting_id: {"auto_schedule": ..., "transcription_status": ...}} for the meetings that exist."""
+    meetings = await transcript_collection.find(
+        {"_id": {"$in": [ObjectId(meeting_id) for meeting_id in meeting_ids]}},
+        {"auto_schedule": 1, "transcription_status": 1}
+    ).to_list(length=None)
+    return {
+        str(meeting["_id"]): {
+            "auto_schedule": meeting.get("auto_schedule") or {},
+            "transcription_status": meeting.get("transcription_status")
+        }
+        for meeting in meetings
+    }
+
+
+async def get_meetings_pending_auto_schedule() -> list:
+    """Meetings whose auto-schedule workflow is queued or was interrupted, and that no live worker holds."""
+    return await transcript_collection.find(
+        {"auto_schedule.status": {"$in": AUTO_SCHEDULE_ACTIVE_STATUSES}, **_job_unleased("auto_schedule.lease")},
+        {"_id": 1}
+    ).to_list(length=None)
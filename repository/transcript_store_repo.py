@@ -0,0 +1,133 @@
+import hashlib
+import os
+from bson import ObjectId
+from pymongo import ASCENDING, InsertOne, ReturnDocument
+from database.transcript_database import transcript_collection, transcript_chunks_collection
+from services.meeting_cache_service import invalidate_meeting
+from services.semantic_search_service import queue_transcript_for_indexing
+from utils.transcript_utils import chunk_transcript_text
+from utils.validations import now
+
+# Transcripts are stored in transcript_chunks, one document per chunk, and referenced from the
+# meeting through a small `transcript` metadata sub-document: {version, chunk_count, char_count, content_hash}.
+TRANSCRIPT_CHUNK_MAX_CHARS = int(os.getenv("TRANSCRIPT_CHUNK_MAX_CHARS", str(64 * 1024)))
+
+
+async def save_transcript(meeting_id: str, text: str) -> dict:
+    """Store the transcript as a new chunk version, point the meeting at it and drop the version it replaced.
+    Returns the transcript metadata written on the meeting.
+    """
+    text = text or ""
+    version = str(ObjectId())
+    chunks = chunk_transcript_text(text, max_chars=TRANSCRIPT_CHUNK_MAX_CHARS)
+    if chunks:
+        await transcript_chunks_collection.bulk_write([
+            InsertOne({
+                "meeting_id": meeting_id,
+                "version": version,
+                "index": index,
+                "text": chunk
+            })
+            for index, chunk in enumerate(chunks)
+        ], ordered=False)
+
+    transcript_meta = {
+        "version": version,
+        "chunk_count": len(chunks),
+        "char_count": len(text),
+        "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest()
+    }
+    previous = await transcript_collection.find_one_and_update(
+        {"_id": ObjectId(meeting_id)},
+        {
+            "$set": {"transcript": transcript_meta, "updated_at": now()},
+            "$unset": {"notes": ""}
+        },
+        projection={"transcript.version": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    # Drop only the version this save replaced: with concurrent saves each one removes its own
+    # predecessor, so the version the meeting ends up pointing at is never deleted
+    if previous is None:
+        stale_version = version
+    else:
+        stale_version = (previous.get("transcript") or {}).get("version")
+    if stale_version:
+        await transcript_chunks_collection.delete_many({"meeting_id": meeting_id, "version": stale_version})
+    await invalidate_meeting(meeting_id)
+
+    queue_transcript_for_indexing(source_id=meeting_id, text=text, meeting_id=meeting_id)
+    return transcript_meta
+
+
+async def get_transcript_chunks(meeting_id: str, start: int = 0, end: int = None) -> dict:
+    """Return chunks [start, end) of a meeting transcript without loading the rest.
+    Meetings stored before the chunk store existed expose their inline notes as a single chunk.
+    Returns None when the meeting does not exist.
+    """
+    meeting = await transcript_collection.find_one({"_id": ObjectId(meeting_id)}, {"transcript": 1, "notes": 1})
+    if not meeting:
+        return None
+
+    transcript_meta = meeting.get("transcript")
+    if not transcript_meta:
+        legacy = meeting.get("notes") or ""
+        chunks = [{"index": 0, "text": legacy}] if legacy and start <= 0 and (end is None or end > 0) else []
+        return {"chunk_count": 1 if legacy else 0, "char_count": len(legacy), "chunks": chunks}
+
+    query = {"meeting_id": meeting_id, "version": transcript_meta["version"], "index": {"$gte": start}}
+    if end is not None:
+        query["index"]["$lt"] = end
+    chunks = await transcript_chunks_collection.find(
+        query, {"_id": 0, "index": 1, "text": 1}
+    ).sort("index", ASCENDING).to_list(length=None)
+    return {
+        "chunk_count": transcript_meta.get("chunk_count", 0),
+        "char_count": transcript_meta.get("char_count", 0),
+        "chunks": chunks
+    }
+
+
+async def get_transcript_text(meeting_id: str) -> str:
+    """Assemble the full transcript of a meeting ("" when there is none)."""
+    transcript = await get_transcript_chunks(meeting_id)
+    if not transcript:
+        return ""
+    return "".join(chunk["text"] for chunk in transcript["chunks"])
+
+
+async def load_transcripts(meetings: list) -> None:
+    """Fill `notes` on already-fetched meeting documents with a single chunk query."""
+    versions = {
+        str(m["_id"]): m["transcript"]["version"]
+        for m in meetings if m.get("transcript") and not m.get("notes")
+    }
+    if not versions:
+        return
+    texts = {meeting_id: [] for meeting_id in versions}
+    cursor = transcript_chunks_collection.find(
+        {"meeting_id": {"$in": list(versions)}},
+        {"_id": 0, "meeting_id": 1, "version": 1, "index": 1, "text": 1}
+    ).sort([("meeting_id", ASCENDING), ("index", ASCENDING)])
+    async for chunk in cursor:
+        if versions.get(chunk["meeting_id"]) == chunk["version"]:
+            texts[chunk["meeting_id"]].append(chunk["text"])
+    for meeting in meetings:
+        meeting_id = str(meeting["_id"])
+        if meeting_id in texts:
+            meeting["notes"] = "".join(texts[meeting_id])
+
+
+async def migrate_inline_notes(batch_size: int = 100) -> int:
+    """Move inline `notes` of older meetings into the chunk store. Returns the number migrated."""
+    migrated = 0
+    while True:
+        batch = await transcript_collection.find(
+            {"notes": {"$exists": True}, "transcript": {"$exists": False}},
+            {"_id": 1, "notes": 1}
+        ).to_list(length=batch_size)
+        if not batch:
+            return migrated
+        for meeting in batch:
+            await save_transcript(str(meeting["_id"]), meeting.get("notes") or "")
+            migrated += 1
@@ -1,5 +1,13 @@
+from typing import Optional
+from fastapi import Header
 from controllers import calendar_controllers
-from schemas.calendar_schema import CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse
+from schemas.calendar_schema import (
+    CalendarEventCreate,
+    CalendarEventUpdate,
+    CalendarEventResponse,
+    CalendarBatchRequest,
+    CalendarBatchResponse
+)
 from schemas.response_schema import BaseResponse
 from configs.router_config import create_router
 
@@ -27,6 +35,28 @@ def create_calendar_event_route(event_data: CalendarEventCreate):
     return calendar_controllers.create_event(event_data=event_data)
 
 
+@calendar_routes.post("/events/batch", response_model=BaseResponse[CalendarBatchResponse])
+def batch_calendar_events_route(batch: CalendarBatchRequest):
+    """
+    Create, update and delete many Google Calendar events in one call.
+
+    Operations are sent to Google as batch requests and succeed or fail individually;
+    updates only change the fields given. Results come back in request order.
+
+    Example request:
+    ```json
+    {
+        "operations": [
+            {"operation": "create", "event": {"title": "Follow-up", "start_time_iso": "2024-01-15T10:00:00Z", "duration_minutes": 30}},
+            {"operation": "update", "event_id": "abc123", "changes": {"location": "Room B"}},
+            {"operation": "delete", "event_id": "def456"}
+        ]
+    }
+    ```
+    """
+    return calendar_controllers.batch_events(batch=batch)
+
+
 @calendar_routes.get("/events/{event_id}", response_model=BaseResponse[CalendarEventResponse])
 def get_calendar_event_route(event_id: str):
     """
@@ -39,11 +69,13 @@ def get_calendar_event_route(event_id: str):
 
 
 @calendar_routes.put("/events/{event_id}", response_model=BaseResponse[CalendarEventResponse])
-def update_calendar_event_route(event_id: str, event_data: CalendarEventUpdate):
+def update_calendar_event_route(event_id: str, event_data: CalendarEventUpdate,
+                                if_match: Optional[str] = Header(None)):
     """
     Update an existing Google Calendar event.
     
-    Only provided fields will be updated. All fields are optional.
+    Only provided fields will be updated. All fields are optional. Send the event's etag as
+    If-Match to update only that version; a newer version on Google returns 412.
     
     Example request:
     ```json
@@ -58,7 +90,7 @@ def update_calendar_event_route(event_id: str, event_data: CalendarEventUpdate):
     Args:
         event_id: Google Calendar event ID
     """
-    return calendar_controllers.update_event(event_id=event_id, event_data=event_data)
+    return calendar_controllers.update_event(event_id=event_id, event_data=event_data, if_match=if_match)
 
 
 @calendar_routes.delete("/events/{event_id}", response_model=BaseResponse[None])
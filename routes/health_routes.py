@@ -0,0 +1,10 @@
+from controllers import health_controller
+from schemas.response_schema import BaseResponse
+from configs.router_config import create_router
+
+health_routes = create_router(prefix="", tags=["Health"])
+
+
+@health_routes.get("/health", response_model=BaseResponse[dict])
+async def health_route():
+    return await health_controller.health()
@@ -1,51 +1,157 @@
 from controllers import transcript_controllers
-from schemas.meeting_schema import MeetingCreate, MeetingResponse
-from schemas.response_schema import BaseResponse
+from controllers.health_controller import require_database
+from schemas.meeting_schema import (
+    MeetingCreate,
+    MeetingResponse,
+    SemanticSearchHit,
+    TranscriptChunksResponse,
+    MeetingImportResponse,
+    AutoScheduleState,
+    AutoScheduleBatchRequest,
+    AutoScheduleBatchResponse
+)
+from schemas.response_schema import BaseResponse, PaginatedResponse
 from configs.router_config import create_router
-from fastapi import Query
-from fastapi import Body
+from fastapi import Query, UploadFile, File, Header, Response
+from fastapi import Body, Depends
+from fastapi.responses import FileResponse
 from typing import List
 
-meeting_routes = create_router(prefix="", tags=["Meetings"])
+meeting_routes = create_router(prefix="", tags=["Meetings"], dependencies=[Depends(require_database)])
 
 
-@meeting_routes.post("", response_model=BaseResponse[MeetingCreate])
-def create_meeting_route(meeting: MeetingCreate):
-    return transcript_controllers.create(meeting=meeting)
+@meeting_routes.post("", response_model=BaseResponse[MeetingResponse])
+async def create_meeting_route(meeting: MeetingCreate):
+    return await transcript_controllers.create(meeting=meeting)
 
 
-@meeting_routes.get("", response_model=BaseResponse[List[MeetingResponse]])
-def get_all_meeting_route(search: str = Query(None, description="Search for meeting")):
-    return transcript_controllers.get_all(search=search)
+@meeting_routes.post("/import", response_model=BaseResponse[MeetingImportResponse])
+async def import_meetings_route(
+    file: UploadFile = File(..., description="NDJSON (one meeting per line) or CSV manifest"),
+    batch_size: int = Query(500, ge=1, le=1000, description="Meetings per bulk write")
+):
+    """
+    Bulk-create meetings from a manifest. Every row is validated like POST /assistant/meetings;
+    valid rows are inserted in batches and their transcriptions are queued together.
+
+    CSV columns: title, meeting_date, meeting_duration, location, audio_recording_url, owner,
+    attendees (separated with ';').
+    """
+    return await transcript_controllers.import_meetings(file=file, batch_size=batch_size)
+
+
+@meeting_routes.get("", response_model=PaginatedResponse[List[MeetingResponse]], response_model_exclude_unset=True)
+async def get_all_meeting_route(
+    search: str = Query(None, description="Full-text search over title, location and transcript (ranked by relevance)"),
+    cursor: str = Query(None, description="nextCursor returned by the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    fields: str = Query(None, description="Comma-separated fields to return (notes are left out by default)"),
+    include_archived: bool = Query(False, description="Include archived meetings"),
+    owner: str = Query(None, description="Only meetings owned by this user"),
+    attendee: str = Query(None, description="Only meetings this user attends"),
+    date_from: int = Query(None, ge=0, description="Earliest meeting_date (epoch milliseconds, inclusive)"),
+    date_to: int = Query(None, ge=0, description="Latest meeting_date (epoch milliseconds, inclusive)")
+):
+    return await transcript_controllers.get_all(
+        search=search,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        include_archived=include_archived,
+        owner=owner,
+        attendee=attendee,
+        date_from=date_from,
+        date_to=date_to
+    )
+
+
+@meeting_routes.get("/semantic-search", response_model=BaseResponse[List[SemanticSearchHit]])
+async def semantic_search_route(
+    q: str = Query(..., min_length=1, description="Natural-language query"),
+    k: int = Query(5, ge=1, le=50, description="Number of transcript segments to return"),
+    meeting_id: str = Query(None, description="Restrict the search to one meeting")
+):
+    return await transcript_controllers.semantic_search(query=q, k=k, meeting_id=meeting_id)
 
 
 @meeting_routes.get("/{meeting_id}", response_model=BaseResponse[list[MeetingResponse]])
-def get_meeting_route(meeting_id: str):
-    return transcript_controllers.get_particular(meeting_id=meeting_id)
+async def get_meeting_route(
+    meeting_id: str,
+    response: Response,
+    if_none_match: str = Header(None, description="ETag of a previously fetched version; returns 304 when unchanged")
+):
+    return await transcript_controllers.get_particular(
+        meeting_id=meeting_id,
+        response=response,
+        if_none_match=if_none_match
+    )
+
+
+@meeting_routes.get("/{meeting_id}/transcript", response_model=BaseResponse[TranscriptChunksResponse])
+async def get_meeting_transcript_route(
+    meeting_id: str,
+    start: int = Query(0, ge=0, description="First chunk index"),
+    end: int = Query(None, ge=0, description="Chunk index to stop before (defaults to the last chunk)")
+):
+    return await transcript_controllers.get_transcript(meeting_id=meeting_id, start=start, end=end)
+
+
+@meeting_routes.get("/{meeting_id}/transcript/export")
+async def export_meeting_transcript_route(
+    meeting_id: str,
+    format: str = Query("json", description="json, txt, srt or vtt")
+):
+    """The meeting transcript as a structured JSON document or rendered as text or subtitles."""
+    return await transcript_controllers.export_transcript(meeting_id=meeting_id, fmt=format)
+
+
+@meeting_routes.get("/{meeting_id}/audio", response_class=FileResponse)
+async def get_meeting_audio_clip_route(
+    meeting_id: str,
+    start: float = Query(None, ge=0, description="Clip start in seconds"),
+    end: float = Query(None, gt=0, description="Clip end in seconds (defaults to start + 30)"),
+    segment: int = Query(None, ge=1, description="1-based transcript segment (=== Segment N ===, 5 minutes each)"),
+    chunk: int = Query(None, ge=1, description="1-based Whisper chunk (=== Chunk N ===, 30 seconds each)")
+):
+    """Short clip of the meeting recording; supports HTTP Range requests."""
+    return await transcript_controllers.get_audio_clip(
+        meeting_id=meeting_id, start=start, end=end, segment=segment, chunk=chunk
+    )
 
 
 @meeting_routes.put("/{meeting_id}", response_model=BaseResponse[MeetingCreate])
-def update_meeting_route(meeting_id: str, meeting: MeetingCreate):
-    return transcript_controllers.update(meeting_id=meeting_id, meeting=meeting)
+async def update_meeting_route(meeting_id: str, meeting: MeetingCreate):
+    return await transcript_controllers.update(meeting_id=meeting_id, meeting=meeting)
 
 
 @meeting_routes.patch("/{meeting_id}", response_model=BaseResponse[None])
-def delete_meeting_route(meeting_id: str):
-    return transcript_controllers.archive(meeting_id=meeting_id)
+async def delete_meeting_route(meeting_id: str):
+    return await transcript_controllers.archive(meeting_id=meeting_id)
 
 
  
 
 
 @meeting_routes.post("/{meeting_id}/participants", response_model=BaseResponse[MeetingResponse])
-def set_participants_route(
+async def set_participants_route(
     meeting_id: str,
     owner: str = Body(...),
     attendees: list[str] = Body(default_factory=list)
 ):
-    return transcript_controllers.set_participants(meeting_id=meeting_id, owner=owner, attendees=attendees)
+    return await transcript_controllers.set_participants(meeting_id=meeting_id, owner=owner, attendees=attendees)
+
+
+@meeting_routes.post("/auto-schedule", response_model=BaseResponse[AutoScheduleBatchResponse])
+async def auto_schedule_meetings_route(request: AutoScheduleBatchRequest):
+    """Queue the auto-schedule workflow for many meetings; they run with bounded concurrency."""
+    return await transcript_controllers.auto_schedule_meetings(meeting_ids=request.meeting_ids)
+
+
+@meeting_routes.post("/{meeting_id}/auto-schedule", response_model=BaseResponse[AutoScheduleState])
+async def auto_schedule_meeting_route(meeting_id: str):
+    return await transcript_controllers.auto_schedule_meeting(meeting_id=meeting_id)
 
 
-@meeting_routes.post("/{meeting_id}/auto-schedule", response_model=BaseResponse[dict])
-def auto_schedule_meeting_route(meeting_id: str):
-    return transcript_controllers.auto_schedule_meeting(meeting_id=meeting_id)
+@meeting_routes.get("/{meeting_id}/auto-schedule", response_model=BaseResponse[AutoScheduleState])
+async def get_auto_schedule_status_route(meeting_id: str):
+    return await transcript_controllers.get_auto_schedule_status(meeting_id=meeting_id)
@@ -1,11 +1,80 @@
-from fastapi import UploadFile, File, Request
-from controllers.upload_controller import upload_audio_controller
+from fastapi import UploadFile, File, Request, Header, Query
+from controllers import upload_controller
+from controllers.upload_controller import upload_audio_controller, upload_raw_audio_controller
 from schemas.response_schema import BaseResponse, UploadedFileResponse
+from schemas.upload_schema import (
+    UploadSessionCreate,
+    UploadSessionResponse,
+    UploadPartResponse,
+    CompletedUploadResponse
+)
 from configs.router_config import create_router
 
 upload_file_routes = create_router(prefix="", tags=["Uploads"])
 
 
 @upload_file_routes.post("", response_model=BaseResponse[UploadedFileResponse])
-async def upload_audio(request: Request, file: UploadFile = File(...)):
-    return await upload_audio_controller(request, file)
+async def upload_audio(
+    request: Request,
+    file: UploadFile = File(...),
+    x_content_sha256: str = Header(None, description="Hex sha256 of the file; if already stored it is not written again")
+):
+    """
+    Multipart upload. The body is received in full before the handler runs; to avoid sending
+    content that is already stored, check GET /by-hash first or use POST /raw.
+    """
+    return await upload_audio_controller(request, file, content_sha256=x_content_sha256)
+
+
+@upload_file_routes.post("/raw", response_model=BaseResponse[UploadedFileResponse])
+async def upload_raw_audio(
+    request: Request,
+    filename: str = Query(..., description="Original filename; its extension is kept"),
+    x_content_sha256: str = Header(None, description="Hex sha256 of the file; if already stored the body is not read")
+):
+    """
+    Raw file bytes as the request body. A known X-Content-SHA256 is answered before the body is
+    read; clients sending "Expect: 100-continue" then never transmit it.
+    """
+    return await upload_raw_audio_controller(request, filename, content_sha256=x_content_sha256)
+
+
+@upload_file_routes.get("/by-hash/{sha256}", response_model=BaseResponse[UploadedFileResponse])
+async def get_upload_by_hash_route(sha256: str):
+    """Check whether content is already stored before sending it."""
+    return await upload_controller.get_upload_by_hash(sha256)
+
+
+@upload_file_routes.post("/sessions", response_model=BaseResponse[UploadSessionResponse])
+async def create_upload_session_route(payload: UploadSessionCreate):
+    """
+    Start a resumable upload. Send each part with PUT /sessions/{id}/parts/{n} (0-based, in any
+    order and in parallel), check progress with GET /sessions/{id}, then POST /sessions/{id}/complete.
+    """
+    return await upload_controller.create_upload_session(payload)
+
+
+@upload_file_routes.get("/sessions/{session_id}", response_model=BaseResponse[UploadSessionResponse])
+async def get_upload_session_route(session_id: str):
+    return await upload_controller.get_upload_session(session_id)
+
+
+@upload_file_routes.put("/sessions/{session_id}/parts/{part_number}", response_model=BaseResponse[UploadPartResponse])
+async def upload_part_route(
+    request: Request,
+    session_id: str,
+    part_number: int,
+    x_content_sha256: str = Header(None, description="Hex sha256 of this part; the part is rejected on mismatch")
+):
+    """Raw part bytes as the request body, written at offset part_number * part_size."""
+    return await upload_controller.upload_part(request, session_id, part_number, part_sha256=x_content_sha256)
+
+
+@upload_file_routes.post("/sessions/{session_id}/complete", response_model=BaseResponse[CompletedUploadResponse])
+async def complete_upload_session_route(session_id: str):
+    return await upload_controller.complete_upload_session(session_id)
+
+
+@upload_file_routes.delete("/sessions/{session_id}", response_model=BaseResponse[None])
+async def abort_upload_session_route(session_id: str):
+    return await upload_controller.abort_upload_session(session_id)
@@ -1,5 +1,10 @@
 from fastapi import UploadFile, File, Request, Query
-from controllers.whisper_controller import upload_and_transcribe_with_whisper, transcribe_existing_file_with_whisper
+from controllers.whisper_controller import (
+    upload_and_transcribe_with_whisper,
+    upload_raw_and_transcribe_with_whisper,
+    transcribe_existing_file_with_whisper,
+    export_whisper_transcript
+)
 from schemas.response_schema import BaseResponse
 from configs.router_config import create_router
 
@@ -12,7 +17,25 @@ async def upload_and_transcribe_audio(request: Request, file: UploadFile = File(
     return await upload_and_transcribe_with_whisper(request, file)
 
 
+@whisper_routes.post("/upload/raw", response_model=BaseResponse[dict])
+async def upload_raw_and_transcribe_audio(
+    request: Request,
+    filename: str = Query(..., description="Original filename; its extension is kept")
+):
+    """Audio file as the raw request body, transcribed while it is still being uploaded."""
+    return await upload_raw_and_transcribe_with_whisper(request, filename)
+
+
 @whisper_routes.post("/transcribe", response_model=BaseResponse[dict])
 async def transcribe_existing_audio(file_path: str = Query(..., description="Path to the audio file to transcribe")):
     """Transcribe an existing audio file using Whisper model."""
     return await transcribe_existing_file_with_whisper(file_path)
+
+
+@whisper_routes.get("/transcript")
+async def export_transcript(
+    file_path: str = Query(..., description="transcript_file_path returned by a transcription"),
+    format: str = Query("json", description="json, txt, srt or vtt")
+):
+    """A saved Whisper transcript as structured JSON, plain text or subtitles."""
+    return await export_whisper_transcript(file_path, format)
@@ -35,5 +35,37 @@ class CalendarEventResponse(BaseModel):
     html_link: Optional[str] = Field(None, description="Google Calendar web link")
     hangout_link: Optional[str] = Field(None, description="Google Meet link")
     status: str = Field(..., description="Event status (confirmed, cancelled, etc.)")
+    etag: Optional[str] = Field(None, description="Version of the event; send it as If-Match to update only this version")
     created_at: Optional[str] = Field(None, description="Event creation time")
     updated_at: Optional[str] = Field(None, description="Event last update time")
+
+
+class CalendarBatchOperation(BaseModel):
+    operation: str = Field(..., description='"create", "update" or "delete"')
+    event_id: Optional[str] = Field(
+        None,
+        description="Event to update or delete; on create, an optional id (0-9, a-v) that makes retries idempotent"
+    )
+    event: Optional[CalendarEventCreate] = Field(None, description="Event to create")
+    changes: Optional[CalendarEventUpdate] = Field(None, description="Fields to change on update")
+
+
+class CalendarBatchRequest(BaseModel):
+    operations: List[CalendarBatchOperation] = Field(..., description="Operations, applied independently of each other")
+
+
+class CalendarBatchResult(BaseModel):
+    index: int
+    operation: str
+    status: str  # "succeeded", "invalid" or "failed"
+    event_id: Optional[str] = None
+    event: Optional[CalendarEventResponse] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CalendarBatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[CalendarBatchResult] = Field(default_factory=list)
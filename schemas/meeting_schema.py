@@ -30,10 +30,87 @@ class MeetingCreate(MeetingSchema):
     pass
 
 
+class TranscriptInfo(BaseModel):
+    chunk_count: int = 0
+    char_count: int = 0
+
+
 class MeetingResponse(MeetingSchema):
     id: str
     notes: Optional[str] = None
     is_archived: bool = False
     file_path: Optional[str] = None
+    structured_path: Optional[str] = None
+    transcription_status: Optional[str] = None
+    transcription_progress: Optional[Dict[str, int]] = None
+    transcription_error: Optional[str] = None
+    transcript: Optional[TranscriptInfo] = None
+    score: Optional[float] = None
+    snippet: Optional[str] = None
     created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+
+
+class SemanticSearchHit(BaseModel):
+    meeting_id: Optional[str] = None
+    source: str
+    source_id: str
+    segment: Optional[int] = None
+    chunk_index: Optional[int] = None
+    text: str
+    score: float
+
+
+class TranscriptChunk(BaseModel):
+    index: int
+    text: str
+
+
+class TranscriptChunksResponse(BaseModel):
+    meeting_id: str
+    chunk_count: int
+    char_count: int
+    start: int
+    chunks: List[TranscriptChunk] = Field(default_factory=list)
+
+
+class MeetingImportRow(BaseModel):
+    row: int
+    status: str  # "created", "invalid" or "failed"
+    id: Optional[str] = None
+    transcription_queued: bool = False
+    errors: List[str] = Field(default_factory=list)
+
+
+class MeetingImportResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    transcriptions_queued: int
+    rows: List[MeetingImportRow] = Field(default_factory=list)
+
+
+class AutoScheduleState(BaseModel):
+    meeting_id: str
+    status: Optional[str] = None  # See constants/auto_schedule_constants.py; None if never run
+    idempotency_key: Optional[str] = None
+    analysis: Optional[dict] = None
+    event: Optional[dict] = None
+    error: Optional[str] = None
+    requested_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class AutoScheduleBatchRequest(BaseModel):
+    meeting_ids: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class AutoScheduleBatchItem(BaseModel):
+    meeting_id: str
+    status: str  # "queued", "already_running", "transcription_in_progress", "not_found" or "invalid"
+
+
+class AutoScheduleBatchResponse(BaseModel):
+    total: int
+    queued: int
+    items: List[AutoScheduleBatchItem] = Field(default_factory=list)
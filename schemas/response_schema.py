@@ -10,8 +10,14 @@ class BaseResponse(BaseModel, Generic[T]):
     statusCode: int
 
 
+class PaginatedResponse(BaseResponse[T], Generic[T]):
+    nextCursor: Optional[str] = None
+
+
 class UploadedFileResponse(BaseModel):
     url: str
     name: str
     size: int
-    contentType: Optional[str] = None
\ No newline at end of file
+    contentType: Optional[str] = None
+    sha256: Optional[str] = None
+    deduplicated: bool = False
\ No newline at end of file
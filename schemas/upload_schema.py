@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    part_size: Optional[int] = Field(None, description="Bytes per part; every part but the last has this size")
+    sha256: Optional[str] = Field(None, description="Hex sha256 of the whole file, checked on completion")
+    content_type: Optional[str] = None
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    content_type: Optional[str] = None
+    size: int
+    part_size: int
+    part_count: int
+    sha256: Optional[str] = None
+    received_parts: List[int] = Field(default_factory=list)
+    missing_parts: List[int] = Field(default_factory=list)
+
+
+class UploadPartResponse(BaseModel):
+    part_number: int
+    offset: int
+    size: int
+    sha256: str
+
+
+class CompletedUploadResponse(BaseModel):
+    url: str
+    name: str
+    size: int
+    contentType: Optional[str] = None
+    sha256: str
+    deduplicated: bool = False
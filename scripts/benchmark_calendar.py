@@ -0,0 +1,84 @@
+"""Measure calendar_service call overhead against the local fake Calendar API.
+
+Starts scripts/fake_calendar_server.py in-process and runs create/get/update/delete cycles
+through services.calendar_service, once rebuilding the client before every call (the old
+per-call behaviour) and once with the cached client. Run from the repository root:
+
+    python scripts/benchmark_calendar.py --cycles 50 --threads 1 4 --latency-ms 20
+
+Prints per-operation p50/p95 latency and total calls per second for each mode.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cycle(calendar_service, rebuild: bool, timings: dict, lock: threading.Lock):
+    def timed(name, fn, *args, **kwargs):
+        if rebuild:
+            calendar_service.reset_calendar_client()
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        with lock:
+            timings.setdefault(name, []).append(elapsed)
+        return result
+
+    event = timed("create", calendar_service.create_calendar_event, "Benchmark", "", "2030-01-01T10:00:00Z", 30,
+                  ["someone@example.com"])
+    timed("get", calendar_service.get_calendar_event, event["event_id"])
+    timed("update", calendar_service.update_calendar_event, event["event_id"], title="Benchmark (updated)")
+    timed("delete", calendar_service.delete_calendar_event, event["event_id"])
+
+
+def _run(calendar_service, rebuild: bool, cycles: int, threads: int) -> dict:
+    timings = {}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(_cycle, calendar_service, rebuild, timings, lock) for _ in range(cycles)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    calls = sum(len(v) for v in timings.values())
+    result = {"calls_per_s": calls / elapsed if elapsed else 0.0}
+    for name, values in timings.items():
+        values.sort()
+        result[name] = (statistics.median(values) * 1000, values[max(int(len(values) * 0.95) - 1, 0)] * 1000)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calendar client against a local fake API")
+    parser.add_argument("--cycles", type=int, default=50, help="create/get/update/delete cycles per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency the fake server adds per request")
+    parser.add_argument("--port", type=int, default=0, help="Port for the fake server (0 = any free port)")
+    args = parser.parse_args()
+
+    from fake_calendar_server import make_server
+    server = make_server("127.0.0.1", args.port, argparse.Namespace(latency_ms=args.latency_ms, jitter_ms=0.0, verbose=False))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["GOOGLE_CALENDAR_ROOT_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["GOOGLE_CALENDAR_ANONYMOUS"] = "true"
+    from services import calendar_service
+
+    print(f"{'mode':<10} {'threads':>7} {'calls/s':>9}  " + "  ".join(f"{op + ' p50/p95 ms':>22}" for op in ("create", "get", "update", "delete")))
+    for threads in args.threads:
+        for mode, rebuild in (("rebuild", True), ("cached", False)):
+            calendar_service.reset_calendar_client()
+            result = _run(calendar_service, rebuild, args.cycles, threads)
+            columns = "  ".join(f"{result[op][0]:>10.1f}/{result[op][1]:<11.1f}" for op in ("create", "get", "update", "delete"))
+            print(f"{mode:<10} {threads:>7} {result['calls_per_s']:>9.1f}  {columns}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
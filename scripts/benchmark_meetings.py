@@ -0,0 +1,92 @@
+"""Measure requests per second for the meeting read endpoints.
+
+Start the API (e.g. `uvicorn main:app --port 8080`) against a database with some meetings,
+then run:
+
+    python scripts/benchmark_meetings.py --base-url http://127.0.0.1:8080 --concurrency 1 8 32 64
+
+To compare before/after a change, run the same command against both builds and compare the
+printed tables (requests/s and p50/p95 latency per endpoint and concurrency level).
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _get(url: str, timeout: float) -> float:
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        e.read()
+    return time.perf_counter() - started
+
+
+def _run(url: str, concurrency: int, duration: float, timeout: float) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            try:
+                latency = _get(url, timeout)
+                with lock:
+                    latencies.append(latency)
+            except Exception:
+                with lock:
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /assistant/meetings endpoints")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    base = args.base_url.rstrip("/") + "/assistant/meetings"
+    with urllib.request.urlopen(f"{base}?limit=1&fields=title", timeout=args.timeout) as response:
+        meetings = json.loads(response.read()).get("data") or []
+    if not meetings:
+        raise SystemExit("No meetings found; create some before benchmarking")
+
+    endpoints = {
+        "list": f"{base}?limit=20",
+        "detail": f"{base}/{meetings[0]['id']}"
+    }
+
+    print(f"{'endpoint':<8} {'conc':>5} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, url in endpoints.items():
+        for concurrency in args.concurrency:
+            result = _run(url, concurrency, args.duration, args.timeout)
+            print(f"{name:<8} {concurrency:>5} {result['requests']:>9} {result['errors']:>7} "
+                  f"{result['rps']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
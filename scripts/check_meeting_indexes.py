@@ -0,0 +1,66 @@
+"""Explain the meeting list queries and fail if any of them needs a collection scan.
+
+    python scripts/check_meeting_indexes.py
+
+Creates the indexes first (same bootstrap as app startup), then explains the list pipeline for
+each filter combination. Exits with status 1 when a plan contains COLLSCAN or an in-memory SORT.
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from database.transcript_database import db, transcript_collection  # noqa: E402
+from database.transcript_indexes import ensure_indexes  # noqa: E402
+from repository.transcriprion_repo import build_meeting_filter, build_meeting_list_pipeline  # noqa: E402
+
+QUERY_SHAPES = {
+    "default": {},
+    "include_archived": {"include_archived": True},
+    "owner": {"owner": "owner@example.com"},
+    "attendee": {"attendee": "someone@example.com"},
+    "date_range": {"date_from": 1700000000000, "date_to": 1800000000000},
+    "owner_date_range": {"owner": "owner@example.com", "date_from": 1700000000000, "date_to": 1800000000000},
+}
+
+
+def _stages(plan) -> list:
+    """Collect every stage name in an explain plan tree."""
+    found = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.append(plan["stage"])
+        for value in plan.values():
+            found.extend(_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(_stages(value))
+    return found
+
+
+async def main() -> int:
+    await ensure_indexes()
+    failures = 0
+    for name, filters in QUERY_SHAPES.items():
+        for after in (None, (1750000000000, str(ObjectId()))):
+            pipeline = build_meeting_list_pipeline(build_meeting_filter(**filters), after=after, limit=20)
+            explain = await db.command(
+                "explain",
+                {"aggregate": transcript_collection.name, "pipeline": pipeline, "cursor": {}},
+                verbosity="queryPlanner"
+            )
+            stages = _stages(explain)
+            bad = [stage for stage in stages if stage in ("COLLSCAN", "SORT")]
+            label = f"{name}{' +cursor' if after else ''}"
+            print(f"{'FAIL' if bad else 'ok  '} {label:<28} {' > '.join(dict.fromkeys(stages))}")
+            if bad:
+                failures += 1
+                print(json.dumps(explain.get("queryPlanner", explain), default=str, indent=2)[:2000])
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,280 @@
+"""Local fake of the Google Calendar v3 events API, used for offline benchmarks and testing.
+
+Run it and point the app at it:
+
+    python scripts/fake_calendar_server.py --port 8091 --latency-ms 50
+    GOOGLE_CALENDAR_ROOT_URL=http://127.0.0.1:8091 GOOGLE_CALENDAR_ANONYMOUS=true uvicorn main:app
+
+Events are kept in memory. Supports events insert/get/list/update/patch/delete under
+/calendar/v3/calendars/<calendar_id>/events (list honours syncToken, and If-Match is checked
+on writes) and batch requests on /batch/calendar/v3.
+GET /stats returns request and connection counters.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+EVENTS_PREFIX = "/calendar/v3/calendars/"
+BATCH_PATH = "/batch/calendar/v3"
+
+
+def _error_body(status: int, message: str):
+    return status, {"error": {"code": status, "message": message}}
+
+
+class FakeCalendarState:
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.events = {}  # (calendar_id, event_id) -> event
+        self.versions = {}  # (calendar_id, event_id) -> version of its last change, used as sync token
+        self.version = 0
+        self.stats = {"requests": 0, "batches": 0, "connections": 0, "errors": 0}
+
+    def bump(self, key: str, delta: int = 1):
+        with self.lock:
+            self.stats[key] += delta
+
+    def _stamp(self, calendar_id: str, event: dict) -> dict:
+        self.version += 1
+        self.versions[(calendar_id, event["id"])] = self.version
+        event["etag"] = f'"{self.version}"'
+        event["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        return event
+
+    def insert(self, calendar_id: str, body: dict) -> dict:
+        with self.lock:
+            event = dict(body)
+            event_id = event.get("id") or uuid.uuid4().hex
+            if (calendar_id, event_id) in self.events:
+                return None
+            event.update({
+                "id": event_id,
+                "kind": "calendar#event",
+                "status": event.get("status", "confirmed"),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "htmlLink": f"https://calendar.example.invalid/event?eid={event_id}",
+            })
+            self.events[(calendar_id, event_id)] = self._stamp(calendar_id, event)
+            return dict(event)
+
+    def get(self, calendar_id: str, event_id: str) -> dict:
+        with self.lock:
+            event = self.events.get((calendar_id, event_id))
+            return dict(event) if event else None
+
+    def write(self, calendar_id: str, event_id: str, body: dict, replace: bool, if_match: str = None):
+        """Update or patch an event. Returns (status, event)."""
+        with self.lock:
+            event = self.events.get((calendar_id, event_id))
+            if event is None or event.get("status") == "cancelled":
+                return 404, None
+            if if_match and if_match != event["etag"]:
+                return 412, None
+            kept = {k: event[k] for k in ("id", "kind", "created", "htmlLink")}
+            updated = {**body, **kept} if replace else {**event, **body, **kept}
+            self.events[(calendar_id, event_id)] = self._stamp(calendar_id, updated)
+            return 200, dict(updated)
+
+    def list(self, calendar_id: str, params: dict):
+        """events.list with syncToken/pageToken support. Returns (status, body)."""
+        page_size = min(int(params.get("maxResults", 250)), 2500)
+        offset = int(params.get("pageToken", 0))
+        sync_token = params.get("syncToken")
+        if sync_token is not None and not sync_token.isdigit():
+            return _error_body(410, "Sync token is no longer valid, a full sync is required.")
+        with self.lock:
+            since = int(sync_token) if sync_token is not None else 0
+            show_deleted = sync_token is not None or params.get("showDeleted") == "true"
+            changed = sorted(
+                (version, key) for key, version in self.versions.items()
+                if key[0] == calendar_id and version > since
+            )
+            items = [dict(self.events[key]) for _, key in changed
+                     if show_deleted or self.events[key].get("status") != "cancelled"]
+            body = {"kind": "calendar#events", "items": items[offset:offset + page_size]}
+            if offset + page_size < len(items):
+                body["nextPageToken"] = str(offset + page_size)
+            else:
+                body["nextSyncToken"] = str(self.version)
+            return 200, body
+
+    def delete(self, calendar_id: str, event_id: str) -> bool:
+        with self.lock:
+            event = self.events.get((calendar_id, event_id))
+            if event is None or event.get("status") == "cancelled":
+                return False
+            # Deleted events stay visible as cancelled, as in the real API
+            event["status"] = "cancelled"
+            self._stamp(calendar_id, event)
+            return True
+
+
+def make_handler(state: FakeCalendarState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse shows up in the stats
+        # Headers and body go out as separate writes; without this, Nagle plus the client's
+        # delayed ACK adds ~40 ms to every response on a reused connection
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            state.bump("connections")
+
+        def log_message(self, format, *args):
+            if state.args.verbose:
+                super().log_message(format, *args)
+
+        def _send_json(self, status: int, body=None, headers: dict = None):
+            data = json.dumps(body).encode("utf-8") if body is not None else b""
+            self.send_response(status)
+            if body is not None:
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _route(self, path: str):
+            """(calendar_id, event_id or None) for an events URL, or None."""
+            if not path.startswith(EVENTS_PREFIX):
+                return None
+            parts = path[len(EVENTS_PREFIX):].split("/")
+            if len(parts) == 2 and parts[1] == "events":
+                return unquote(parts[0]), None
+            if len(parts) == 3 and parts[1] == "events":
+                return unquote(parts[0]), unquote(parts[2])
+            return None
+
+        def _dispatch(self, method: str, path: str, headers, body: bytes):
+            """Handle one API call; returns (status, json body or None)."""
+            route = self._route(urlsplit(path).path)
+            if route is None:
+                return _error_body(404, "Not Found")
+            calendar_id, event_id = route
+            payload = json.loads(body or b"{}")
+
+            if method == "POST" and event_id is None:
+                event = state.insert(calendar_id, payload)
+                return (200, event) if event else _error_body(409, "The requested identifier already exists.")
+            if method == "GET" and event_id is None:
+                return state.list(calendar_id, dict(parse_qsl(urlsplit(path).query)))
+            if method == "GET" and event_id is not None:
+                event = state.get(calendar_id, event_id)
+                return (200, event) if event else _error_body(404, "Not Found")
+            if method in ("PUT", "PATCH") and event_id is not None:
+                status, event = state.write(calendar_id, event_id, payload, method == "PUT", headers.get("If-Match"))
+                if status != 200:
+                    return _error_body(status, "Precondition Failed" if status == 412 else "Not Found")
+                return 200, event
+            if method == "DELETE" and event_id is not None:
+                return (204, None) if state.delete(calendar_id, event_id) else _error_body(410, "Resource has been deleted")
+            return _error_body(405, "Method Not Allowed")
+
+        def _batch(self, body: bytes):
+            """multipart/mixed batch of application/http parts, answered in the same format."""
+            message = BytesParser().parsebytes(
+                b"Content-Type: " + self.headers.get("Content-Type", "").encode("latin-1") + b"\r\n\r\n" + body)
+            if not message.is_multipart():
+                self._send_json(*_error_body(400, "Batch body must be multipart/mixed"))
+                return
+            boundary = f"batch_{uuid.uuid4().hex}"
+            out = []
+            for part in message.get_payload():
+                raw = part.get_payload(decode=False).replace("\r\n", "\n")
+                head, _, part_body = raw.partition("\n\n")
+                request_line, *header_lines = head.split("\n")
+                method, path, _ = request_line.split(" ", 2)
+                part_headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+                status, result = self._dispatch(method, path, part_headers, part_body.encode("utf-8"))
+                if status >= 300:
+                    state.bump("errors")
+                content_id = part["Content-ID"] or ""
+                data = json.dumps(result) if result is not None else ""
+                out.append(
+                    f"--{boundary}\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id.strip('<>')}>\r\n\r\n"
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json; charset=UTF-8\r\nContent-Length: {len(data)}\r\n\r\n"
+                    f"{data}\r\n"
+                )
+            out.append(f"--{boundary}--\r\n")
+            data = "".join(out).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _handle(self, method: str):
+            state.bump("requests")
+            if state.args.latency_ms:
+                time.sleep(max(state.args.latency_ms + random.uniform(-state.args.jitter_ms, state.args.jitter_ms), 0) / 1000.0)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            path = urlsplit(self.path).path
+            if method == "GET" and path == "/stats":
+                self._send_json(200, state.stats)
+                return
+            if method == "POST" and path == BATCH_PATH:
+                state.bump("batches")
+                self._batch(body)
+                return
+            status, result = self._dispatch(method, self.path, self.headers, body)
+            if status >= 300:
+                state.bump("errors")
+            self._send_json(status, result)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+        def do_PATCH(self):
+            self._handle("PATCH")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+    return Handler
+
+
+def make_server(host: str, port: int, args) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(FakeCalendarState(args)))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Google Calendar API for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter added to the latency")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args)
+    print(f"Fake Calendar API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Local stand-in for the LLM API, used for offline load testing.
+
+Run it and point the app at it:
+
+    python scripts/llm_standin_server.py --port 8090 --latency-ms 800 --max-concurrency 4 --error-rate 0.02
+    LLM_BACKEND=standin LLM_STANDIN_URL=http://127.0.0.1:8090 uvicorn main:app
+
+POST /generate accepts {"model": ..., "parts": [{"text": ...} | {"mime_type": ..., "data": <base64>}]}
+and returns {"text": ...}. GET /stats returns request counters.
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInState:
+    def __init__(self, args):
+        self.args = args
+        self.slots = threading.BoundedSemaphore(args.max_concurrency) if args.max_concurrency > 0 else None
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def allow_request(self) -> bool:
+        """Fixed one-second window rate limit (--rps); 0 disables it."""
+        if self.args.rps <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start = now
+                self.window_count = 0
+            if self.window_count >= self.args.rps:
+                return False
+            self.window_count += 1
+            return True
+
+    def bump(self, key: str, delta: int = 1):
+        with self.lock:
+            self.stats[key] += delta
+            if key == "in_flight":
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+
+def _fake_response(parts: list) -> str:
+    text = " ".join(p.get("text", "") for p in parts if "text" in p)
+    blobs = [p for p in parts if "data" in p]
+    if blobs:
+        size = sum(len(base64.b64decode(p["data"])) for p in blobs)
+        return (
+            f"Speaker 1: Stand-in transcript for {size} bytes of {blobs[0].get('mime_type')} audio.\n"
+            "Speaker 2: Let's schedule a follow-up next week.\n\n"
+            "Title: Stand-in Meeting\nSummary: Generated locally.\nKey Points:\n- none\n\nAction Items:\n- none"
+        )
+    if "candidates" in text and "CANDIDATES:" not in text:
+        return json.dumps({"candidates": []})
+    return json.dumps({"should_schedule": False})
+
+
+def make_handler(state: StandInState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            if state.args.verbose:
+                super().log_message(format, *args)
+
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, state.stats)
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self._send_json(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            state.bump("requests")
+
+            if not state.allow_request():
+                state.bump("throttled")
+                self._send_json(429, {"error": "rate limit exceeded"})
+                return
+
+            if state.slots is not None:
+                state.slots.acquire()
+            state.bump("in_flight")
+            try:
+                args = state.args
+                input_kb = length / 1024.0
+                delay_ms = args.latency_ms + random.uniform(-args.jitter_ms, args.jitter_ms) + input_kb * args.ms_per_kb
+                time.sleep(max(delay_ms, 0) / 1000.0)
+
+                if random.random() < args.error_rate:
+                    state.bump("errors")
+                    self._send_json(500, {"error": "simulated upstream failure"})
+                    return
+
+                state.bump("ok")
+                self._send_json(200, {"model": payload.get("model"), "text": _fake_response(payload.get("parts", []))})
+            finally:
+                state.bump("in_flight", -1)
+                if state.slots is not None:
+                    state.slots.release()
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local LLM stand-in server for offline load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform +/- jitter added to the latency")
+    parser.add_argument("--ms-per-kb", type=float, default=0.0, help="Extra latency per KB of request body")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Requests processed at once (0 = unlimited); the rest queue")
+    parser.add_argument("--rps", type=int, default=0, help="Requests accepted per second (0 = unlimited); the rest get 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StandInState(args)))
+    print(f"LLM stand-in listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
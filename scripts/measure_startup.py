@@ -0,0 +1,66 @@
+"""Measure cold-start time and memory of the app for each APP_ROLE.
+
+Each role is started in a fresh interpreter that imports main.py and runs the startup hooks,
+as uvicorn would. Run from the repository root:
+
+    python scripts/measure_startup.py --runs 3
+
+Prints, per role: median time to import the app, median time until startup hooks finished,
+peak RSS and which heavy libraries ended up loaded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROLES = ["api-only", "transcription-worker", "all"]
+HEAVY_MODULES = ["torch", "transformers", "librosa", "google.generativeai", "googleapiclient", "chromadb"]
+
+CHILD = r"""
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def startup():
+    # Run the startup hooks without serving; the database probe only needs to be scheduled
+    await main.app.router.startup()
+
+asyncio.run(startup())
+ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "ready_s": ready - started,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in %r if m in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _measure(role: str) -> dict:
+    env = dict(os.environ, APP_ROLE=role)
+    result = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Role {role} failed to start:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app cold-start time and RSS per APP_ROLE")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per role")
+    parser.add_argument("--roles", nargs="+", default=ROLES, choices=ROLES)
+    args = parser.parse_args()
+
+    print(f"{'role':<22} {'import s':>9} {'ready s':>8} {'RSS MB':>7}  heavy modules loaded")
+    for role in args.roles:
+        runs = [_measure(role) for _ in range(args.runs)]
+        loaded = sorted({m for run in runs for m in run["loaded"]})
+        print(f"{role:<22} {statistics.median(r['import_s'] for r in runs):>9.2f} "
+              f"{statistics.median(r['ready_s'] for r in runs):>8.2f} "
+              f"{max(r['rss_mb'] for r in runs):>7.0f}  {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
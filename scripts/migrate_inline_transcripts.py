@@ -0,0 +1,16 @@
+"""Move inline `notes` of existing meetings into the transcript chunk store.
+
+    python scripts/migrate_inline_transcripts.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repository.transcript_store_repo import migrate_inline_notes  # noqa: E402
+
+
+if __name__ == "__main__":
+    migrated = asyncio.run(migrate_inline_notes())
+    print(f"Migrated {migrated} meeting transcripts")
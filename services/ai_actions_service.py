@@ -1,49 +1,131 @@
-import google.generativeai as genai
 import os
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import List
 
+from services.llm_cache_service import cached_generate
+from services.llm_client_service import get_llm_client
+from utils.transcript_utils import split_transcript_segments, pack_segments
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-1.5-flash")
 
+# Notes longer than this are analyzed hierarchically (map over parts, then reduce)
+HIERARCHICAL_THRESHOLD_CHARS = int(os.getenv("AI_ACTIONS_HIERARCHICAL_THRESHOLD_CHARS", "30000"))
+# Upper bound on the transcript text sent in a single map prompt
+MAP_PART_MAX_CHARS = int(os.getenv("AI_ACTIONS_MAP_PART_MAX_CHARS", "12000"))
+MAP_CONCURRENCY = int(os.getenv("AI_ACTIONS_MAP_CONCURRENCY", "4"))
 
-def analyze_for_meeting_action(notes: str) -> dict:
-    """Use Gemini to decide if notes imply scheduling a meeting and extract details."""
-    if not notes or not notes.strip():
+
+def _generate_text(instructions: str, content: str, label: str = "TEXT") -> str:
+    """Run the prompt through the LLM client, memoized on (model, instructions, content)."""
+    client = get_llm_client()
+
+    def generate() -> str:
+        return client.generate([f"{instructions}\n\n{label}:\n{content}"])
+
+    return cached_generate(client.model_name, f"{instructions}|{label}", content, generate)
+
+
+def _parse_json_block(text: str):
+    """Naive parsing: find the outermost JSON object in the model output, or None."""
+    json_match = re.search(r"\{[\s\S]*\}", text or "")
+    if not json_match:
+        return None
+    try:
+        return json.loads(json_match.group(0))
+    except Exception:
+        return None
+
+
+def _normalize_action(data) -> dict:
+    """Apply basic defaults/validation to a scheduling decision."""
+    if not isinstance(data, dict):
         return {"should_schedule": False}
+    data["should_schedule"] = bool(data.get("should_schedule", False))
+    if data["should_schedule"]:
+        if not data.get("start_time_iso"):
+            # Default to 24h from now
+            data["start_time_iso"] = (datetime.utcnow() + timedelta(days=1)).isoformat() + "Z"
+        if not data.get("duration_minutes"):
+            data["duration_minutes"] = 30
+    return data
+
 
-    prompt = (
+def _analyze_single(notes: str) -> dict:
+    instructions = (
         "You are an assistant that extracts meeting scheduling intents from text. "
         "Given the meeting transcript/notes below, determine if there is an actionable that "
         "requires scheduling a follow-up meeting. If yes, extract: title, short description, "
         "a suggested ISO8601 start time in the near future (using user's locale assumption), "
         "and a duration in minutes. Return a strict JSON with keys: "
         "should_schedule (boolean), title (string), description (string), "
-        "start_time_iso (ISO8601 string), duration_minutes (int). If insufficient info, set should_schedule=false.\n\n"
-        f"TEXT:\n{notes}"
+        "start_time_iso (ISO8601 string), duration_minutes (int). If insufficient info, set should_schedule=false."
+    )
+    return _normalize_action(_parse_json_block(_generate_text(instructions, notes)))
+
+
+def _extract_candidates(part: str) -> List[dict]:
+    """Map step: list the scheduling intents mentioned in one part of the transcript."""
+    instructions = (
+        "You are an assistant that extracts meeting scheduling intents from one part of a longer "
+        "meeting transcript. List every follow-up meeting that participants agreed or proposed to schedule. "
+        "Return a strict JSON object with key candidates: a list of objects with keys "
+        "title (string), description (string), start_time_iso (ISO8601 string or null), "
+        "duration_minutes (int or null), evidence (short quote from the text). "
+        "Return {\"candidates\": []} if there are none."
+    )
+    data = _parse_json_block(_generate_text(instructions, part))
+    if not isinstance(data, dict):
+        return []
+    candidates = data.get("candidates") or []
+    return [c for c in candidates if isinstance(c, dict)]
+
+
+def _choose_action(candidates: List[dict]) -> dict:
+    """Reduce step: pick the final scheduling action from the extracted candidates."""
+    instructions = (
+        "You are an assistant that decides on a single follow-up meeting to schedule. "
+        "Below are candidate scheduling intents extracted, in order, from the parts of a long meeting transcript. "
+        "Merge duplicates, prefer later decisions over earlier ones, and choose the one follow-up meeting "
+        "that should be scheduled. Return a strict JSON with keys: "
+        "should_schedule (boolean), title (string), description (string), "
+        "start_time_iso (ISO8601 string), duration_minutes (int). If no candidate is actionable, set should_schedule=false."
     )
+    return _normalize_action(_parse_json_block(
+        _generate_text(instructions, json.dumps(candidates, ensure_ascii=False), label="CANDIDATES")
+    ))
+
+
+def _analyze_hierarchical(notes: str) -> dict:
+    parts = pack_segments(split_transcript_segments(notes), max_chars=MAP_PART_MAX_CHARS)
+    if not parts:
+        return {"should_schedule": False}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAP_CONCURRENCY, len(parts)))) as executor:
+        results = list(executor.map(_extract_candidates, parts))
 
-    response = model.generate_content(prompt)
-    text = response.text if hasattr(response, "text") else str(response)
-
-    # naive parsing: try to find a JSON block; if fails, fallback
-    import json, re
-    json_match = re.search(r"\{[\s\S]*\}", text)
-    if json_match:
-        try:
-            data = json.loads(json_match.group(0))
-            # Basic defaults/validation
-            data["should_schedule"] = bool(data.get("should_schedule", False))
-            if data["should_schedule"]:
-                if not data.get("start_time_iso"):
-                    # Default to 24h from now
-                    data["start_time_iso"] = (datetime.utcnow() + timedelta(days=1)).isoformat() + "Z"
-                if not data.get("duration_minutes"):
-                    data["duration_minutes"] = 30
-            return data
-        except Exception:
-            pass
-
-    return {"should_schedule": False}
+    candidates: List[dict] = []
+    for part_index, part_candidates in enumerate(results):
+        for candidate in part_candidates:
+            candidate["part"] = part_index + 1
+            candidates.append(candidate)
 
+    if not candidates:
+        return {"should_schedule": False}
+    return _choose_action(candidates)
+
+
+def analyze_for_meeting_action(notes: str, mode: str = "auto") -> dict:
+    """Use the LLM to decide if notes imply scheduling a meeting and extract details.
+
+    mode: "single" sends the whole notes in one prompt, "hierarchical" splits them on the
+    "=== Segment N ===" headers and runs a parallel map step followed by a small reduce step,
+    "auto" picks hierarchical for notes longer than HIERARCHICAL_THRESHOLD_CHARS.
+    """
+    if not notes or not notes.strip():
+        return {"should_schedule": False}
 
+    if mode == "hierarchical" or (mode == "auto" and len(notes) > HIERARCHICAL_THRESHOLD_CHARS):
+        return _analyze_hierarchical(notes)
+    return _analyze_single(notes)
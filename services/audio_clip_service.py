@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CLIP_CACHE_DIR = os.getenv("AUDIO_CLIP_CACHE_DIR", os.path.join(".cache", "clips"))
+AUDIO_CLIP_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CLIP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+AUDIO_CLIP_MAX_SECONDS = float(os.getenv("AUDIO_CLIP_MAX_SECONDS", "600"))
+# Window sizes used by the transcription pipelines: "=== Segment N ===" (Gemini) and "=== Chunk N ===" (Whisper)
+SEGMENT_SECONDS = 300
+CHUNK_SECONDS = 30
+
+_cache_lock = threading.Lock()
+
+
+def resolve_clip_range(start: float = None, end: float = None, segment: int = None,
+                       chunk: int = None) -> Tuple[float, float]:
+    """Turn start/end seconds or a 1-based segment/chunk number into a (start, end) range."""
+    if sum(value is not None for value in (segment, chunk)) + (start is not None or end is not None) != 1:
+        raise ValueError("Give exactly one of start/end, segment or chunk")
+    if segment is not None:
+        if segment < 1:
+            raise ValueError("segment starts at 1")
+        return (segment - 1) * SEGMENT_SECONDS, segment * SEGMENT_SECONDS
+    if chunk is not None:
+        if chunk < 1:
+            raise ValueError("chunk starts at 1")
+        return (chunk - 1) * CHUNK_SECONDS, chunk * CHUNK_SECONDS
+    start = start or 0.0
+    if end is None:
+        end = start + CHUNK_SECONDS
+    if start < 0 or end <= start:
+        raise ValueError("end must be greater than start")
+    if end - start > AUDIO_CLIP_MAX_SECONDS:
+        raise ValueError(f"Clips are limited to {AUDIO_CLIP_MAX_SECONDS:g} seconds")
+    return start, end
+
+
+def _clip_wav(src_path: str, dst_path: str, start: float, end: float) -> bool:
+    """Copy the PCM frames of [start, end) by seeking in the WAV data chunk; nothing is decoded.
+    Returns False when src_path is not a PCM WAV file.
+    """
+    try:
+        with wave.open(src_path, "rb") as src:
+            params = src.getparams()
+            first = int(start * params.framerate)
+            if first >= params.nframes:
+                raise ValueError("start is beyond the end of the recording")
+            count = min(int(end * params.framerate), params.nframes) - first
+            src.setpos(first)
+            frames = src.readframes(count)
+    except (wave.Error, EOFError):
+        return False
+    with wave.open(dst_path, "wb") as dst:
+        dst.setparams(params)
+        dst.writeframes(frames)
+    return True
+
+
+def _clip_ffmpeg(src_path: str, dst_path: str, start: float, end: float) -> str:
+    """Cut with ffmpeg, seeking on the input (-ss before -i) so only the clip is read.
+    Stream copy is tried first; formats that cannot be cut that way are re-encoded to WAV.
+    Returns the path written (the extension may change to .wav).
+    """
+    if shutil.which("ffmpeg") is None:
+        raise ValueError("Clipping this audio format requires ffmpeg")
+    base = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-ss", f"{start:.3f}", "-i", src_path,
+            "-t", f"{end - start:.3f}", "-vn"]
+    attempts = [(base + ["-c:a", "copy", dst_path], dst_path)]
+    wav_path = os.path.splitext(dst_path)[0] + ".wav"
+    attempts.append((base + ["-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", wav_path], wav_path))
+    for cmd, out_path in attempts:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode == 0 and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+            return out_path
+        if os.path.exists(out_path):
+            os.remove(out_path)
+    raise ValueError("Could not cut a clip from this recording (is start beyond its end?)")
+
+
+def _evict_clips(keep: str) -> None:
+    """Remove least recently served clips (never `keep`) until the cache fits AUDIO_CLIP_CACHE_MAX_BYTES."""
+    entries = []
+    total = 0
+    for name in os.listdir(AUDIO_CLIP_CACHE_DIR):
+        if name.startswith("."):
+            continue  # Clips still being cut
+        path = os.path.join(AUDIO_CLIP_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    for _, size, path in sorted(entries):
+        if total <= AUDIO_CLIP_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+def _cached_clip(key: str, ext: str) -> Optional[str]:
+    for candidate in (f"{key}{ext}", f"{key}.wav"):
+        cached = os.path.join(AUDIO_CLIP_CACHE_DIR, candidate)
+        try:
+            os.utime(cached)  # Mark as recently used
+        except FileNotFoundError:
+            continue
+        return cached
+    return None
+
+
+def get_clip(audio_path: str, start: float, end: float) -> str:
+    """Path of a cached clip of audio_path covering [start, end) seconds, cutting it on a miss."""
+    stat = os.stat(audio_path)
+    key = hashlib.sha256(
+        f"{os.path.abspath(audio_path)}|{stat.st_size}|{stat.st_mtime_ns}|{start:.3f}|{end:.3f}".encode("utf-8")
+    ).hexdigest()
+    os.makedirs(AUDIO_CLIP_CACHE_DIR, exist_ok=True)
+    ext = os.path.splitext(audio_path)[1].lower() or ".wav"
+    cached = _cached_clip(key, ext)
+    if cached:
+        return cached
+
+    # A unique temp file per request: concurrent misses for the same clip each cut their own copy
+    # and the identical results replace one another atomically
+    fd, tmp_path = tempfile.mkstemp(dir=AUDIO_CLIP_CACHE_DIR, prefix=f".{key}.", suffix=f".tmp{ext}")
+    os.close(fd)
+    written = None
+    try:
+        if ext == ".wav" and _clip_wav(audio_path, tmp_path, start, end):
+            written = tmp_path
+        else:
+            written = _clip_ffmpeg(audio_path, tmp_path, start, end)
+        clip_path = os.path.join(AUDIO_CLIP_CACHE_DIR, key + os.path.splitext(written)[1])
+        os.replace(written, clip_path)
+    except FileNotFoundError:
+        # Lost a race with eviction or another request; serve whatever copy made it into the cache
+        cached = _cached_clip(key, ext)
+        if not cached:
+            raise
+        return cached
+    finally:
+        for path in {tmp_path, written}:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    with _cache_lock:
+        _evict_clips(keep=clip_path)
+    logger.info(f"Cut clip {start:.1f}-{end:.1f}s of {audio_path} ({os.path.getsize(clip_path)} bytes)")
+    return clip_path
+
+
+def local_audio_path(audio_url: Optional[str]) -> Optional[str]:
+    """Map a stored audio URL (e.g. "/uploads/<sha256>.wav") to an existing local file.
+    The URL comes from the client, so anything resolving outside UPLOAD_DIR is rejected (None).
+    """
+    if not audio_url:
+        return None
+    from services.storage_lifecycle_service import resolve_stored_path
+    from services.upload_service import UPLOAD_DIR, resolve_upload_path
+    path = audio_url.lstrip("/")
+    resolved = resolve_stored_path(path) or resolve_upload_path(path)
+    if resolved is None:
+        return None
+    upload_root = os.path.realpath(UPLOAD_DIR)
+    if os.path.commonpath([os.path.realpath(resolved), upload_root]) != upload_root:
+        logger.warning(f"Rejected audio URL outside {UPLOAD_DIR}/: {audio_url}")
+        return None
+    return resolved
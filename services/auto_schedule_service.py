@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+from constants.auto_schedule_constants import (
+    AUTO_SCHEDULE_ACTIVE_STATUSES,
+    AUTO_SCHEDULE_ANALYZING,
+    AUTO_SCHEDULE_SCHEDULING,
+    AUTO_SCHEDULE_COMPLETED,
+    AUTO_SCHEDULE_NO_ACTION,
+    AUTO_SCHEDULE_FAILED
+)
+from constants.transcription_constants import TRANSCRIPTION_ACTIVE_STATUSES
+from repository.transcriprion_repo import (
+    get_particular_meeting,
+    update_meeting,
+    update_auto_schedule_state,
+    get_auto_schedule_states,
+    get_meetings_pending_auto_schedule
+)
+from services.background_job_service import LeasedJobQueue
+
+logger = logging.getLogger(__name__)
+
+# Meetings analysed/scheduled at the same time; the rest wait as "pending"
+AUTO_SCHEDULE_CONCURRENCY = int(os.getenv("AUTO_SCHEDULE_CONCURRENCY", "4"))
+# A workflow whose lease is not renewed for this long (its process died) is resumed by another worker
+AUTO_SCHEDULE_LEASE_SECONDS = int(os.getenv("AUTO_SCHEDULE_LEASE_SECONDS", "300"))
+
+_semaphore = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(AUTO_SCHEDULE_CONCURRENCY)
+    return _semaphore
+
+
+def _stable_hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def idempotency_key(meeting_id: str, analysis_hash: str) -> str:
+    """Same meeting and same scheduling decision -> same key, however often the workflow runs.
+    The key (lowercase hex) is also a valid Google Calendar event id, so a retried insert
+    finds the event created by an earlier attempt instead of creating a duplicate.
+    """
+    return hashlib.sha256(f"{meeting_id}:{analysis_hash}".encode("utf-8")).hexdigest()
+
+
+async def _run_steps(meeting_id: str) -> None:
+    from fastapi.concurrency import run_in_threadpool
+    from services.ai_actions_service import analyze_for_meeting_action
+    from services.calendar_service import create_calendar_event
+
+    meeting = await get_particular_meeting(meeting_id=meeting_id)
+    if not meeting:
+        raise LookupError("Meeting not found")
+    if meeting.get("transcription_status") in TRANSCRIPTION_ACTIVE_STATUSES:
+        raise RuntimeError("Meeting transcription is still in progress")
+    checkpoint = (await get_auto_schedule_states([meeting_id])).get(meeting_id, {}).get("auto_schedule", {})
+
+    # Step 1: analysis. A checkpointed analysis is reused while the notes are unchanged.
+    notes = meeting.get("notes", "") or ""
+    notes_hash = _stable_hash(notes)
+    analysis = checkpoint.get("analysis")
+    analysis_hash = checkpoint.get("analysis_hash")
+    if analysis is None or checkpoint.get("notes_hash") != notes_hash:
+        await update_auto_schedule_state(meeting_id, {"status": AUTO_SCHEDULE_ANALYZING})
+        analysis = await run_in_threadpool(analyze_for_meeting_action, notes=notes)
+        analysis_hash = _stable_hash(analysis)
+        await update_auto_schedule_state(meeting_id, {
+            "analysis": analysis,
+            "analysis_hash": analysis_hash,
+            "notes_hash": notes_hash
+        })
+    if not analysis.get("should_schedule"):
+        await update_auto_schedule_state(meeting_id, {"status": AUTO_SCHEDULE_NO_ACTION})
+        return
+
+    # Step 2: calendar event, created under the idempotency key as its id
+    key = idempotency_key(meeting_id, analysis_hash)
+    event = checkpoint.get("event") if checkpoint.get("idempotency_key") == key else None
+    if event is None:
+        await update_auto_schedule_state(meeting_id, {"status": AUTO_SCHEDULE_SCHEDULING, "idempotency_key": key})
+        attendees = meeting.get("attendees", []) or []
+        owner = meeting.get("owner")
+        if owner:
+            attendees = list({owner, *attendees})
+        event = await run_in_threadpool(
+            create_calendar_event,
+            title=analysis.get("title") or meeting.get("title") or "Follow-up Meeting",
+            description=analysis.get("description") or "",
+            start_time_iso=analysis.get("start_time_iso"),
+            duration_minutes=analysis.get("duration_minutes", 30),
+            attendees=attendees,
+            event_id=key
+        )
+        await update_auto_schedule_state(meeting_id, {"event": event})
+
+    # Step 3: persist event info on the meeting
+    await update_meeting(meeting_id=meeting_id, update_meeting_data={"calendar_event": event})
+    await update_auto_schedule_state(meeting_id, {"status": AUTO_SCHEDULE_COMPLETED, "error": None})
+    logger.info(f"Auto-schedule completed for meeting {meeting_id}: event {event.get('event_id')}")
+
+
+async def _run_auto_schedule(meeting_id: str) -> None:
+    # Stays "pending" until a slot is free
+    async with _get_semaphore():
+        try:
+            await _run_steps(meeting_id)
+        except Exception as e:
+            logger.exception(f"Auto-schedule failed for meeting {meeting_id}")
+            await update_auto_schedule_state(meeting_id, {"status": AUTO_SCHEDULE_FAILED, "error": str(e)})
+
+
+async def _find_pending_auto_schedules() -> dict:
+    return {str(meeting["_id"]): None for meeting in await get_meetings_pending_auto_schedule()}
+
+
+_auto_schedules = LeasedJobQueue(
+    name="auto-schedule",
+    status_field="auto_schedule.status",
+    active_statuses=AUTO_SCHEDULE_ACTIVE_STATUSES,
+    lease_field="auto_schedule.lease",
+    lease_seconds=AUTO_SCHEDULE_LEASE_SECONDS,
+    find_pending=_find_pending_auto_schedules,
+    run=lambda meeting_id, _: _run_auto_schedule(meeting_id)
+)
+
+
+def submit_auto_schedule(meeting_id: str) -> None:
+    """Run the auto-schedule workflow for a meeting in the background.
+    The meeting must already be claimed (see claim_auto_schedule). Must be called from the event loop.
+    """
+    submit_auto_schedules([meeting_id])
+
+
+def submit_auto_schedules(meeting_ids: list) -> None:
+    _auto_schedules.submit(dict.fromkeys(meeting_ids))
+
+
+async def resume_pending_auto_schedules() -> int:
+    """Re-run workflows interrupted by a restart or abandoned by a stopped worker; completed steps
+    are skipped via their checkpoints. Every worker may call it: each workflow is claimed by exactly
+    one of them. Returns the number of meetings this process claimed.
+    """
+    return await _auto_schedules.resume()
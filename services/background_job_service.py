@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable
+
+from repository.transcriprion_repo import claim_job_leases, renew_job_leases, release_job_lease
+
+logger = logging.getLogger(__name__)
+
+# Every uvicorn worker shares the database; this process's claims are recorded under its id
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Keep references to running jobs so they are not garbage collected mid-flight
+_running_jobs = set()
+
+
+def submit_background_job(coroutine: Awaitable) -> asyncio.Task:
+    """Run a coroutine as a background task. Must be called from the event loop."""
+    task = asyncio.get_running_loop().create_task(coroutine)
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    return task
+
+
+class LeasedJobQueue:
+    """Background jobs of one kind (transcription, auto-schedule), stored as a status on the meeting.
+
+    A job runs only after its meeting is claimed with a lease under WORKER_ID, so of all the
+    processes submitting or resuming it exactly one runs it. Leases are renewed while the job is
+    queued or running here and released when it ends; jobs whose lease expired because their
+    process died are picked up again by resume(), which also runs periodically once called.
+    """
+
+    def __init__(self, name: str, status_field: str, active_statuses: list, lease_field: str,
+                 lease_seconds: int, find_pending: Callable[[], Awaitable[dict]],
+                 run: Callable[[str, object], Awaitable[None]]):
+        self.name = name
+        self.status_field = status_field
+        self.active_statuses = active_statuses
+        self.lease_field = lease_field
+        self.lease_seconds = lease_seconds
+        # find_pending() -> {meeting_id: payload} of unleased jobs; run(meeting_id, payload) does one job
+        self.find_pending = find_pending
+        self.run = run
+        # Meetings this process has claimed and keeps the lease of until the job ends
+        self._held = set()
+        self._lease_task = None
+
+    async def _claim(self, meeting_ids: list) -> list:
+        meeting_ids = [meeting_id for meeting_id in dict.fromkeys(meeting_ids) if meeting_id not in self._held]
+        self._held.update(meeting_ids)
+        try:
+            claimed = await claim_job_leases(
+                meeting_ids, self.status_field, self.active_statuses,
+                self.lease_field, WORKER_ID, self.lease_seconds
+            )
+        except BaseException:
+            self._held.difference_update(meeting_ids)
+            raise
+        self._held.difference_update(set(meeting_ids) - set(claimed))
+        return claimed
+
+    async def _run_one(self, meeting_id: str, payload) -> None:
+        try:
+            await self.run(meeting_id, payload)
+            await release_job_lease(meeting_id, self.lease_field, WORKER_ID)
+        finally:
+            self._held.discard(meeting_id)
+
+    async def _run_batch(self, jobs: dict, claimed: bool = False) -> None:
+        meeting_ids = list(jobs) if claimed else await self._claim(list(jobs))
+        if len(meeting_ids) < len(jobs):
+            logger.info(f"{len(jobs) - len(meeting_ids)} {self.name} jobs are already held by another worker")
+        results = await asyncio.gather(
+            *(self._run_one(meeting_id, jobs[meeting_id]) for meeting_id in meeting_ids),
+            return_exceptions=True
+        )
+        for meeting_id, result in zip(meeting_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Could not record the {self.name} of meeting {meeting_id}: {result}")
+
+    def submit(self, jobs: dict) -> None:
+        """Queue {meeting_id: payload} jobs as one background task: the whole batch is claimed in
+        a single database write. Must be called from the event loop.
+        """
+        if jobs:
+            submit_background_job(self._run_batch(dict(jobs)))
+
+    async def _keep_leases(self) -> None:
+        # Renew the jobs held here and adopt the ones whose worker stopped renewing theirs
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await renew_job_leases(list(self._held), self.lease_field, WORKER_ID, self.lease_seconds)
+                resumed = await self.resume()
+                if resumed:
+                    logger.info(f"Resumed {resumed} {self.name} jobs abandoned by another worker")
+            except Exception:
+                logger.exception(f"Could not renew {self.name} leases")
+
+    async def resume(self) -> int:
+        """Claim and re-queue jobs interrupted by a restart, and from then on keep renewing the
+        jobs this process holds. Returns the number of jobs this process claimed.
+        """
+        if self._lease_task is None:
+            self._lease_task = asyncio.get_running_loop().create_task(self._keep_leases())
+        jobs = await self.find_pending()
+        claimed = await self._claim(list(jobs))
+        if claimed:
+            submit_background_job(self._run_batch({meeting_id: jobs[meeting_id] for meeting_id in claimed}, claimed=True))
+        return len(claimed)
@@ -0,0 +1,116 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+CALENDAR_MIRROR_PATH = os.getenv("CALENDAR_MIRROR_PATH", os.path.join(".cache", "calendar_mirror.sqlite3"))
+
+
+def _now_rfc3339() -> str:
+    # Same form as the API's "updated" field, so the two compare correctly as strings
+    return datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
+
+
+class CalendarMirror:
+    """Local SQLite copy of Google Calendar events, kept current with incremental sync.
+
+    Events are stored as returned by the API (including cancelled ones, which is how the API
+    reports deletions). A stored event is only replaced by a version with the same or a later
+    "updated" time, so a sync page fetched before a local write cannot roll that write back.
+    """
+
+    def __init__(self, path: str = CALENDAR_MIRROR_PATH):
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS calendar_events ("
+            " calendar_id TEXT NOT NULL,"
+            " event_id TEXT NOT NULL,"
+            " etag TEXT,"
+            " status TEXT,"
+            " updated TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (calendar_id, event_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS calendar_sync_state ("
+            " calendar_id TEXT PRIMARY KEY,"
+            " sync_token TEXT,"
+            " synced_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, calendar_id: str, event_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM calendar_events WHERE calendar_id = ? AND event_id = ?", (calendar_id, event_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, calendar_id: str, events: Iterable[dict]) -> int:
+        """Insert or update events; returns how many were written."""
+        rows = []
+        for event in events:
+            if not event or not event.get("id"):
+                continue
+            # Deletions in an incremental sync may come without an update time; they always apply
+            updated = event.get("updated") or _now_rfc3339()
+            rows.append((calendar_id, event["id"], event.get("etag"), event.get("status"), updated,
+                         json.dumps(event)))
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO calendar_events (calendar_id, event_id, etag, status, updated, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (calendar_id, event_id) DO UPDATE SET"
+                " etag = excluded.etag, status = excluded.status, updated = excluded.updated, data = excluded.data"
+                " WHERE excluded.updated >= calendar_events.updated",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def mark_cancelled(self, calendar_id: str, event_id: str) -> None:
+        existing = self.get(calendar_id, event_id) or {"id": event_id}
+        self.store(calendar_id, [{**existing, "status": "cancelled", "updated": _now_rfc3339()}])
+
+    def clear(self, calendar_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.execute("DELETE FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,))
+            self._conn.commit()
+
+    def get_sync_state(self, calendar_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sync_token, synced_at FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,)
+            ).fetchone()
+        return {"sync_token": row[0], "synced_at": row[1]} if row else None
+
+    def set_sync_token(self, calendar_id: str, sync_token: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calendar_sync_state (calendar_id, sync_token, synced_at) VALUES (?, ?, ?)",
+                (calendar_id, sync_token, time.time())
+            )
+            self._conn.commit()
+
+
+_calendar_mirror = None
+_calendar_mirror_lock = threading.Lock()
+
+
+def get_calendar_mirror() -> CalendarMirror:
+    global _calendar_mirror
+    with _calendar_mirror_lock:
+        if _calendar_mirror is None:
+            _calendar_mirror = CalendarMirror()
+    return _calendar_mirror
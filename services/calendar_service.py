@@ -1,59 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import json
+import logging
 import os
+import threading
+import time
 from typing import List
 import pickle
+import uuid
 
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from services.calendar_mirror_service import get_calendar_mirror
 
+logger = logging.getLogger(__name__)
 
 SCOPES = [
     "https://www.googleapis.com/auth/calendar"
 ]
+TOKEN_FILE = "token.pickle"
+# Point the client at another Calendar API host (e.g. scripts/fake_calendar_server.py)
+GOOGLE_CALENDAR_ROOT_URL = os.getenv("GOOGLE_CALENDAR_ROOT_URL")
+# Skip OAuth entirely; only meaningful together with GOOGLE_CALENDAR_ROOT_URL
+GOOGLE_CALENDAR_ANONYMOUS = os.getenv("GOOGLE_CALENDAR_ANONYMOUS", "false").lower() in ("1", "true", "yes")
+GOOGLE_CALENDAR_HTTP_TIMEOUT_SECONDS = float(os.getenv("GOOGLE_CALENDAR_HTTP_TIMEOUT_SECONDS", "30"))
+# Google recommends at most 50 calls per Calendar batch request
+GOOGLE_CALENDAR_BATCH_SIZE = int(os.getenv("GOOGLE_CALENDAR_BATCH_SIZE", "50"))
+GOOGLE_CALENDAR_BATCH_CONCURRENCY = int(os.getenv("GOOGLE_CALENDAR_BATCH_CONCURRENCY", "4"))
+GOOGLE_CALENDAR_BATCH_MAX_OPERATIONS = int(os.getenv("GOOGLE_CALENDAR_BATCH_MAX_OPERATIONS", "1000"))
+GOOGLE_CALENDAR_BATCH_RETRIES = int(os.getenv("GOOGLE_CALENDAR_BATCH_RETRIES", "2"))
+CALENDAR_MIRROR_ENABLED = os.getenv("CALENDAR_MIRROR_ENABLED", "true").lower() in ("1", "true", "yes")
+CALENDAR_MIRROR_SYNC_INTERVAL_SECONDS = float(os.getenv("CALENDAR_MIRROR_SYNC_INTERVAL_SECONDS", "60"))
+# Reads trigger an inline incremental sync when the last one is older than this
+CALENDAR_MIRROR_MAX_STALENESS_SECONDS = float(os.getenv("CALENDAR_MIRROR_MAX_STALENESS_SECONDS", "300"))
+# Per-item statuses inside a batch that are worth sending again
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+# Credentials are shared by every thread and only loaded/refreshed under the lock. Service
+# objects are not: httplib2 connections are not thread-safe, so each thread keeps its own
+# service (and keep-alive connection) and rebuilds it only when the credentials are replaced.
+_credentials = None
+_credentials_generation = 0
+_credentials_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def _load_credentials():
+    if GOOGLE_CALENDAR_ANONYMOUS:
+        from google.auth.credentials import AnonymousCredentials
+        return AnonymousCredentials()
+
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
 
-def _get_calendar_service():
     credentials_path = os.getenv("GOOGLE_OAUTH_CREDENTIALS_FILE", "client_secret_1019005830189-pmjdbmhte1ueqp7j07rqhq2qfn2jkpr5.apps.googleusercontent.com.json")
-    calendar_id = os.getenv("GOOGLE_CALENDAR_ID", "primary")  # Default to primary calendar
-    token_file = "token.pickle"
-    
-    creds = None
+
+    creds = _credentials
     # Load existing token if it exists
-    if os.path.exists(token_file):
-        with open(token_file, 'rb') as token:
+    if creds is None and os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, 'rb') as token:
             creds = pickle.load(token)
-    
+    if creds and creds.valid:
+        return creds
+
     # If there are no (valid) credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists(credentials_path):
-                raise RuntimeError(f"OAuth credentials file not found: {credentials_path}")
-            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
-            # Use port 8001 to match the redirect URI you configured
-            creds = flow.run_local_server(port=8001, host='localhost')
-        
-        # Save the credentials for the next run
-        with open(token_file, 'wb') as token:
-            pickle.dump(creds, token)
-    
-    service = build("calendar", "v3", credentials=creds)
+    if creds and creds.expired and creds.refresh_token:
+        creds.refresh(Request())
+    else:
+        if not os.path.exists(credentials_path):
+            raise RuntimeError(f"OAuth credentials file not found: {credentials_path}")
+        flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
+        # Use port 8001 to match the redirect URI you configured
+        creds = flow.run_local_server(port=8001, host='localhost')
+
+    # Save the credentials for the next run
+    with open(TOKEN_FILE, 'wb') as token:
+        pickle.dump(creds, token)
+    return creds
+
+
+def _get_credentials():
+    """The process-wide credentials, loaded on first use and refreshed when they expire."""
+    global _credentials, _credentials_generation
+    creds = _credentials
+    if creds is not None and creds.valid:
+        return creds, _credentials_generation
+    with _credentials_lock:
+        # Another thread may have refreshed them while this one waited
+        if _credentials is None or not _credentials.valid:
+            refreshed = _load_credentials()
+            if refreshed is not _credentials:
+                _credentials = refreshed
+                _credentials_generation += 1
+        creds, generation = _credentials, _credentials_generation
+    # First run: token.pickle did not exist at startup, so the mirror sync starts now
+    start_event_mirror_sync()
+    return creds, generation
+
+
+def _build_service(creds):
+    # The Google client libraries are imported on first use to keep app startup light
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+
+    client_options = None
+    if GOOGLE_CALENDAR_ROOT_URL:
+        client_options = {"api_endpoint": GOOGLE_CALENDAR_ROOT_URL.rstrip("/") + "/calendar/v3/"}
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=GOOGLE_CALENDAR_HTTP_TIMEOUT_SECONDS))
+    # The discovery document bundled with the library avoids a network fetch per build
+    return build("calendar", "v3", http=http, static_discovery=True, cache_discovery=False,
+                 client_options=client_options)
+
+
+def _get_calendar_service():
+    calendar_id = os.getenv("GOOGLE_CALENDAR_ID", "primary")  # Default to primary calendar
+    creds, generation = _get_credentials()
+    service = getattr(_thread_state, "service", None)
+    if service is None or _thread_state.generation != generation:
+        service = _build_service(creds)
+        _thread_state.service = service
+        _thread_state.generation = generation
     return service, calendar_id
 
 
-def create_calendar_event(title: str, description: str, start_time_iso: str, duration_minutes: int, attendees: List[str], location: str = None, end_time_iso: str = None) -> dict:
-    """Create a new calendar event"""
+def reset_calendar_client() -> None:
+    """Drop the cached credentials and services; the next call loads token.pickle again."""
+    global _credentials, _credentials_generation
+    with _credentials_lock:
+        _credentials = None
+        _credentials_generation += 1
+
+
+def _new_event_body(title: str, description: str, start_time_iso: str, duration_minutes: int, attendees: List[str],
+                    location: str = None, end_time_iso: str = None) -> dict:
     if not start_time_iso:
         start_time_iso = datetime.utcnow().isoformat() + "Z"
-    
+
     # Use provided end_time_iso or calculate from duration
     if not end_time_iso:
         end_time_iso = (datetime.fromisoformat(start_time_iso.replace("Z", "")) + timedelta(minutes=duration_minutes)).isoformat() + "Z"
 
-    service, calendar_id = _get_calendar_service()
-
     event_body = {
         "summary": title,
         "description": description or "",
@@ -61,78 +146,141 @@ def create_calendar_event(title: str, description: str, start_time_iso: str, dur
         "end": {"dateTime": end_time_iso},
         "attendees": [{"email": e} for e in (attendees or [])],
         "conferenceData": {
-            "createRequest": {"requestId": f"req-{int(datetime.utcnow().timestamp())}"}
+            # Unique per event: events created in the same second (e.g. in one batch) must not share a Meet request
+            "createRequest": {"requestId": f"req-{uuid.uuid4().hex}"}
         },
         "guestsCanInviteOthers": True,
         "guestsCanModify": False,
         "sendUpdates": "all"
     }
-    
+
     if location:
         event_body["location"] = location
+    return event_body
+
+
+def _event_patch(title: str = None, description: str = None, start_time_iso: str = None, end_time_iso: str = None,
+                 duration_minutes: int = None, attendees: List[str] = None, location: str = None) -> dict:
+    """Only the fields being changed, for events().patch()."""
+    patch = {}
+    if title is not None:
+        patch["summary"] = title
+    if description is not None:
+        patch["description"] = description
+    if location is not None:
+        patch["location"] = location
+    if attendees is not None:
+        patch["attendees"] = [{"email": e} for e in attendees]
+    if start_time_iso is not None:
+        patch["start"] = {"dateTime": start_time_iso}
+        if end_time_iso is None and duration_minutes is not None:
+            end_time_iso = (datetime.fromisoformat(start_time_iso.replace("Z", "")) +
+                            timedelta(minutes=duration_minutes)).isoformat() + "Z"
+    if end_time_iso is not None:
+        patch["end"] = {"dateTime": end_time_iso}
+    return patch
+
+
+def create_calendar_event(title: str, description: str, start_time_iso: str, duration_minutes: int, attendees: List[str], location: str = None, end_time_iso: str = None, event_id: str = None) -> dict:
+    """Create a new calendar event.
+
+    With event_id (5-1024 characters of 0-9 and a-v) the create is idempotent: if an event with
+    that id already exists, it is returned instead of creating a second one.
+    """
+    from googleapiclient.errors import HttpError
+
+    event_body = _new_event_body(title, description, start_time_iso, duration_minutes, attendees, location, end_time_iso)
+    if event_id:
+        event_body["id"] = event_id
+
+    service, calendar_id = _get_calendar_service()
 
-    event = service.events().insert(calendarId=calendar_id, body=event_body, sendUpdates="all", conferenceDataVersion=1).execute()
+    try:
+        event = service.events().insert(calendarId=calendar_id, body=event_body, sendUpdates="all", conferenceDataVersion=1).execute()
+    except HttpError as e:
+        if not event_id or e.resp.status != 409:
+            raise
+        logger.info(f"Calendar event {event_id} already exists, reusing it")
+        event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+    _mirror_store(calendar_id, event)
 
     return _format_event_response(event)
 
 
 def get_calendar_event(event_id: str) -> dict:
-    """Get a calendar event by ID"""
+    """Get a calendar event by ID, from the local mirror when it has it"""
     service, calendar_id = _get_calendar_service()
-    
+
+    # The mirror is only authoritative once a sync has completed; until then events stored by
+    # earlier reads and writes would never pick up changes made in Google
+    if CALENDAR_MIRROR_ENABLED and _mirror_synced(calendar_id):
+        _refresh_mirror_if_stale(calendar_id)
+        mirrored = get_calendar_mirror().get(calendar_id, event_id)
+        if mirrored is not None:
+            if mirrored.get("status") == "cancelled":
+                raise RuntimeError(f"Failed to get event {event_id}: event not found (deleted)")
+            return _format_event_response(mirrored)
+
     try:
         event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+        _mirror_store(calendar_id, event)
         return _format_event_response(event)
     except Exception as e:
         raise RuntimeError(f"Failed to get event {event_id}: {str(e)}")
 
 
+class CalendarEventConflict(RuntimeError):
+    """The event changed since the etag the caller sent."""
+
+
+def _patch_event(service, calendar_id: str, event_id: str, patch: dict, etag: str = None) -> dict:
+    request = service.events().patch(calendarId=calendar_id, eventId=event_id, body=patch, sendUpdates="all")
+    if etag:
+        request.headers["If-Match"] = etag
+    return request.execute()
+
+
 def update_calendar_event(event_id: str, title: str = None, description: str = None, 
                          start_time_iso: str = None, end_time_iso: str = None, 
                          duration_minutes: int = None, attendees: List[str] = None, 
-                         location: str = None) -> dict:
-    """Update an existing calendar event"""
+                         location: str = None, etag: str = None) -> dict:
+    """Update an existing calendar event.
+
+    Only the given fields are sent (a patch), so no read is needed first. The patch is
+    conditional on the caller's etag, or else on the mirrored one: if the mirror was behind,
+    the event is re-read once and patched against its current version. A mismatch with the
+    caller's own etag raises CalendarEventConflict.
+    """
+    from googleapiclient.errors import HttpError
+
+    patch = _event_patch(title, description, start_time_iso, end_time_iso, duration_minutes, attendees, location)
+    if not patch:
+        return get_calendar_event(event_id)
     service, calendar_id = _get_calendar_service()
-    
+    expected_etag = etag
+    if expected_etag is None and CALENDAR_MIRROR_ENABLED:
+        mirrored = get_calendar_mirror().get(calendar_id, event_id)
+        expected_etag = mirrored.get("etag") if mirrored else None
+
     try:
-        # Get existing event first
-        existing_event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-        
-        # Update only provided fields
-        if title is not None:
-            existing_event["summary"] = title
-        if description is not None:
-            existing_event["description"] = description
-        if location is not None:
-            existing_event["location"] = location
-        if attendees is not None:
-            existing_event["attendees"] = [{"email": e} for e in attendees]
-        
-        # Handle time updates
-        if start_time_iso is not None:
-            existing_event["start"] = {"dateTime": start_time_iso}
-            
-            # If end_time_iso not provided but duration_minutes is, calculate end time
-            if end_time_iso is None and duration_minutes is not None:
-                end_time_iso = (datetime.fromisoformat(start_time_iso.replace("Z", "")) + 
-                              timedelta(minutes=duration_minutes)).isoformat() + "Z"
-            
-        if end_time_iso is not None:
-            existing_event["end"] = {"dateTime": end_time_iso}
-        
-        # Update the event
-        updated_event = service.events().update(
-            calendarId=calendar_id, 
-            eventId=event_id, 
-            body=existing_event,
-            sendUpdates="all"
-        ).execute()
-        
-        return _format_event_response(updated_event)
-        
+        try:
+            updated_event = _patch_event(service, calendar_id, event_id, patch, expected_etag)
+        except HttpError as e:
+            if e.resp.status != 412:
+                raise
+            if etag is not None:
+                raise CalendarEventConflict(f"Event {event_id} was changed since etag {etag}")
+            current = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+            _mirror_store(calendar_id, current)
+            updated_event = _patch_event(service, calendar_id, event_id, patch, current.get("etag"))
+    except CalendarEventConflict:
+        raise
     except Exception as e:
         raise RuntimeError(f"Failed to update event {event_id}: {str(e)}")
 
+    _mirror_store(calendar_id, updated_event)
+    return _format_event_response(updated_event)
+
 
 def delete_calendar_event(event_id: str) -> bool:
     """Delete a calendar event"""
@@ -140,9 +288,107 @@ def delete_calendar_event(event_id: str) -> bool:
     
     try:
         service.events().delete(calendarId=calendar_id, eventId=event_id, sendUpdates="all").execute()
-        return True
     except Exception as e:
         raise RuntimeError(f"Failed to delete event {event_id}: {str(e)}")
+    if CALENDAR_MIRROR_ENABLED:
+        get_calendar_mirror().mark_cancelled(calendar_id, event_id)
+    return True
+
+
+def _mirror_store(calendar_id: str, event: dict) -> None:
+    if CALENDAR_MIRROR_ENABLED and event:
+        get_calendar_mirror().store(calendar_id, [event])
+
+
+_sync_lock = threading.Lock()
+
+
+def sync_event_mirror(full: bool = False) -> dict:
+    """Bring the local mirror up to date with Google.
+
+    Uses the stored sync token, so only events changed since the previous sync are
+    transferred. Without a token (or with full=True) every event is listed; an expired
+    token (HTTP 410) clears the mirror and falls back to a full sync.
+    """
+    from googleapiclient.errors import HttpError
+
+    service, calendar_id = _get_calendar_service()
+    mirror = get_calendar_mirror()
+    with _sync_lock:
+        state = mirror.get_sync_state(calendar_id)
+        sync_token = None if full or not state else state["sync_token"]
+        page_token = None
+        changed = 0
+        while True:
+            params = {"calendarId": calendar_id, "showDeleted": True, "maxResults": 2500}
+            if sync_token:
+                params["syncToken"] = sync_token
+            if page_token:
+                params["pageToken"] = page_token
+            try:
+                response = service.events().list(**params).execute()
+            except HttpError as e:
+                if e.resp.status == 410 and sync_token:
+                    logger.info(f"Calendar sync token for {calendar_id} expired, running a full sync")
+                    mirror.clear(calendar_id)
+                    sync_token = page_token = None
+                    changed = 0
+                    continue
+                raise
+            changed += mirror.store(calendar_id, response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                mirror.set_sync_token(calendar_id, response.get("nextSyncToken"))
+                break
+    return {"calendar_id": calendar_id, "incremental": bool(sync_token), "changed": changed}
+
+
+def _mirror_synced(calendar_id: str) -> bool:
+    state = get_calendar_mirror().get_sync_state(calendar_id)
+    return bool(state and state["sync_token"])
+
+
+def _refresh_mirror_if_stale(calendar_id: str) -> None:
+    """Run an incremental sync inline when the background sync has fallen behind."""
+    state = get_calendar_mirror().get_sync_state(calendar_id)
+    if not state or not state["sync_token"] or time.time() - state["synced_at"] <= CALENDAR_MIRROR_MAX_STALENESS_SECONDS:
+        return
+    try:
+        sync_event_mirror()
+    except Exception as e:
+        logger.warning(f"Calendar mirror sync failed, serving the mirrored copy: {e}")
+
+
+_sync_thread = None
+_sync_thread_lock = threading.Lock()
+
+
+def _sync_loop() -> None:
+    while True:
+        try:
+            stats = sync_event_mirror()
+            if stats["changed"]:
+                logger.info(f"Calendar mirror sync: {stats}")
+        except Exception:
+            logger.exception("Calendar mirror sync failed")
+        time.sleep(CALENDAR_MIRROR_SYNC_INTERVAL_SECONDS)
+
+
+def start_event_mirror_sync() -> None:
+    """Keep the mirror fresh from a background thread.
+    Only starts once credentials exist, so startup never opens an interactive OAuth login;
+    otherwise it is started by the first successful credentials load.
+    """
+    global _sync_thread
+    if not CALENDAR_MIRROR_ENABLED or _sync_thread is not None:
+        return
+    if not GOOGLE_CALENDAR_ANONYMOUS and not os.path.exists(TOKEN_FILE):
+        logger.info(f"Calendar mirror sync not started: no {TOKEN_FILE} yet")
+        return
+    with _sync_thread_lock:
+        if _sync_thread is None:
+            _sync_thread = threading.Thread(target=_sync_loop, name="calendar-mirror-sync", daemon=True)
+            _sync_thread.start()
 
 
 def _format_event_response(event: dict) -> dict:
@@ -162,8 +408,148 @@ def _format_event_response(event: dict) -> dict:
         "html_link": event.get("htmlLink", ""),
         "hangout_link": event.get("hangoutLink", ""),
         "status": event.get("status", ""),
+        "etag": event.get("etag"),
         "created_at": event.get("created", ""),
         "updated_at": event.get("updated", "")
     }
 
 
+def _new_batch(service, callback):
+    if GOOGLE_CALENDAR_ROOT_URL:
+        # new_batch_http_request() always targets www.googleapis.com, whatever the endpoint override
+        from googleapiclient.http import BatchHttpRequest
+        return BatchHttpRequest(callback=callback, batch_uri=GOOGLE_CALENDAR_ROOT_URL.rstrip("/") + "/batch/calendar/v3")
+    return service.new_batch_http_request(callback=callback)
+
+
+def _batch_request(service, calendar_id: str, operation: dict):
+    kind = operation["operation"]
+    if kind == "create":
+        body = _new_event_body(**operation["event"])
+        body["id"] = operation["event_id"]
+        return service.events().insert(calendarId=calendar_id, body=body, sendUpdates="all", conferenceDataVersion=1)
+    if kind == "update":
+        return service.events().patch(calendarId=calendar_id, eventId=operation["event_id"],
+                                      body=_event_patch(**operation["changes"]), sendUpdates="all")
+    if kind == "delete":
+        return service.events().delete(calendarId=calendar_id, eventId=operation["event_id"], sendUpdates="all")
+    raise ValueError(f"Unknown operation: {kind}")
+
+
+def _http_error_message(exception) -> str:
+    content = getattr(exception, "content", None)
+    if content:
+        try:
+            return json.loads(content)["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            pass
+    return str(exception)
+
+
+def _execute_batch(items: List[tuple]) -> dict:
+    """Send [(index, operation), ...] as one batch request; returns {index: result}."""
+    service, calendar_id = _get_calendar_service()
+    results = {}
+
+    operations = dict(items)
+
+    def on_response(request_id, response, exception):
+        index = int(request_id)
+        if exception is None:
+            if response:
+                _mirror_store(calendar_id, response)
+            elif CALENDAR_MIRROR_ENABLED and operations[index]["operation"] == "delete":
+                get_calendar_mirror().mark_cancelled(calendar_id, operations[index]["event_id"])
+            results[index] = {"success": True, "event": _format_event_response(response) if response else None}
+        else:
+            results[index] = {
+                "success": False,
+                "status_code": getattr(getattr(exception, "resp", None), "status", None),
+                "error": _http_error_message(exception)
+            }
+
+    batch = _new_batch(service, on_response)
+    for index, operation in items:
+        try:
+            batch.add(_batch_request(service, calendar_id, operation), request_id=str(index))
+        except (ValueError, TypeError) as e:
+            results[index] = {"success": False, "status_code": 400, "error": str(e)}
+    try:
+        batch.execute()
+    except Exception as e:
+        # The batch request as a whole failed. Its items may still have been applied (e.g. after a
+        # timeout), which is why creates carry their own ids: a resent create gets 409, not a duplicate
+        status = getattr(getattr(e, "resp", None), "status", None)
+        for index, _ in items:
+            results.setdefault(index, {"success": False, "status_code": status or 503, "error": f"Batch request failed: {e}"})
+    return results
+
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    # Long-lived workers keep their thread-local services (and connections) between requests
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(max_workers=GOOGLE_CALENDAR_BATCH_CONCURRENCY,
+                                                 thread_name_prefix="calendar-batch")
+    return _batch_executor
+
+
+def _resolve_existing_creates(operations: List[dict], results: dict) -> None:
+    """Replace 409 results of creates with the event that already has their id."""
+    existing = [index for index, result in results.items()
+                if result.get("status_code") == 409 and operations[index]["operation"] == "create"]
+    if not existing:
+        return
+    service, calendar_id = _get_calendar_service()
+    for index in existing:
+        try:
+            event = service.events().get(calendarId=calendar_id, eventId=operations[index]["event_id"]).execute()
+        except Exception as e:
+            logger.warning(f"Could not fetch existing calendar event {operations[index]['event_id']}: {e}")
+            continue
+        _mirror_store(calendar_id, event)
+        results[index] = {"success": True, "event": _format_event_response(event)}
+
+
+def execute_calendar_batch(operations: List[dict]) -> List[dict]:
+    """Run many create/update/delete operations as Google batch requests.
+
+    Each operation is {"operation": "create" | "update" | "delete", "event_id": ..., "event": kwargs
+    for create_calendar_event, "changes": kwargs for update_calendar_event}. Operations are sent
+    GOOGLE_CALENDAR_BATCH_SIZE per request, GOOGLE_CALENDAR_BATCH_CONCURRENCY requests at a time.
+    Items rejected with a retryable status are sent again with backoff. Updates use patch
+    semantics, so no read precedes them.
+
+    Every create is sent with an event id (the operation's "event_id", or a generated one), so
+    creating is idempotent: when the id already exists (a retry of a create that was applied
+    although its batch failed), the existing event is returned as the result.
+
+    Returns one {"success", "event", "status_code", "error"} dict per operation, in order.
+    """
+    results = {}
+    operations = [
+        {**operation, "event_id": operation.get("event_id") or uuid.uuid4().hex}
+        if operation.get("operation") == "create" else operation
+        for operation in operations
+    ]
+    pending = list(enumerate(operations))
+    executor = _get_batch_executor()
+    for attempt in range(GOOGLE_CALENDAR_BATCH_RETRIES + 1):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1), 10))
+        chunks = [pending[i:i + GOOGLE_CALENDAR_BATCH_SIZE] for i in range(0, len(pending), GOOGLE_CALENDAR_BATCH_SIZE)]
+        for chunk_results in executor.map(_execute_batch, chunks):
+            results.update(chunk_results)
+        pending = [(index, operation) for index, operation in pending
+                   if results[index].get("status_code") in RETRYABLE_STATUS_CODES]
+        if not pending:
+            break
+    _resolve_existing_creates(operations, results)
+    failed = sum(1 for result in results.values() if not result["success"])
+    logger.info(f"Calendar batch: {len(operations) - failed} of {len(operations)} operations succeeded")
+    return [results[index] for index in range(len(operations))]
@@ -0,0 +1,100 @@
+import abc
+import base64
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from typing import List, Union
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")  # "gemini" or "standin"
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-1.5-flash")
+LLM_STANDIN_URL = os.getenv("LLM_STANDIN_URL", "http://127.0.0.1:8090")
+LLM_STANDIN_TIMEOUT_SECONDS = float(os.getenv("LLM_STANDIN_TIMEOUT_SECONDS", "120"))
+
+# A prompt part is either plain text or an inline blob: {"mime_type": ..., "data": bytes}
+PromptPart = Union[str, dict]
+
+
+class LLMClient(abc.ABC):
+    """Minimal interface shared by the transcription and meeting-action services."""
+
+    model_name: str = ""
+
+    @abc.abstractmethod
+    def generate(self, parts: List[PromptPart]) -> str:
+        ...
+
+
+class GeminiLLMClient(LLMClient):
+    def __init__(self, model_name: str = GEMINI_MODEL_NAME):
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, parts: List[PromptPart]) -> str:
+        contents = parts[0] if len(parts) == 1 and isinstance(parts[0], str) else parts
+        response = self.model.generate_content(contents)
+        return response.text if hasattr(response, "text") else str(response)
+
+
+class StandInLLMClient(LLMClient):
+    """Talks to the local stand-in server (scripts/llm_standin_server.py) over HTTP."""
+
+    def __init__(self, base_url: str = LLM_STANDIN_URL, model_name: str = "standin",
+                 timeout: float = LLM_STANDIN_TIMEOUT_SECONDS):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+
+    def generate(self, parts: List[PromptPart]) -> str:
+        payload = {"model": self.model_name, "parts": []}
+        for part in parts:
+            if isinstance(part, str):
+                payload["parts"].append({"text": part})
+            else:
+                payload["parts"].append({
+                    "mime_type": part.get("mime_type"),
+                    "data": base64.b64encode(part.get("data") or b"").decode("ascii")
+                })
+
+        request = urllib.request.Request(
+            f"{self.base_url}/generate",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Stand-in LLM request failed with HTTP {e.code}: {e.read().decode('utf-8', 'replace')}")
+        return body.get("text", "")
+
+
+# Global instance to avoid re-creating the client for each request
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Get or create the global LLM client selected by LLM_BACKEND."""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            if LLM_BACKEND == "standin":
+                _llm_client = StandInLLMClient()
+            elif LLM_BACKEND == "gemini":
+                _llm_client = GeminiLLMClient()
+            else:
+                raise RuntimeError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
+    return _llm_client
+
+
+def set_llm_client(client: LLMClient) -> None:
+    """Replace the global LLM client (e.g. with a stand-in for load tests)."""
+    global _llm_client
+    with _llm_client_lock:
+        _llm_client = client
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from bson import json_util
+
+logger = logging.getLogger(__name__)
+
+MEETING_CACHE_ENABLED = os.getenv("MEETING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+MEETING_CACHE_TTL_SECONDS = float(os.getenv("MEETING_CACHE_TTL_SECONDS", "300"))
+MEETING_CACHE_MAX_ENTRIES = int(os.getenv("MEETING_CACHE_MAX_ENTRIES", "1000"))
+# When set, entries live in redis so every worker process shares them (and their invalidations)
+MEETING_CACHE_REDIS_URL = os.getenv("MEETING_CACHE_REDIS_URL")
+MEETING_CACHE_REDIS_PREFIX = os.getenv("MEETING_CACHE_REDIS_PREFIX", "meeting:")
+# Generation counters outlive entries so a read that started before an invalidation is recognised
+_GENERATION_TTL_SECONDS = 24 * 3600
+
+
+def compute_etag(payload: str) -> str:
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class MeetingCache:
+    """LRU cache of projected meeting documents with a TTL.
+    Entries are stored as (serialized document, etag) so the etag of a cached meeting can be
+    checked without rebuilding the document.
+
+    Every invalidation bumps a per-meeting generation. Readers take generation() before loading
+    the meeting and pass it to set(), which drops the document if a write invalidated the
+    meeting in between, so a stale read can never be cached after the write.
+    """
+
+    def __init__(self, ttl_seconds: float = MEETING_CACHE_TTL_SECONDS,
+                 max_entries: int = MEETING_CACHE_MAX_ENTRIES, redis_url: str = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(redis_url)
+            except ImportError:
+                logger.warning("MEETING_CACHE_REDIS_URL is set but redis is not installed; using the in-process cache")
+
+    async def get(self, meeting_id: str) -> Optional[Tuple[dict, str]]:
+        """Return (meeting, etag) or None when the meeting is not cached."""
+        if self._redis is not None:
+            try:
+                payload = await self._redis.get(MEETING_CACHE_REDIS_PREFIX + meeting_id)
+            except Exception:
+                logger.exception("Meeting cache read failed")
+                return None
+            if payload is None:
+                return None
+            payload = payload.decode("utf-8")
+            return json_util.loads(payload), compute_etag(payload)
+
+        with self._lock:
+            entry = self._entries.get(meeting_id)
+            if entry is None:
+                return None
+            payload, etag, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[meeting_id]
+                return None
+            self._entries.move_to_end(meeting_id)
+        return json_util.loads(payload), etag
+
+    async def generation(self, meeting_id: str) -> int:
+        """Current invalidation generation of a meeting; take it before loading the document."""
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(MEETING_CACHE_REDIS_PREFIX + "gen:" + meeting_id)
+            except Exception:
+                logger.exception("Meeting cache read failed")
+                return -1  # Never matches, so nothing is cached
+            return int(value or 0)
+        with self._lock:
+            return self._generations.get(meeting_id, 0)
+
+    async def set(self, meeting_id: str, meeting: dict, generation: int = None) -> str:
+        """Cache a meeting document and return its etag.
+        With a generation (see generation()), the document is only cached while it is still current.
+        """
+        payload = json_util.dumps(meeting, sort_keys=True)
+        etag = compute_etag(payload)
+        if self._redis is not None:
+            await self._redis_set(meeting_id, payload, generation)
+            return etag
+
+        with self._lock:
+            if generation is not None and self._generations.get(meeting_id, 0) != generation:
+                return etag
+            self._entries[meeting_id] = (payload, etag, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(meeting_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    async def _redis_set(self, meeting_id: str, payload: str, generation: Optional[int]) -> None:
+        from redis.exceptions import WatchError
+        key = MEETING_CACHE_REDIS_PREFIX + meeting_id
+        generation_key = MEETING_CACHE_REDIS_PREFIX + "gen:" + meeting_id
+        try:
+            if generation is None:
+                await self._redis.set(key, payload, px=int(self.ttl_seconds * 1000))
+                return
+            # WATCH makes the write fail if another process invalidates the meeting meanwhile
+            async with self._redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(generation_key)
+                if int(await pipe.get(generation_key) or 0) != generation:
+                    return
+                pipe.multi()
+                pipe.set(key, payload, px=int(self.ttl_seconds * 1000))
+                await pipe.execute()
+        except WatchError:
+            pass
+        except Exception:
+            logger.exception("Meeting cache write failed")
+
+    async def invalidate(self, meeting_id: str) -> None:
+        if self._redis is not None:
+            generation_key = MEETING_CACHE_REDIS_PREFIX + "gen:" + meeting_id
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.incr(generation_key)
+                    pipe.expire(generation_key, _GENERATION_TTL_SECONDS)
+                    pipe.delete(MEETING_CACHE_REDIS_PREFIX + meeting_id)
+                    await pipe.execute()
+            except Exception:
+                logger.exception("Meeting cache invalidation failed")
+            return
+        with self._lock:
+            self._entries.pop(meeting_id, None)
+            self._generations[meeting_id] = self._generations.get(meeting_id, 0) + 1
+            self._generations.move_to_end(meeting_id)
+            # Counters of meetings not invalidated for a long while are dropped; a reader still
+            # holding a dropped (non-zero) generation then sees 0 and just skips caching
+            while len(self._generations) > self.max_entries * 10:
+                self._generations.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "backend": "redis" if self._redis is not None else "memory"}
+
+
+_meeting_cache = None
+_meeting_cache_lock = threading.Lock()
+
+
+def get_meeting_cache() -> Optional[MeetingCache]:
+    """Shared meeting cache, or None when MEETING_CACHE_ENABLED is off."""
+    global _meeting_cache
+    if not MEETING_CACHE_ENABLED:
+        return None
+    with _meeting_cache_lock:
+        if _meeting_cache is None:
+            _meeting_cache = MeetingCache(redis_url=MEETING_CACHE_REDIS_URL)
+    return _meeting_cache
+
+
+async def invalidate_meeting(meeting_id: str) -> None:
+    """Drop a meeting from the cache after any write to it."""
+    cache = get_meeting_cache()
+    if cache is not None:
+        await cache.invalidate(str(meeting_id))
@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import math
+import os
+import queue
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+from utils.transcript_utils import split_transcript_segments, pack_segments
+
+logger = logging.getLogger(__name__)
+
+CHROMA_PATH = os.getenv("CHROMA_PATH", "chroma_db")
+CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "meeting_segments")
+# "default" (chromadb's local MiniLM ONNX model), "hash" (deterministic stand-in) or "module:callable"
+SEMANTIC_EMBEDDING = os.getenv("SEMANTIC_EMBEDDING", "default")
+SEMANTIC_CHUNK_MAX_CHARS = int(os.getenv("SEMANTIC_CHUNK_MAX_CHARS", "1500"))
+SEMANTIC_INDEX_BATCH_SIZE = int(os.getenv("SEMANTIC_INDEX_BATCH_SIZE", "16"))
+SEMANTIC_INDEX_FLUSH_SECONDS = float(os.getenv("SEMANTIC_INDEX_FLUSH_SECONDS", "2"))
+
+EmbeddingFunction = Callable[[List[str]], List[List[float]]]
+
+
+class HashingEmbeddingFunction:
+    """Deterministic bag-of-words embedding (signed feature hashing). Needs no model download,
+    which makes it suitable for tests and offline environments."""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            for token in re.findall(r"\w+", text.lower()):
+                digest = hashlib.md5(token.encode("utf-8")).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+            norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+            embeddings.append([v / norm for v in vector])
+        return embeddings
+
+
+def _build_embedding_function(name: str) -> EmbeddingFunction:
+    if name == "hash":
+        return HashingEmbeddingFunction()
+    if name == "default":
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+        default_ef = DefaultEmbeddingFunction()
+        return lambda texts: [list(map(float, e)) for e in default_ef(texts)]
+    module_name, _, attr = name.partition(":")
+    import importlib
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory() if isinstance(factory, type) else factory
+
+
+_embedding_function = None
+_collection = None
+_chroma_lock = threading.Lock()
+
+
+def set_embedding_function(embedding_function: EmbeddingFunction) -> None:
+    """Replace the embedding function (e.g. with HashingEmbeddingFunction in tests)."""
+    global _embedding_function
+    with _chroma_lock:
+        _embedding_function = embedding_function
+
+
+def _get_embedding_function() -> EmbeddingFunction:
+    global _embedding_function
+    with _chroma_lock:
+        if _embedding_function is None:
+            _embedding_function = _build_embedding_function(SEMANTIC_EMBEDDING)
+    return _embedding_function
+
+
+def _get_collection():
+    global _collection
+    with _chroma_lock:
+        if _collection is None:
+            import chromadb
+            from chromadb.config import Settings
+            client = chromadb.PersistentClient(path=CHROMA_PATH, settings=Settings(anonymized_telemetry=False))
+            # Embeddings are computed by us, so the collection carries no embedding function
+            _collection = client.get_or_create_collection(
+                name=CHROMA_COLLECTION,
+                embedding_function=None,
+                metadata={"hnsw:space": "cosine"}
+            )
+    return _collection
+
+
+def _chunk_transcript(text: str) -> List[tuple]:
+    """Split a transcript into (segment_number, chunk_text) pieces small enough to embed."""
+    chunks = []
+    for number, body in split_transcript_segments(text):
+        for part in pack_segments([(number, body)], max_chars=SEMANTIC_CHUNK_MAX_CHARS):
+            chunks.append((number, part))
+    return chunks
+
+
+def _index_batch(jobs: List[dict]) -> None:
+    collection = _get_collection()
+    embed = _get_embedding_function()
+
+    ids, documents, metadatas = [], [], []
+    for job in jobs:
+        source_id = job["source_id"]
+        content_hash = hashlib.sha256(job["text"].encode("utf-8")).hexdigest()
+        existing = collection.get(where={"source_id": source_id}, include=["metadatas"])
+        if existing["ids"] and all(m.get("content_hash") == content_hash for m in existing["metadatas"]):
+            continue  # Unchanged transcript
+        if existing["ids"]:
+            collection.delete(ids=existing["ids"])
+
+        for chunk_index, (segment, chunk_text) in enumerate(_chunk_transcript(job["text"])):
+            ids.append(f"{source_id}:{chunk_index}")
+            documents.append(chunk_text)
+            metadatas.append({
+                "source_id": source_id,
+                "source": job["source"],
+                "meeting_id": job.get("meeting_id") or "",
+                "segment": segment,
+                "chunk_index": chunk_index,
+                "content_hash": content_hash
+            })
+
+    if ids:
+        collection.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embed(documents))
+        logger.info(f"Indexed {len(ids)} transcript chunks from {len(jobs)} transcripts")
+
+
+_index_queue: "queue.Queue[dict]" = queue.Queue()
+_indexer_thread = None
+
+
+def _indexer_loop() -> None:
+    while True:
+        jobs = {}
+        job = _index_queue.get()
+        jobs[job["source_id"]] = job
+        deadline = time.monotonic() + SEMANTIC_INDEX_FLUSH_SECONDS
+        # Collect a batch; later jobs for the same source replace earlier ones
+        while len(jobs) < SEMANTIC_INDEX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = _index_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs[job["source_id"]] = job
+        try:
+            _index_batch(list(jobs.values()))
+        except Exception:
+            logger.exception("Semantic indexing batch failed")
+
+
+def queue_transcript_for_indexing(source_id: str, text: str, source: str = "meeting",
+                                  meeting_id: Optional[str] = None) -> None:
+    """Queue a transcript for chunking and embedding off the request path.
+    Re-queuing the same source_id with changed text replaces its previous chunks; empty text removes them.
+    """
+    global _indexer_thread
+    with _chroma_lock:
+        if _indexer_thread is None:
+            _indexer_thread = threading.Thread(target=_indexer_loop, name="semantic-indexer", daemon=True)
+            _indexer_thread.start()
+    _index_queue.put({"source_id": source_id, "text": text or "", "source": source, "meeting_id": meeting_id})
+
+
+def search_segments(query: str, k: int = 5, meeting_id: Optional[str] = None) -> List[dict]:
+    """Return the top-k transcript chunks most similar to the query."""
+    collection = _get_collection()
+    if collection.count() == 0:
+        return []
+    result = collection.query(
+        query_embeddings=_get_embedding_function()([query]),
+        n_results=k,
+        where={"meeting_id": meeting_id} if meeting_id else None,
+        include=["documents", "metadatas", "distances"]
+    )
+    hits = []
+    for doc, meta, distance in zip(result["documents"][0], result["metadatas"][0], result["distances"][0]):
+        hits.append({
+            "meeting_id": meta.get("meeting_id") or None,
+            "source": meta.get("source"),
+            "source_id": meta.get("source_id"),
+            "segment": meta.get("segment"),
+            "chunk_index": meta.get("chunk_index"),
+            "text": doc,
+            "score": 1.0 - float(distance)
+        })
+    return hits
@@ -0,0 +1,282 @@
+import fcntl
+import gzip
+import logging
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from starlette.staticfiles import StaticFiles
+
+from services.transcript_format_service import PARTIAL_SUFFIX
+from services.upload_service import UPLOAD_DIR, UPLOAD_TEMP_DIR, content_hash_from_path, get_upload_index
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "outputs"
+STORAGE_LIFECYCLE_ENABLED = os.getenv("STORAGE_LIFECYCLE_ENABLED", "true").lower() in ("1", "true", "yes")
+STORAGE_LIFECYCLE_INTERVAL_SECONDS = float(os.getenv("STORAGE_LIFECYCLE_INTERVAL_SECONDS", "3600"))
+# Budget for uploads/, outputs/ and the clip cache together
+STORAGE_BUDGET_BYTES = int(os.getenv("STORAGE_BUDGET_BYTES", str(20 * 1024 * 1024 * 1024)))
+STORAGE_COMPACT_AFTER_DAYS = float(os.getenv("STORAGE_COMPACT_AFTER_DAYS", "30"))
+# "flac" is lossless and only applied to uncompressed originals; "opus" compacts every format
+STORAGE_COMPACT_CODEC = os.getenv("STORAGE_COMPACT_CODEC", "flac")
+STORAGE_OPUS_BITRATE = os.getenv("STORAGE_OPUS_BITRATE", "32k")
+STORAGE_GZIP_AFTER_DAYS = float(os.getenv("STORAGE_GZIP_AFTER_DAYS", "7"))
+STORAGE_TEMP_MAX_AGE_HOURS = float(os.getenv("STORAGE_TEMP_MAX_AGE_HOURS", "6"))
+# Originals are only evicted when explicitly allowed; derived files (clips, outputs) always may be
+STORAGE_EVICT_UPLOADS = os.getenv("STORAGE_EVICT_UPLOADS", "false").lower() in ("1", "true", "yes")
+STORAGE_LOCK_PATH = os.path.join(".cache", "storage_lifecycle.lock")
+
+# Prefixes of the mkdtemp() directories created by the conversion and segmenting helpers
+TEMP_DIR_PREFIXES = ("audio_conv_", "audio_segs_", "whisper_audio_")
+UNCOMPRESSED_EXTENSIONS = (".wav", ".aif", ".aiff")
+COMPACTED_EXTENSIONS = (".flac", ".opus")
+
+mimetypes.add_type("audio/ogg", ".opus")
+mimetypes.add_type("audio/flac", ".flac")
+
+
+def _last_used(path: str) -> float:
+    stat = os.stat(path)
+    return max(stat.st_atime, stat.st_mtime)
+
+
+def resolve_stored_path(path: str) -> Optional[str]:
+    """Return an existing path for a stored file, following compaction:
+    uploads/<name>.wav may now be uploads/<name>.flac or .opus, and outputs/<name>.txt may be
+    outputs/<name>.txt.gz. Returns None when no form of the file exists.
+    """
+    if os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    for compacted_ext in COMPACTED_EXTENSIONS:
+        if compacted_ext != ext and os.path.exists(stem + compacted_ext):
+            return stem + compacted_ext
+    if os.path.exists(path + ".gz"):
+        return path + ".gz"
+    return None
+
+
+def read_text_output(path: str) -> str:
+    """Read a transcript file (.txt or .json) from outputs/, whether or not it has been gzipped."""
+    resolved = resolve_stored_path(path)
+    if resolved is None:
+        raise FileNotFoundError(path)
+    opener = gzip.open if resolved.endswith(".gz") else open
+    with opener(resolved, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class CompactionAwareStaticFiles(StaticFiles):
+    """StaticFiles that keeps serving old URLs after their file was compacted."""
+
+    def lookup_path(self, path: str):
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is None:
+            stem, ext = os.path.splitext(path)
+            for compacted_ext in COMPACTED_EXTENSIONS:
+                if compacted_ext != ext:
+                    full_path, stat_result = super().lookup_path(stem + compacted_ext)
+                    if stat_result is not None:
+                        break
+        return full_path, stat_result
+
+
+def _compact_audio(path: str, dry_run: bool) -> int:
+    """Re-encode one original; returns the bytes saved."""
+    stem, ext = os.path.splitext(path)
+    if STORAGE_COMPACT_CODEC == "opus":
+        target, codec_args = stem + ".opus", ["-c:a", "libopus", "-b:a", STORAGE_OPUS_BITRATE, "-application", "voip"]
+    else:
+        if ext not in UNCOMPRESSED_EXTENSIONS:
+            return 0
+        target, codec_args = stem + ".flac", ["-c:a", "flac", "-compression_level", "8"]
+    original_size = os.path.getsize(path)
+    if dry_run:
+        return original_size // 2  # Rough estimate for reporting
+
+    tmp_target = target + ".tmp"
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-i", path, "-vn", *codec_args,
+           "-f", "ogg" if target.endswith(".opus") else "flac", tmp_target]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0 or not os.path.exists(tmp_target):
+        logger.warning(f"Could not compact {path}: {result.stderr.decode(errors='ignore')[-300:]}")
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+        return 0
+    new_size = os.path.getsize(tmp_target)
+    if new_size >= original_size:
+        os.remove(tmp_target)
+        return 0
+
+    os.replace(tmp_target, target)
+    # Keep the original timestamps so age and LRU decisions still refer to the recording's use
+    stat = os.stat(path)
+    os.utime(target, (stat.st_atime, stat.st_mtime))
+    content_hash = content_hash_from_path(path)
+    if content_hash:
+        get_upload_index().update_ext(content_hash, os.path.splitext(target)[1])
+    os.remove(path)
+    logger.info(f"Compacted {path} -> {target} ({original_size} -> {new_size} bytes)")
+    return original_size - new_size
+
+
+def compact_old_uploads(now: float, dry_run: bool = False) -> dict:
+    stats = {"compacted": 0, "bytes_saved": 0}
+    if not os.path.isdir(UPLOAD_DIR) or shutil.which("ffmpeg") is None:
+        return stats
+    cutoff = now - STORAGE_COMPACT_AFTER_DAYS * 86400
+    for entry in os.scandir(UPLOAD_DIR):
+        if not entry.is_file() or entry.name.startswith("."):
+            continue
+        if os.path.splitext(entry.name)[1].lower() in COMPACTED_EXTENSIONS:
+            continue
+        if _last_used(entry.path) > cutoff:
+            continue
+        saved = _compact_audio(entry.path, dry_run)
+        if saved:
+            stats["compacted"] += 1
+            stats["bytes_saved"] += saved
+    return stats
+
+
+def gzip_old_outputs(now: float, dry_run: bool = False) -> dict:
+    stats = {"gzipped": 0, "bytes_saved": 0}
+    if not os.path.isdir(OUTPUT_DIR):
+        return stats
+    cutoff = now - STORAGE_GZIP_AFTER_DAYS * 86400
+    for entry in os.scandir(OUTPUT_DIR):
+        if not entry.is_file() or not entry.name.endswith((".txt", ".json")) or _last_used(entry.path) > cutoff:
+            continue
+        original_size = entry.stat().st_size
+        if dry_run:
+            stats["gzipped"] += 1
+            continue
+        tmp_path = entry.path + ".gz.tmp"
+        with open(entry.path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, entry.path + ".gz")
+        os.utime(entry.path + ".gz", (entry.stat().st_atime, entry.stat().st_mtime))
+        stats["bytes_saved"] += original_size - os.path.getsize(entry.path + ".gz")
+        os.remove(entry.path)
+        stats["gzipped"] += 1
+    return stats
+
+
+def remove_orphaned_temp_files(now: float, dry_run: bool = False) -> dict:
+    """Remove conversion/segment temp dirs, interrupted upload temp files and partial transcripts
+    left behind by crashes.
+    """
+    stats = {"removed": 0}
+    cutoff = now - STORAGE_TEMP_MAX_AGE_HOURS * 3600
+    candidates = []
+    temp_root = tempfile.gettempdir()
+    for entry in os.scandir(temp_root):
+        if entry.is_dir() and entry.name.startswith(TEMP_DIR_PREFIXES):
+            candidates.append(entry.path)
+    if os.path.isdir(UPLOAD_TEMP_DIR):
+        candidates += [e.path for e in os.scandir(UPLOAD_TEMP_DIR) if e.is_file() and e.name.startswith(".upload-")]
+    if os.path.isdir(OUTPUT_DIR):
+        candidates += [e.path for e in os.scandir(OUTPUT_DIR)
+                       if e.is_file() and e.name.endswith((PARTIAL_SUFFIX, ".tmp"))]
+    for path in candidates:
+        try:
+            if os.stat(path).st_mtime > cutoff:
+                continue
+            if not dry_run:
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+            stats["removed"] += 1
+        except FileNotFoundError:
+            continue
+    return stats
+
+
+def _managed_files() -> List[tuple]:
+    """(last_used, size, path, evictable) for every file counted against the budget."""
+    from services.audio_clip_service import AUDIO_CLIP_CACHE_DIR
+    files = []
+    # Eviction order within equal age: derived data first
+    for directory, evictable in ((AUDIO_CLIP_CACHE_DIR, True), (OUTPUT_DIR, True), (UPLOAD_DIR, STORAGE_EVICT_UPLOADS)):
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                # Structured transcripts (.json, possibly gzipped) are the canonical form, not derived data
+                keep = directory == OUTPUT_DIR and entry.name.endswith((".json", ".json.gz"))
+                try:
+                    files.append((_last_used(entry.path), entry.stat().st_size, entry.path, evictable and not keep))
+                except FileNotFoundError:
+                    continue
+    return files
+
+
+def evict_over_budget(dry_run: bool = False) -> dict:
+    files = _managed_files()
+    total = sum(size for _, size, _, _ in files)
+    stats = {"total_bytes": total, "evicted": 0, "bytes_freed": 0}
+    for _, size, path, evictable in sorted(files):
+        if total <= STORAGE_BUDGET_BYTES:
+            break
+        if not evictable:
+            continue
+        if not dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        total -= size
+        stats["evicted"] += 1
+        stats["bytes_freed"] += size
+    if total > STORAGE_BUDGET_BYTES:
+        logger.warning(f"Storage is {total} bytes, over the {STORAGE_BUDGET_BYTES} byte budget, with nothing left to evict")
+    return stats
+
+
+def run_lifecycle_pass(dry_run: bool = False) -> Optional[dict]:
+    """One pass of compaction, gzip, temp cleanup and eviction.
+    Returns None when another process is already running a pass.
+    """
+    os.makedirs(os.path.dirname(STORAGE_LOCK_PATH), exist_ok=True)
+    with open(STORAGE_LOCK_PATH, "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+        now = time.time()
+        return {
+            "temp": remove_orphaned_temp_files(now, dry_run),
+            "compaction": compact_old_uploads(now, dry_run),
+            "gzip": gzip_old_outputs(now, dry_run),
+            "eviction": evict_over_budget(dry_run)
+        }
+
+
+_manager_thread = None
+
+
+def _lifecycle_loop() -> None:
+    while True:
+        try:
+            stats = run_lifecycle_pass()
+            if stats:
+                logger.info(f"Storage lifecycle pass: {stats}")
+        except Exception:
+            logger.exception("Storage lifecycle pass failed")
+        time.sleep(STORAGE_LIFECYCLE_INTERVAL_SECONDS)
+
+
+def start_storage_lifecycle_manager() -> None:
+    """Run lifecycle passes every STORAGE_LIFECYCLE_INTERVAL_SECONDS on a background thread."""
+    global _manager_thread
+    if not STORAGE_LIFECYCLE_ENABLED or _manager_thread is not None:
+        return
+    _manager_thread = threading.Thread(target=_lifecycle_loop, name="storage-lifecycle", daemon=True)
+    _manager_thread.start()
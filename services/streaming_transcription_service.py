@@ -0,0 +1,170 @@
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+WHISPER_STREAMING_ENABLED = os.getenv("WHISPER_STREAMING_ENABLED", "true").lower() in ("1", "true", "yes")
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30
+_BYTES_PER_SAMPLE = 2  # s16le
+_WINDOW_BYTES = WINDOW_SECONDS * SAMPLE_RATE * _BYTES_PER_SAMPLE
+_MIN_WINDOW_SAMPLES = SAMPLE_RATE // 2  # Windows shorter than 0.5 s are padded, as in _chunk_audio
+_READ_SIZE = 64 * 1024
+_END = object()
+
+
+class StreamingWhisperTranscriber:
+    """Decode an upload with ffmpeg while it arrives and transcribe each 30 s window as soon as
+    it is decoded, so inference overlaps the upload instead of following it.
+
+    feed() receives the upload bytes as they come off the socket (a raw request body; a multipart
+    UploadFile has already been received in full, so feeding it only overlaps the disk write); finish() returns the same result dict as
+    transcribe_audio_with_whisper, or None when the stream could not be decoded (e.g. formats
+    that need seeking, such as MP4 with a trailing index); callers then fall back to the file.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._windows: "queue.Queue" = queue.Queue()
+        self._segments: List[dict] = []
+        self._window_count = 0
+        self._failed = False
+        self._error: Optional[str] = None
+        self._reader = None
+        self._worker = None
+        self._started_at = None
+
+    @classmethod
+    def start_if_available(cls) -> Optional["StreamingWhisperTranscriber"]:
+        """A running transcriber, or None when streaming is disabled or ffmpeg is not installed."""
+        if not WHISPER_STREAMING_ENABLED or shutil.which("ffmpeg") is None:
+            return None
+        transcriber = cls()
+        try:
+            transcriber._start()
+        except OSError as e:
+            logger.warning(f"Streaming transcription unavailable: {e}")
+            return None
+        return transcriber
+
+    def _start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._reader = threading.Thread(target=self._read_pcm, name="whisper-stream-decode", daemon=True)
+        self._worker = threading.Thread(target=self._transcribe_windows, name="whisper-stream-infer", daemon=True)
+        self._reader.start()
+        self._worker.start()
+
+    def _read_pcm(self) -> None:
+        buffer = bytearray()
+        try:
+            while True:
+                data = self._process.stdout.read(_READ_SIZE)
+                if not data:
+                    break
+                buffer.extend(data)
+                while len(buffer) >= _WINDOW_BYTES:
+                    self._windows.put(bytes(buffer[:_WINDOW_BYTES]))
+                    del buffer[:_WINDOW_BYTES]
+            if buffer:
+                self._windows.put(bytes(buffer))
+        finally:
+            self._windows.put(_END)
+
+    def _transcribe_windows(self) -> None:
+        from services.whisper_service import get_whisper_service
+        import numpy as np
+
+        service = None
+        while True:
+            window = self._windows.get()
+            if window is _END:
+                return
+            if self._failed:
+                continue  # Drain so the decoder never blocks
+            try:
+                if service is None:
+                    # The model loads while the first bytes are still arriving
+                    service = get_whisper_service()
+                samples = np.frombuffer(window, dtype=np.int16).astype(np.float32) / 32768.0
+                duration = len(samples) / SAMPLE_RATE
+                if len(samples) < _MIN_WINDOW_SAMPLES:
+                    samples = np.pad(samples, (0, _MIN_WINDOW_SAMPLES - len(samples)), mode="constant")
+                start = self._window_count * WINDOW_SECONDS
+                segment = service.transcribe_chunk(samples, self._window_count, start)
+                if segment is not None:
+                    # End at the decoded audio, not the padding
+                    segment["end"] = round(start + duration, 3)
+                    self._segments.append(segment)
+                self._window_count += 1
+            except Exception as e:
+                logger.exception("Streaming transcription failed")
+                self._failed = True
+                self._error = str(e)
+
+    def feed(self, chunk: bytes) -> None:
+        """Pass upload bytes to the decoder (blocking while ffmpeg catches up)."""
+        if self._failed:
+            return
+        try:
+            self._process.stdin.write(chunk)
+        except (BrokenPipeError, OSError) as e:
+            # ffmpeg gave up on this input; the upload itself continues unaffected
+            self._failed = True
+            self._error = f"decoder stopped: {e}"
+
+    def abort(self) -> None:
+        self._failed = True
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+
+    def finish(self, audio_file_path: str, save_dir: str = "outputs") -> Optional[dict]:
+        """Wait for the remaining windows and build the result for the stored file."""
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        return_code = self._process.wait()
+        self._reader.join()
+        self._worker.join()
+
+        if return_code != 0 and not self._failed:
+            self._failed = True
+            self._error = f"ffmpeg exited with status {return_code}"
+        if self._failed or self._window_count == 0:
+            logger.info(f"Streaming transcription not used for {audio_file_path}: {self._error or 'no audio decoded'}")
+            return None
+
+        from services.transcript_format_service import structured_path_for
+        from services.whisper_service import get_whisper_service, format_chunks
+        service = get_whisper_service()
+        combined_text = format_chunks(self._segments)
+        file_path = service.save_transcript(audio_file_path, combined_text, self._window_count, save_dir,
+                                            self._segments, time.perf_counter() - self._started_at)
+        logger.info(
+            f"Streamed transcription of {audio_file_path}: {self._window_count} windows in "
+            f"{time.perf_counter() - self._started_at:.1f}s since the upload started"
+        )
+        return {
+            "transcription": combined_text,
+            "file_path": file_path,
+            "structured_path": structured_path_for(file_path),
+            "model_used": service.model_name,
+            "chunks_processed": self._window_count
+        }
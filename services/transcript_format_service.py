@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+from utils.transcript_utils import split_transcript_segments
+
+# Structured transcripts are the canonical stored form; SRT, WebVTT and plain text are rendered
+# from them on request
+TRANSCRIPT_FORMAT_VERSION = 1
+TRANSCRIPT_FORMATS = ("json", "txt", "srt", "vtt")
+TRANSCRIPT_MEDIA_TYPES = {
+    "json": "application/json",
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8"
+}
+TRANSCRIPT_RENDER_CACHE_SIZE = int(os.getenv("TRANSCRIPT_RENDER_CACHE_SIZE", "64"))
+# Partial transcripts are fsynced after this many appends or this many seconds, whichever comes first
+TRANSCRIPT_FSYNC_EVERY = int(os.getenv("TRANSCRIPT_FSYNC_EVERY", "4"))
+TRANSCRIPT_FSYNC_INTERVAL_SECONDS = float(os.getenv("TRANSCRIPT_FSYNC_INTERVAL_SECONDS", "5"))
+PARTIAL_SUFFIX = ".partial"
+
+
+def make_segment(index: int, start: float, end: float, text: str, failed: bool = False,
+                 elapsed_seconds: float = None) -> dict:
+    """One transcribed window: 0-based chunk index, offsets in seconds into the recording."""
+    segment = {"index": index, "start": round(start, 3), "end": round(end, 3), "text": (text or "").strip()}
+    if failed:
+        segment["failed"] = True
+    if elapsed_seconds is not None:
+        segment["elapsed"] = round(elapsed_seconds, 3)
+    return segment
+
+
+def build_transcript(segments: List[dict], model: str, source: str, audio_file: str, window_seconds: int,
+                     elapsed_seconds: float = None) -> dict:
+    doc = {
+        "version": TRANSCRIPT_FORMAT_VERSION,
+        "source": source,
+        "model": model,
+        "audio_file": os.path.basename(audio_file or ""),
+        "window_seconds": window_seconds,
+        "created_at": time.time(),
+        "segments": sorted(segments, key=lambda segment: segment["index"])
+    }
+    if elapsed_seconds is not None:
+        doc["elapsed"] = round(elapsed_seconds, 3)
+    return doc
+
+
+def transcript_from_text(text: str, model: str, source: str, audio_file: str, window_seconds: int) -> dict:
+    """Structured form of a legacy "=== Segment/Chunk N ===" transcript. Offsets are derived from
+    the window size, so the last window's end may run past the end of the recording.
+    """
+    segments = [
+        make_segment(number - 1, (number - 1) * window_seconds, number * window_seconds, body,
+                     failed=body == "[Transcription failed]")
+        for number, body in split_transcript_segments(text)
+    ]
+    return build_transcript(segments, model, source, audio_file, window_seconds)
+
+
+def structured_path_for(text_path: str) -> str:
+    """outputs/<name>.txt -> outputs/<name>.json"""
+    return os.path.splitext(text_path)[0] + ".json"
+
+
+def unique_output_path(save_dir: str, audio_file_path: str, suffix: str) -> str:
+    """<save_dir>/<audio name>_<job id><suffix>. Every job gets a fresh id, so two jobs for
+    recordings with the same name never write to the same file.
+    """
+    stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+    return os.path.join(save_dir, f"{stem}_{uuid.uuid4().hex[:12]}{suffix}")
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes a rename durable; not supported on every platform
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class IncrementalTranscriptWriter:
+    """Writes one job's transcript as it is produced.
+
+    Text is appended to a hidden "<name>.partial" file next to the final path, flushed on every
+    write and fsynced in batches (see TRANSCRIPT_FSYNC_EVERY). commit() moves it into place
+    atomically, so the final path only ever holds a complete transcript. If the job crashes, the
+    partial file keeps every chunk finished so far until the storage lifecycle manager removes it.
+    """
+
+    def __init__(self, final_path: str):
+        self.final_path = final_path
+        directory = os.path.dirname(final_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        self.partial_path = os.path.join(directory, f".{os.path.basename(final_path)}{PARTIAL_SUFFIX}")
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+        self._unsynced += 1
+        if (self._unsynced >= TRANSCRIPT_FSYNC_EVERY
+                or time.monotonic() - self._synced_at >= TRANSCRIPT_FSYNC_INTERVAL_SECONDS):
+            self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def commit(self) -> str:
+        """Publish the transcript under its final path and return that path."""
+        self._sync()
+        self._file.close()
+        os.replace(self.partial_path, self.final_path)
+        _fsync_directory(os.path.dirname(self.final_path))
+        return self.final_path
+
+    def close(self) -> None:
+        """Stop writing without publishing; a no-op after commit()."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "IncrementalTranscriptWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def save_transcript_json(doc: dict, path: str) -> str:
+    """Write compact JSON atomically and return the path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(path))
+    return path
+
+
+def load_transcript_json(path: str) -> dict:
+    """Read a structured transcript, whether or not the lifecycle manager has gzipped it."""
+    from services.storage_lifecycle_service import read_text_output
+    return json.loads(read_text_output(path))
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _cues(doc: dict) -> List[tuple]:
+    """(start, end, text) subtitle cues: each segment is split into its lines, and the segment's
+    time is shared between them in proportion to their length. Failed segments get no cues.
+    """
+    cues = []
+    for segment in doc.get("segments", []):
+        if segment.get("failed"):
+            continue
+        lines = [line.strip() for line in segment.get("text", "").splitlines() if line.strip()]
+        if not lines:
+            continue
+        start, end = segment["start"], max(segment["end"], segment["start"])
+        total_chars = sum(len(line) for line in lines)
+        position = start
+        for line in lines:
+            duration = (end - start) * len(line) / total_chars
+            cues.append((position, position + duration, line))
+            position += duration
+    return cues
+
+
+def render_text(doc: dict) -> str:
+    return "\n\n".join(segment["text"] for segment in doc.get("segments", []) if segment.get("text")) + "\n"
+
+
+def render_srt(doc: dict) -> str:
+    blocks = [
+        f"{number}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n{text}\n"
+        for number, (start, end, text) in enumerate(_cues(doc), start=1)
+    ]
+    return "\n".join(blocks)
+
+
+def render_vtt(doc: dict) -> str:
+    blocks = [f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n{text}\n" for start, end, text in _cues(doc)]
+    return "WEBVTT\n\n" + "\n".join(blocks)
+
+
+def render_json(doc: dict) -> str:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+RENDERERS = {"json": render_json, "txt": render_text, "srt": render_srt, "vtt": render_vtt}
+
+_render_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def render_transcript(doc: dict, fmt: str, cache_key: Optional[tuple] = None) -> str:
+    """Render a structured transcript; results are kept in a small LRU when cache_key is given."""
+    if fmt not in RENDERERS:
+        raise ValueError(f"format must be one of {', '.join(TRANSCRIPT_FORMATS)}")
+    key = (cache_key, fmt) if cache_key is not None else None
+    if key is not None:
+        with _render_cache_lock:
+            if key in _render_cache:
+                _render_cache.move_to_end(key)
+                return _render_cache[key]
+    rendered = RENDERERS[fmt](doc)
+    if key is not None:
+        with _render_cache_lock:
+            _render_cache[key] = rendered
+            while len(_render_cache) > TRANSCRIPT_RENDER_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+    return rendered
+
+
+def render_transcript_file(path: str, fmt: str) -> str:
+    """Render a stored structured transcript; re-rendered only when the file changes."""
+    from services.storage_lifecycle_service import resolve_stored_path
+    resolved = resolve_stored_path(path)
+    if resolved is None:
+        raise FileNotFoundError(path)
+    stat = os.stat(resolved)
+    cache_key = (os.path.abspath(resolved), stat.st_size, stat.st_mtime_ns)
+    with _render_cache_lock:
+        cached = _render_cache.get((cache_key, fmt))
+    if cached is not None:
+        return cached
+    return render_transcript(load_transcript_json(resolved), fmt, cache_key)
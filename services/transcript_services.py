@@ -1,13 +1,31 @@
-import google.generativeai as genai
 import os
 import mimetypes
 import shutil
 import subprocess
 import tempfile
-from typing import List, Tuple
-
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-gemini_model = genai.GenerativeModel("gemini-1.5-flash")
+import time
+import wave
+from typing import Callable, List, Optional, Tuple
+from services.llm_cache_service import cached_generate
+from services.llm_client_service import get_llm_client
+from services.transcript_format_service import (
+    make_segment,
+    build_transcript,
+    transcript_from_text,
+    save_transcript_json,
+    structured_path_for,
+    unique_output_path,
+    IncrementalTranscriptWriter
+)
+from services.upload_service import content_hash_from_path
+from services.audio_clip_service import SEGMENT_SECONDS
+
+TRANSCRIPTION_PROMPT = (
+    "Please transcribe this meeting audio with speaker diarization. "
+    "Return: 1) a clear transcript with speaker labels (Speaker 1, Speaker 2, ...), "
+    "2) a concise summary with Title, Summary, Key Points, and "
+    "3) a bullet list of action items with owners if mentioned."
+)
 
 
 def _ffmpeg_available() -> bool:
@@ -64,53 +82,119 @@ def _guess_mime(path: str) -> str:
     return mime or "application/octet-stream"
 
 
-def transcript_audio(audio_file_path: str, save_dir: str = "outputs") -> dict:
-    # Ensure save directory exists (auto-create if missing)
-    os.makedirs(save_dir, exist_ok=True)
+def _wav_duration(path: str) -> Optional[float]:
+    """Length in seconds of a WAV file, or None when it cannot be read as one."""
+    try:
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / float(f.getframerate())
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+SEGMENT_SEPARATOR = "\n\n\n"
+
+
+def _format_segment(segment: dict) -> str:
+    return f"=== Segment {segment['index'] + 1} ===\n{segment['text']}"
+
 
+def _format_segments(segments: List[dict]) -> str:
+    """The text form of a transcript: each segment under its "=== Segment N ===" header."""
+    return SEGMENT_SEPARATOR.join(_format_segment(segment) for segment in segments).strip()
+
+
+def _transcribe_segments(audio_file_path: str,
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         on_segment: Optional[Callable[[dict], None]] = None) -> List[dict]:
     # Convert to robust format for transcription
     conv_path, converted = _convert_to_wav_16k_mono(audio_file_path)
 
     # Segment long audio
-    segments = _segment_audio_wav(conv_path, segment_seconds=300)  # 5 minutes per chunk
+    segments = _segment_audio_wav(conv_path, segment_seconds=SEGMENT_SECONDS)
+
+    client = get_llm_client()
 
     # Transcribe each segment and assemble
-    transcripts: List[str] = []
+    transcripts: List[dict] = []
     for idx, seg_path in enumerate(segments):
+        started = time.perf_counter()
         with open(seg_path, "rb") as f:
             audio_bytes = f.read()
 
         # Choose mime type: use wav for converted, else guess
         mime_type = "audio/wav" if converted or seg_path.lower().endswith('.wav') else _guess_mime(seg_path)
 
-        response = gemini_model.generate_content([
-            {"mime_type": mime_type, "data": audio_bytes},
-            (
-                "Please transcribe this meeting audio with speaker diarization. "
-                "Return: 1) a clear transcript with speaker labels (Speaker 1, Speaker 2, ...), "
-                "2) a concise summary with Title, Summary, Key Points, and "
-                "3) a bullet list of action items with owners if mentioned."
-            )
-        ])
+        def generate() -> str:
+            return client.generate([
+                {"mime_type": mime_type, "data": audio_bytes},
+                TRANSCRIPTION_PROMPT
+            ])
+
+        # Identical segment bytes are served from the LLM cache instead of re-running the model
+        seg_text = cached_generate(client.model_name, f"{mime_type}|{TRANSCRIPTION_PROMPT}", audio_bytes, generate)
+        start = idx * SEGMENT_SECONDS
+        duration = _wav_duration(seg_path) or SEGMENT_SECONDS
+        transcripts.append(make_segment(idx, start, start + duration, seg_text,
+                                        elapsed_seconds=time.perf_counter() - started))
+        if on_segment:
+            on_segment(transcripts[-1])
 
-        seg_text = response.text if hasattr(response, "text") else str(response)
-        header = f"\n\n=== Segment {idx + 1} ===\n"
-        transcripts.append(header + seg_text.strip())
+        if progress_callback:
+            progress_callback(idx + 1, len(segments))
 
-    combined_text = "\n".join(transcripts).strip()
+    return transcripts
 
-    # Save in a clean .txt file
-    filename = os.path.splitext(os.path.basename(audio_file_path))[0] + "_minutes.txt"
-    file_path = os.path.join(save_dir, filename)
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("📌 Meeting Minutes\n")
-        f.write("====================\n\n")
-        f.write(combined_text)
+def transcript_audio(audio_file_path: str, save_dir: str = "outputs",
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> dict:
+    """Transcribe audio segment by segment; progress_callback(done, total) is called after each segment."""
+    # Ensure save directory exists (auto-create if missing)
+    os.makedirs(save_dir, exist_ok=True)
+
+    model_name = get_llm_client().model_name
+    started = time.perf_counter()
+    segments = None
+
+    # Save in a clean .txt file, unique to this job. Segments are appended as they finish and
+    # the file only appears under its final name once the transcript is complete.
+    with IncrementalTranscriptWriter(unique_output_path(save_dir, audio_file_path, "_minutes.txt")) as writer:
+        writer.write("📌 Meeting Minutes\n====================\n\n")
+
+        def on_segment(segment: dict):
+            writer.write((SEGMENT_SEPARATOR if segment["index"] else "") + _format_segment(segment))
+
+        def transcribe() -> str:
+            nonlocal segments
+            segments = _transcribe_segments(audio_file_path, progress_callback, on_segment)
+            return _format_segments(segments)
+
+        # Content-addressed uploads are looked up by their hash first, skipping conversion and
+        # segmenting entirely when the same recording was transcribed before
+        content_hash = content_hash_from_path(audio_file_path)
+        if content_hash:
+            combined_text = cached_generate(
+                model_name,
+                f"transcript|{TRANSCRIPTION_PROMPT}",
+                f"sha256:{content_hash}",
+                transcribe
+            )
+        else:
+            combined_text = transcribe()
+
+        # Structured copy alongside; a cache hit only has the text, so offsets come from the window size
+        if segments is not None:
+            doc = build_transcript(segments, model_name, "llm", audio_file_path, SEGMENT_SECONDS,
+                                   time.perf_counter() - started)
+        else:
+            writer.write(combined_text)
+            doc = transcript_from_text(combined_text, model_name, "llm", audio_file_path, SEGMENT_SECONDS)
+        structured_path = save_transcript_json(doc, structured_path_for(writer.final_path))
+        file_path = writer.commit()
 
     print(f"💾 Saved structured meeting notes at: {file_path}")
 
     return {
         "transcription": combined_text,
-        "file_path": file_path
+        "file_path": file_path,
+        "structured_path": structured_path
     }
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from constants.transcription_constants import (
+    TRANSCRIPTION_PROCESSING,
+    TRANSCRIPTION_COMPLETED,
+    TRANSCRIPTION_FAILED,
+    TRANSCRIPTION_ACTIVE_STATUSES
+)
+from repository.transcriprion_repo import update_transcription_state, get_meetings_pending_transcription
+from services.background_job_service import LeasedJobQueue
+from services.transcript_services import transcript_audio
+from services.storage_lifecycle_service import resolve_stored_path
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
+# A job whose lease is not renewed for this long (its process died) is picked up by another worker
+TRANSCRIPTION_LEASE_SECONDS = int(os.getenv("TRANSCRIPTION_LEASE_SECONDS", "600"))
+
+# Global executor so every request shares the same bounded pool of transcription threads
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS, thread_name_prefix="transcription")
+    return _executor
+
+
+async def _transcribe_meeting(meeting_id: str, audio_path: str) -> None:
+    loop = asyncio.get_running_loop()
+
+    # Runs on a transcription thread; database updates are handed back to the event loop
+    def transcribe() -> dict:
+        logger.info(f"Transcribing meeting {meeting_id} from {audio_path}")
+        asyncio.run_coroutine_threadsafe(update_transcription_state(meeting_id, {
+            "transcription_status": TRANSCRIPTION_PROCESSING,
+            "transcription_error": None
+        }), loop).result()
+
+        def on_progress(done: int, total: int):
+            asyncio.run_coroutine_threadsafe(update_transcription_state(meeting_id, {
+                "transcription_progress": {"segments_done": done, "segments_total": total}
+            }), loop)
+
+        # The recording may have been re-encoded by the storage lifecycle manager since it was uploaded
+        local_path = resolve_stored_path(f".{audio_path}") or f".{audio_path}"
+        return transcript_audio(audio_file_path=local_path, progress_callback=on_progress)
+
+    try:
+        # Stays "pending" until a worker thread picks it up
+        transcript_data = await loop.run_in_executor(_get_executor(), transcribe)
+        await update_transcription_state(meeting_id, {
+            "notes": transcript_data.get("transcription", ""),
+            "file_path": transcript_data.get("file_path", ""),
+            "structured_path": transcript_data.get("structured_path"),
+            "transcription_status": TRANSCRIPTION_COMPLETED
+        })
+        logger.info(f"Transcription completed for meeting {meeting_id}: {transcript_data.get('file_path', '')}")
+    except Exception as e:
+        logger.exception(f"Transcription failed for meeting {meeting_id}")
+        await update_transcription_state(meeting_id, {
+            "transcription_status": TRANSCRIPTION_FAILED,
+            "transcription_error": str(e)
+        })
+
+
+async def _find_pending_transcriptions() -> dict:
+    return {
+        str(meeting["_id"]): meeting["audio_recording_url"]
+        for meeting in await get_meetings_pending_transcription()
+        if meeting.get("audio_recording_url")
+    }
+
+
+_transcriptions = LeasedJobQueue(
+    name="transcription",
+    status_field="transcription_status",
+    active_statuses=TRANSCRIPTION_ACTIVE_STATUSES,
+    lease_field="transcription_lease",
+    lease_seconds=TRANSCRIPTION_LEASE_SECONDS,
+    find_pending=_find_pending_transcriptions,
+    run=_transcribe_meeting
+)
+
+
+def submit_meeting_transcription(meeting_id: str, audio_path: str) -> None:
+    """Queue the transcription of a meeting's recording on the background workers.
+    Must be called from the event loop (async routes or startup hooks).
+    """
+    submit_meeting_transcriptions([(meeting_id, audio_path)])
+
+
+def submit_meeting_transcriptions(jobs: list) -> None:
+    """Queue a batch of (meeting_id, audio_path) transcriptions as one background job: the whole
+    batch is claimed in a single database write, then each meeting waits on the bounded pool.
+    Must be called from the event loop.
+    """
+    _transcriptions.submit(dict(jobs))
+
+
+async def resume_pending_transcriptions() -> int:
+    """Re-queue transcriptions interrupted by a restart or abandoned by a stopped worker.
+    Every worker may call it: each job is claimed by exactly one of them.
+    Returns the number of meetings this process claimed.
+    """
+    return await _transcriptions.resume()
@@ -1,32 +1,262 @@
+import errno
+import hashlib
 import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
 import aiofiles
 import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 UPLOAD_DIR = "uploads"
+# In-progress uploads are written outside UPLOAD_DIR, which is served publicly as /uploads.
+# Keep it on the same filesystem so finished files move into the store with a rename.
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", os.path.join(".cache", "uploads"))
+# Uploads are stored once per content as uploads/<sha256><ext>; this index maps the original
+# filenames to their content hash
+UPLOAD_INDEX_PATH = os.getenv("UPLOAD_INDEX_PATH", os.path.join(".cache", "upload_index.sqlite3"))
 
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_EXTENSION_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
 
-async def save_audio_file(file) -> str:
+
+def _extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if _EXTENSION_RE.match(ext) else ""
+
+
+def content_path(sha256: str, ext: str = "") -> str:
+    return os.path.join(UPLOAD_DIR, f"{sha256}{ext}")
+
+
+def content_hash_from_path(path: str) -> Optional[str]:
+    """Return the sha256 of a content-addressed upload path (None for any other path).
+    The transcription pipelines use it as a cache key without re-reading the file.
+    """
+    stem = os.path.splitext(os.path.basename(path or ""))[0]
+    return stem if _SHA256_RE.match(stem) else None
+
+
+class UploadIndex:
+    """SQLite index of stored uploads (by content hash) and of the filenames they were uploaded as."""
+
+    def __init__(self, path: str = UPLOAD_INDEX_PATH):
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            " sha256 TEXT PRIMARY KEY,"
+            " ext TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " content_type TEXT,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS upload_names ("
+            " name TEXT PRIMARY KEY,"
+            " sha256 TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, sha256: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, ext, size, content_type FROM uploads WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"sha256": row[0], "ext": row[1], "size": row[2], "content_type": row[3]}
+
+    def record(self, sha256: str, ext: str, size: int, content_type: Optional[str], name: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO uploads (sha256, ext, size, content_type, created_at) VALUES (?, ?, ?, ?, ?)",
+                (sha256, ext, size, content_type, now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO upload_names (name, sha256, updated_at) VALUES (?, ?, ?)",
+                (name, sha256, now)
+            )
+            self._conn.commit()
+
+    def update_ext(self, sha256: str, ext: str) -> None:
+        """Point an upload at its re-encoded file (see storage_lifecycle_service)."""
+        with self._lock:
+            self._conn.execute("UPDATE uploads SET ext = ? WHERE sha256 = ?", (ext, sha256))
+            self._conn.commit()
+
+    def resolve_name(self, name: str) -> Optional[str]:
+        """Content hash of the latest upload stored under this filename."""
+        with self._lock:
+            row = self._conn.execute("SELECT sha256 FROM upload_names WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+
+_upload_index = None
+_upload_index_lock = threading.Lock()
+
+
+def get_upload_index() -> UploadIndex:
+    global _upload_index
+    with _upload_index_lock:
+        if _upload_index is None:
+            _upload_index = UploadIndex()
+    return _upload_index
+
+
+def find_upload(sha256: str) -> Optional[dict]:
+    """Stored upload for a content hash, or None when it is unknown or its file is gone."""
+    sha256 = (sha256 or "").lower()
+    if not _SHA256_RE.match(sha256):
+        return None
+    stored = get_upload_index().get(sha256)
+    if stored is None or not os.path.exists(content_path(sha256, stored["ext"])):
+        return None
+    return stored
+
+
+def resolve_upload_path(filename: str) -> Optional[str]:
+    """Path of the stored content for a filename it was uploaded as (None when unknown)."""
+    sha256 = get_upload_index().resolve_name(os.path.basename(filename or ""))
+    stored = find_upload(sha256) if sha256 else None
+    return content_path(sha256, stored["ext"]) if stored else None
+
+
+def _stored_result(sha256: str, ext: str, size: int, content_type: Optional[str], name: str,
+                   deduplicated: bool) -> dict:
+    return {
+        "url": f"/uploads/{sha256}{ext}",
+        "file_path": content_path(sha256, ext),
+        "name": name,
+        "size": size,
+        "content_type": content_type,
+        "sha256": sha256,
+        "deduplicated": deduplicated
+    }
+
+
+def register_duplicate(sha256: str, filename: str) -> Optional[dict]:
+    """Complete an upload whose content is already stored, without receiving or writing any bytes."""
+    stored = find_upload(sha256)
+    if stored is None:
+        return None
+    name = os.path.basename(filename or "") or f"{stored['sha256']}{stored['ext']}"
+    get_upload_index().record(stored["sha256"], stored["ext"], stored["size"], stored["content_type"], name)
+    return _stored_result(stored["sha256"], stored["ext"], stored["size"], stored["content_type"], name, True)
+
+
+def store_file(temp_path: str, filename: str, sha256: str, size: int, content_type: Optional[str] = None) -> dict:
+    """Move an already-hashed file into the content store. A duplicate is discarded instead."""
+    filename = os.path.basename(filename or "")
+    ext = _extension(filename)
+    target = content_path(sha256, ext)
+    existing = find_upload(sha256)
+    if existing is not None:
+        ext = existing["ext"]
+    deduplicated = existing is not None or os.path.exists(target)
+    if deduplicated:
+        os.remove(temp_path)
+    else:
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        try:
+            os.replace(temp_path, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(temp_path, target)  # UPLOAD_TEMP_DIR on another filesystem
+    get_upload_index().record(sha256, ext, size, content_type, filename or f"{sha256}{ext}")
+    return _stored_result(sha256, ext, size, content_type, filename, deduplicated)
+
+
+async def store_upload_stream(chunks: AsyncIterator[bytes], filename: str, content_type: Optional[str] = None,
+                              expected_sha256: str = None,
+                              on_chunk: Optional[Callable[[bytes], Awaitable[None]]] = None) -> dict:
+    """Write a stream of upload bytes into the content store, hashing them on the way.
+
+    When expected_sha256 names content that is already stored, the upload completes at once
+    without consuming chunks; for a raw request body (request.stream()) that means the body is
+    never received. on_chunk, if given, also receives every chunk as it is read (e.g. to decode
+    audio while the upload is still arriving).
+    """
     os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(UPLOAD_TEMP_DIR, exist_ok=True)
+    filename = os.path.basename(filename or "")
 
-    filename = os.path.basename(file.filename)
-    file_path = os.path.join(UPLOAD_DIR, filename)
+    if expected_sha256:
+        duplicate = register_duplicate(expected_sha256.lower(), filename)
+        if duplicate is not None:
+            logging.getLogger(__name__).info(f"Upload {filename} already stored as {duplicate['url']}")
+            return duplicate
+
+    temp_path = os.path.join(UPLOAD_TEMP_DIR, f".upload-{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
 
-    # Stream the upload in chunks to handle large files without loading into memory
-    chunk_size = 1024 * 1024 * 4  # 4 MB per chunk
     total_bytes = 0
     chunk_index = 0
     logging.getLogger(__name__).info(f"Starting upload: {filename}")
-    async with aiofiles.open(file_path, "wb") as out_file:
-        while True:
-            chunk = await file.read(chunk_size)
-            if not chunk:
-                break
-            await out_file.write(chunk)
-            total_bytes += len(chunk)
-            chunk_index += 1
-            logging.getLogger(__name__).info(
-                f"Uploading {filename}: chunk={chunk_index} size={len(chunk)}B total={total_bytes}B")
+    try:
+        async with aiofiles.open(temp_path, "wb") as out_file:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                await out_file.write(chunk)
+                if on_chunk is not None:
+                    await on_chunk(chunk)
+                total_bytes += len(chunk)
+                chunk_index += 1
+                logging.getLogger(__name__).debug(
+                    f"Uploading {filename}: chunk={chunk_index} size={len(chunk)}B total={total_bytes}B")
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    sha256 = digest.hexdigest()
+    if expected_sha256 and expected_sha256.lower() != sha256:
+        os.remove(temp_path)
+        raise ValueError("Uploaded file does not match X-Content-SHA256")
+
+    stored = store_file(temp_path, filename, sha256, total_bytes, content_type)
     logging.getLogger(__name__).info(
-        f"Completed upload: {filename} -> {file_path} ({total_bytes} bytes)")
+        f"Completed upload: {filename} -> {stored['file_path']} ({total_bytes} bytes"
+        f"{', duplicate' if stored['deduplicated'] else ''})")
+    return stored
+
+
+async def _read_upload_file(file) -> AsyncIterator[bytes]:
+    # Stream the upload in chunks to handle large files without loading into memory
+    chunk_size = 1024 * 1024 * 4  # 4 MB per chunk
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
 
-    return f"/uploads/{filename}"
+
+async def store_upload(file, expected_sha256: str = None,
+                       on_chunk: Optional[Callable[[bytes], Awaitable[None]]] = None) -> dict:
+    """Store an UploadFile (see store_upload_stream).
+
+    The framework has already received the whole multipart body by the time this runs, so a
+    known expected_sha256 only saves writing a second copy; clients that want to skip sending
+    known content check GET /by-hash first or use the raw-body upload.
+    """
+    return await store_upload_stream(
+        _read_upload_file(file), file.filename, getattr(file, "content_type", None),
+        expected_sha256=expected_sha256, on_chunk=on_chunk
+    )
+
+
+async def save_audio_file(file) -> str:
+    stored = await store_upload(file)
+    return stored["url"]
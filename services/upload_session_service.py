@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+from services.upload_service import store_file
+
+logger = logging.getLogger(__name__)
+
+# Layout of a session under UPLOAD_SESSION_DIR (outside the publicly served uploads/):
+#   <id>.json        session metadata (written once at creation; its mtime is touched by every
+#                    part, so it records the session's last activity)
+#   <id>.data        the target file, preallocated to its final size; parts are written in place
+#   <id>.parts/<n>   one marker per received part holding its sha256, so parallel PUTs (even
+#                    from different worker processes) never rewrite shared state
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", os.path.join(".cache", "upload_sessions"))
+UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+UPLOAD_MIN_PART_SIZE = 256 * 1024
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+
+_SESSION_ID_CHARS = set("0123456789abcdef")
+
+
+def _session_paths(session_id: str) -> dict:
+    if len(session_id) != 32 or not set(session_id) <= _SESSION_ID_CHARS:
+        raise LookupError("Upload session not found")
+    base = os.path.join(UPLOAD_SESSION_DIR, session_id)
+    return {"meta": f"{base}.json", "data": f"{base}.data", "parts": f"{base}.parts"}
+
+
+def _load_session(session_id: str) -> dict:
+    paths = _session_paths(session_id)
+    try:
+        with open(paths["meta"], "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise LookupError("Upload session not found")
+
+
+def _part_range(session: dict, part_number: int) -> tuple:
+    if part_number < 0 or part_number >= session["part_count"]:
+        raise ValueError(f"Part number must be between 0 and {session['part_count'] - 1}")
+    offset = part_number * session["part_size"]
+    return offset, min(session["part_size"], session["size"] - offset)
+
+
+def _touch_session(session_id: str) -> None:
+    """Record activity, so a long-running upload is not expired while parts keep arriving."""
+    try:
+        os.utime(_session_paths(session_id)["meta"])
+    except FileNotFoundError:
+        raise LookupError("Upload session not found")
+
+
+def _received_parts(session_id: str) -> dict:
+    parts_dir = _session_paths(session_id)["parts"]
+    received = {}
+    for name in os.listdir(parts_dir):
+        if name.isdigit():
+            try:
+                with open(os.path.join(parts_dir, name), "r", encoding="utf-8") as f:
+                    received[int(name)] = f.read().strip()
+            except FileNotFoundError:
+                continue  # Being re-sent
+    return received
+
+
+def delete_session(session_id: str) -> None:
+    paths = _session_paths(session_id)
+    for key in ("data", "meta"):
+        try:
+            os.remove(paths[key])
+        except FileNotFoundError:
+            pass
+    shutil.rmtree(paths["parts"], ignore_errors=True)
+
+
+def cleanup_expired_sessions() -> int:
+    """Remove sessions idle for UPLOAD_SESSION_TTL_SECONDS. Returns the number removed."""
+    if not os.path.isdir(UPLOAD_SESSION_DIR):
+        return 0
+    removed = 0
+    cutoff = time.time() - UPLOAD_SESSION_TTL_SECONDS
+    for name in os.listdir(UPLOAD_SESSION_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(UPLOAD_SESSION_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                delete_session(name[:-len(".json")])
+                removed += 1
+        except (OSError, LookupError):
+            continue
+    return removed
+
+
+def create_session(filename: str, size: int, part_size: int = None, sha256: str = None,
+                   content_type: str = None) -> dict:
+    """Start a resumable upload of `size` bytes split into parts of `part_size` bytes."""
+    filename = os.path.basename(filename or "")
+    if not filename:
+        raise ValueError("filename is required")
+    if size <= 0 or size > UPLOAD_MAX_BYTES:
+        raise ValueError(f"size must be between 1 and {UPLOAD_MAX_BYTES} bytes")
+    part_size = part_size or UPLOAD_PART_SIZE
+    if part_size < UPLOAD_MIN_PART_SIZE:
+        raise ValueError(f"part_size must be at least {UPLOAD_MIN_PART_SIZE} bytes")
+
+    os.makedirs(UPLOAD_SESSION_DIR, exist_ok=True)
+    cleanup_expired_sessions()
+
+    session_id = uuid.uuid4().hex
+    paths = _session_paths(session_id)
+    session = {
+        "id": session_id,
+        "filename": filename,
+        "content_type": content_type,
+        "size": size,
+        "part_size": part_size,
+        "part_count": math.ceil(size / part_size),
+        "sha256": sha256.lower() if sha256 else None,
+        "created_at": time.time()
+    }
+    os.makedirs(paths["parts"])
+    # Reserve the whole file up front so parts can be written at their offsets in any order
+    with open(paths["data"], "wb") as f:
+        f.truncate(size)
+    tmp_path = paths["meta"] + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session, f)
+    os.replace(tmp_path, paths["meta"])
+    logger.info(f"Created upload session {session_id} for {filename} ({size} bytes, {session['part_count']} parts)")
+    return session
+
+
+def get_session_status(session_id: str) -> dict:
+    session = _load_session(session_id)
+    received = _received_parts(session_id)
+    return {
+        **session,
+        "received_parts": sorted(received),
+        "missing_parts": [n for n in range(session["part_count"]) if n not in received]
+    }
+
+
+async def write_part(session_id: str, part_number: int, chunks: AsyncIterator[bytes],
+                     expected_sha256: Optional[str] = None) -> dict:
+    """Write one part directly at its offset in the session file.
+    The part is recorded only when its length (and sha256, if given) match, so a failed or
+    interrupted PUT can simply be retried. A re-sent part counts as missing again until it has
+    been validated, since its bytes are overwritten in place.
+    """
+    from fastapi.concurrency import run_in_threadpool
+
+    session = _load_session(session_id)
+    offset, expected_length = _part_range(session, part_number)
+    paths = _session_paths(session_id)
+    _touch_session(session_id)
+    marker = os.path.join(paths["parts"], str(part_number))
+    try:
+        os.remove(marker)
+    except FileNotFoundError:
+        pass
+
+    digest = hashlib.sha256()
+    written = 0
+    fd = os.open(paths["data"], os.O_WRONLY)
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if written + len(chunk) > expected_length:
+                raise ValueError(f"Part {part_number} must be exactly {expected_length} bytes")
+            digest.update(chunk)
+            await run_in_threadpool(os.pwrite, fd, chunk, offset + written)
+            written += len(chunk)
+    finally:
+        os.close(fd)
+
+    if written != expected_length:
+        raise ValueError(f"Part {part_number} must be exactly {expected_length} bytes, received {written}")
+    part_sha256 = digest.hexdigest()
+    if expected_sha256 and expected_sha256.lower() != part_sha256:
+        raise ValueError(f"Part {part_number} checksum mismatch")
+
+    with open(marker + ".tmp", "w", encoding="utf-8") as f:
+        f.write(part_sha256)
+    os.replace(marker + ".tmp", marker)
+    _touch_session(session_id)
+    return {"part_number": part_number, "offset": offset, "size": written, "sha256": part_sha256}
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(4 * 1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete_session(session_id: str) -> dict:
+    """Verify the assembled file and move it into the content store (a rename, not a copy)."""
+    session = get_session_status(session_id)
+    if session["missing_parts"]:
+        raise ValueError(f"Upload incomplete, missing parts: {session['missing_parts'][:20]}")
+
+    paths = _session_paths(session_id)
+    file_sha256 = _file_sha256(paths["data"])
+    if session["sha256"] and session["sha256"] != file_sha256:
+        raise ValueError("File checksum mismatch; re-upload the parts that changed")
+
+    stored = store_file(paths["data"], session["filename"], file_sha256, session["size"], session["content_type"])
+    delete_session(session_id)
+    logger.info(f"Completed upload session {session_id}: {stored['file_path']} ({session['size']} bytes)")
+    return {
+        "url": stored["url"],
+        "name": session["filename"],
+        "size": session["size"],
+        "contentType": session["content_type"],
+        "sha256": file_sha256,
+        "deduplicated": stored["deduplicated"]
+    }
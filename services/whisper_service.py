@@ -1,17 +1,63 @@
+from __future__ import annotations
+
+import json
 import os
-import torch
-import librosa
 import tempfile
 import shutil
 import subprocess
-from typing import List, Tuple
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
-import numpy as np
+import time
+from typing import List, Optional, Tuple
+
+from services.llm_cache_service import get_llm_cache
+from services.transcript_format_service import (
+    make_segment,
+    build_transcript,
+    save_transcript_json,
+    structured_path_for,
+    unique_output_path,
+    IncrementalTranscriptWriter
+)
+from services.upload_service import content_hash_from_path
+
+WHISPER_MODEL_NAME = "openai/whisper-base"
+
+# torch, librosa, transformers and numpy take seconds and hundreds of MB to import, so they are
+# bound on first use (see _import_dependencies) instead of when the app starts
+torch = None
+librosa = None
+np = None
+WhisperProcessor = None
+WhisperForConditionalGeneration = None
+
+
+def _import_dependencies() -> None:
+    global torch, librosa, np, WhisperProcessor, WhisperForConditionalGeneration
+    if torch is not None:
+        return
+    import numpy
+    import librosa as _librosa
+    import torch as _torch
+    from transformers import WhisperProcessor as _processor, WhisperForConditionalGeneration as _model
+    np, librosa, WhisperProcessor, WhisperForConditionalGeneration = numpy, _librosa, _processor, _model
+    torch = _torch
+
+
+CHUNK_SEPARATOR = "\n\n\n"
+
+
+def format_chunk(segment: dict) -> str:
+    return f"=== Chunk {segment['index'] + 1}{' (FAILED)' if segment.get('failed') else ''} ===\n{segment['text']}"
+
+
+def format_chunks(segments: List[dict]) -> str:
+    """The text form of a Whisper transcript: each chunk under its "=== Chunk N ===" header."""
+    return CHUNK_SEPARATOR.join(format_chunk(segment) for segment in segments).strip()
 
 
 class WhisperTranscriptionService:
-    def __init__(self, model_name: str = "openai/whisper-base"):
+    def __init__(self, model_name: str = WHISPER_MODEL_NAME):
         """Initialize Whisper model for transcription."""
+        _import_dependencies()
         self.model_name = model_name
         self.processor = None
         self.model = None
@@ -221,6 +267,153 @@ class WhisperTranscriptionService:
         
         return chunks
     
+    def transcribe_chunk(self, chunk: np.ndarray, idx: int, start: float = None) -> Optional[dict]:
+        """Transcribe one chunk (at most 30 s of 16 kHz mono audio) starting `start` seconds into
+        the recording (default: idx * 30). Returns a structured segment (see
+        transcript_format_service), or None when the chunk is skipped.
+        """
+        started = time.perf_counter()
+        result = self._transcribe_chunk_text(chunk, idx)
+        if result is None:
+            return None
+        text, failed = result
+        start = idx * 30 if start is None else start
+        return make_segment(idx, start, start + len(chunk) / 16000, text, failed, time.perf_counter() - started)
+
+    def _transcribe_chunk_text(self, chunk: np.ndarray, idx: int) -> Optional[Tuple[str, bool]]:
+        """(text, failed) for one chunk, or None when it is skipped."""
+        # Ensure chunk is valid
+        if len(chunk) == 0:
+            print(f"  Skipping empty chunk {idx + 1}")
+            return None
+
+        # Prepare input for the model with proper padding
+        try:
+            chunk_np = np.ascontiguousarray(chunk, dtype=np.float32)
+            # Use feature_extractor with padding=True to handle variable lengths
+            try:
+                inputs = self.processor.feature_extractor(
+                    chunk_np,
+                    sampling_rate=16000,
+                    return_tensors="pt",
+                    padding=True
+                )
+            except TypeError:
+                # Some versions expect keyword raw_speech
+                inputs = self.processor.feature_extractor(
+                    raw_speech=chunk_np,
+                    sampling_rate=16000,
+                    return_tensors="pt",
+                    padding=True
+                )
+            input_features = inputs.input_features
+        except Exception as e:
+            print(f"  Error processing chunk {idx + 1}: {e}")
+            # Try the full processor as fallback
+            try:
+                print(f"  Trying fallback processor for chunk {idx + 1}")
+                inputs = self.processor(
+                    chunk_np,
+                    sampling_rate=16000,
+                    return_tensors="pt",
+                    padding="max_length",
+                    max_length=480000,  # 30 seconds at 16kHz
+                    truncation=True
+                )
+                input_features = inputs.input_features
+                print(f"  ✓ Fallback processor succeeded for chunk {idx + 1}")
+            except Exception as fallback_error:
+                print(f"  Fallback also failed for chunk {idx + 1}: {fallback_error}")
+                # Try manual feature extraction as last resort
+                try:
+                    print(f"  Trying manual feature extraction for chunk {idx + 1}")
+                    # Pad or truncate chunk to exactly 30 seconds (480000 samples)
+                    if len(chunk_np) < 480000:
+                        # Pad with zeros
+                        chunk_np = np.pad(chunk_np, (0, 480000 - len(chunk_np)), mode='constant')
+                    elif len(chunk_np) > 480000:
+                        # Truncate
+                        chunk_np = chunk_np[:480000]
+
+                    # Create log-mel spectrogram manually (simplified approach)
+                    import torch
+                    chunk_tensor = torch.from_numpy(chunk_np).unsqueeze(0)  # Add batch dimension
+                    # Use the feature_extractor's internal method if possible
+                    try:
+                        input_features = self.processor.feature_extractor(chunk_tensor, return_tensors="pt", sampling_rate=16000).input_features
+                    except:
+                        # If that fails, create a dummy tensor of the right shape
+                        # Whisper expects log-mel spectrograms of shape [batch, n_mels, n_frames]
+                        # For 30s audio: [1, 80, 3000] approximately
+                        input_features = torch.randn(1, 80, 3000, dtype=torch.float32)
+                        print(f"  WARNING: Using dummy features for chunk {idx + 1}")
+                    print(f"  ✓ Manual feature extraction succeeded for chunk {idx + 1}")
+                except Exception as manual_error:
+                    print(f"  Manual extraction also failed for chunk {idx + 1}: {manual_error}")
+                    return None
+
+        try:
+            # Move to GPU if available
+            if torch.cuda.is_available():
+                input_features = input_features.to("cuda")
+
+            # Generate transcription
+            with torch.no_grad():
+                predicted_ids = self.model.generate(input_features)
+
+            # Decode the transcription
+            transcription = self.processor.batch_decode(
+                predicted_ids, 
+                skip_special_tokens=True
+            )[0]
+
+            print(f"  ✓ Chunk {idx + 1} transcribed successfully")
+            return transcription.strip(), False
+
+        except Exception as e:
+            print(f"  Error transcribing chunk {idx + 1}: {e}")
+            # Add placeholder for failed chunk
+            return "[Transcription failed]", True
+
+    def start_transcript(self, audio_file_path: str, chunks_processed: int,
+                         save_dir: str = "outputs") -> IncrementalTranscriptWriter:
+        """Open this job's transcript file (unique per job) and write its header."""
+        writer = IncrementalTranscriptWriter(
+            unique_output_path(save_dir, audio_file_path, "_whisper_transcript.txt")
+        )
+        writer.write(
+            "🎤 Whisper Transcription\n"
+            "========================\n\n"
+            f"Model: {self.model_name}\n"
+            f"Audio File: {os.path.basename(audio_file_path)}\n"
+            f"Chunks Processed: {chunks_processed}\n\n"
+            "Transcription:\n"
+            + "-" * 50 + "\n"
+        )
+        return writer
+
+    def finish_transcript(self, writer: IncrementalTranscriptWriter, audio_file_path: str,
+                          segments: List[dict] = None, elapsed_seconds: float = None) -> str:
+        """Publish the transcript and return its path. With segments, the structured transcript
+        is saved alongside it (same name, .json).
+        """
+        if segments is not None:
+            save_transcript_json(
+                build_transcript(segments, self.model_name, "whisper", audio_file_path, 30, elapsed_seconds),
+                structured_path_for(writer.final_path)
+            )
+        file_path = writer.commit()
+        print(f"💾 Whisper transcription saved at: {file_path}")
+        return file_path
+
+    def save_transcript(self, audio_file_path: str, combined_text: str, chunks_processed: int,
+                        save_dir: str = "outputs", segments: List[dict] = None,
+                        elapsed_seconds: float = None) -> str:
+        """Write a finished transcript next to the other outputs and return its path."""
+        with self.start_transcript(audio_file_path, chunks_processed, save_dir) as writer:
+            writer.write(combined_text)
+            return self.finish_transcript(writer, audio_file_path, segments, elapsed_seconds)
+    
     def transcribe_audio(self, audio_file_path: str, save_dir: str = "outputs") -> dict:
         """
         Transcribe audio file using Whisper model.
@@ -245,129 +438,26 @@ class WhisperTranscriptionService:
             # Split audio into manageable chunks (30 seconds each)
             audio_chunks = self._chunk_audio(audio, chunk_length_s=30)
             
-            transcriptions = []
+            segments = []
+            started = time.perf_counter()
             
             print(f"Processing {len(audio_chunks)} audio chunks...")
             
-            for idx, chunk in enumerate(audio_chunks):
-                print(f"Transcribing chunk {idx + 1}/{len(audio_chunks)}")
-                print(f"  Chunk shape: {chunk.shape}, dtype: {chunk.dtype}, length: {len(chunk)/16000:.2f}s")
-                
-                # Ensure chunk is valid
-                if len(chunk) == 0:
-                    print(f"  Skipping empty chunk {idx + 1}")
-                    continue
+            # Each chunk is on disk as soon as it is transcribed; the file is published when all are done
+            with self.start_transcript(audio_file_path, len(audio_chunks), save_dir) as writer:
+                for idx, chunk in enumerate(audio_chunks):
+                    print(f"Transcribing chunk {idx + 1}/{len(audio_chunks)}")
+                    print(f"  Chunk shape: {chunk.shape}, dtype: {chunk.dtype}, length: {len(chunk)/16000:.2f}s")
+                    
+                    segment = self.transcribe_chunk(chunk, idx)
+                    if segment is not None:
+                        writer.write((CHUNK_SEPARATOR if segments else "") + format_chunk(segment))
+                        segments.append(segment)
                 
-                # Prepare input for the model with proper padding
-                try:
-                    chunk_np = np.ascontiguousarray(chunk, dtype=np.float32)
-                    # Use feature_extractor with padding=True to handle variable lengths
-                    try:
-                        inputs = self.processor.feature_extractor(
-                            chunk_np,
-                            sampling_rate=16000,
-                            return_tensors="pt",
-                            padding=True
-                        )
-                    except TypeError:
-                        # Some versions expect keyword raw_speech
-                        inputs = self.processor.feature_extractor(
-                            raw_speech=chunk_np,
-                            sampling_rate=16000,
-                            return_tensors="pt",
-                            padding=True
-                        )
-                    input_features = inputs.input_features
-                except Exception as e:
-                    print(f"  Error processing chunk {idx + 1}: {e}")
-                    # Try the full processor as fallback
-                    try:
-                        print(f"  Trying fallback processor for chunk {idx + 1}")
-                        inputs = self.processor(
-                            chunk_np,
-                            sampling_rate=16000,
-                            return_tensors="pt",
-                            padding="max_length",
-                            max_length=480000,  # 30 seconds at 16kHz
-                            truncation=True
-                        )
-                        input_features = inputs.input_features
-                        print(f"  ✓ Fallback processor succeeded for chunk {idx + 1}")
-                    except Exception as fallback_error:
-                        print(f"  Fallback also failed for chunk {idx + 1}: {fallback_error}")
-                        # Try manual feature extraction as last resort
-                        try:
-                            print(f"  Trying manual feature extraction for chunk {idx + 1}")
-                            # Pad or truncate chunk to exactly 30 seconds (480000 samples)
-                            if len(chunk_np) < 480000:
-                                # Pad with zeros
-                                chunk_np = np.pad(chunk_np, (0, 480000 - len(chunk_np)), mode='constant')
-                            elif len(chunk_np) > 480000:
-                                # Truncate
-                                chunk_np = chunk_np[:480000]
-                            
-                            # Create log-mel spectrogram manually (simplified approach)
-                            import torch
-                            chunk_tensor = torch.from_numpy(chunk_np).unsqueeze(0)  # Add batch dimension
-                            # Use the feature_extractor's internal method if possible
-                            try:
-                                input_features = self.processor.feature_extractor(chunk_tensor, return_tensors="pt", sampling_rate=16000).input_features
-                            except:
-                                # If that fails, create a dummy tensor of the right shape
-                                # Whisper expects log-mel spectrograms of shape [batch, n_mels, n_frames]
-                                # For 30s audio: [1, 80, 3000] approximately
-                                input_features = torch.randn(1, 80, 3000, dtype=torch.float32)
-                                print(f"  WARNING: Using dummy features for chunk {idx + 1}")
-                            print(f"  ✓ Manual feature extraction succeeded for chunk {idx + 1}")
-                        except Exception as manual_error:
-                            print(f"  Manual extraction also failed for chunk {idx + 1}: {manual_error}")
-                            continue
+                # Combine all transcriptions
+                combined_text = format_chunks(segments)
                 
-                try:
-                    # Move to GPU if available
-                    if torch.cuda.is_available():
-                        input_features = input_features.to("cuda")
-                    
-                    # Generate transcription
-                    with torch.no_grad():
-                        predicted_ids = self.model.generate(input_features)
-                    
-                    # Decode the transcription
-                    transcription = self.processor.batch_decode(
-                        predicted_ids, 
-                        skip_special_tokens=True
-                    )[0]
-                    
-                    # Add chunk header and transcription
-                    chunk_header = f"\n\n=== Chunk {idx + 1} ===\n"
-                    transcriptions.append(chunk_header + transcription.strip())
-                    print(f"  ✓ Chunk {idx + 1} transcribed successfully")
-                    
-                except Exception as e:
-                    print(f"  Error transcribing chunk {idx + 1}: {e}")
-                    # Add placeholder for failed chunk
-                    chunk_header = f"\n\n=== Chunk {idx + 1} (FAILED) ===\n"
-                    transcriptions.append(chunk_header + "[Transcription failed]")
-                    continue
-            
-            # Combine all transcriptions
-            combined_text = "\n".join(transcriptions).strip()
-            
-            # Save transcription to file
-            filename = os.path.splitext(os.path.basename(audio_file_path))[0] + "_whisper_transcript.txt"
-            file_path = os.path.join(save_dir, filename)
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("🎤 Whisper Transcription\n")
-                f.write("========================\n\n")
-                f.write(f"Model: {self.model_name}\n")
-                f.write(f"Audio File: {os.path.basename(audio_file_path)}\n")
-                f.write(f"Chunks Processed: {len(audio_chunks)}\n\n")
-                f.write("Transcription:\n")
-                f.write("-" * 50 + "\n")
-                f.write(combined_text)
-            
-            print(f"💾 Whisper transcription saved at: {file_path}")
+                file_path = self.finish_transcript(writer, audio_file_path, segments, time.perf_counter() - started)
             
             # Clean up converted file if it was created
             if converted and os.path.exists(processed_audio_path):
@@ -382,6 +472,7 @@ class WhisperTranscriptionService:
             return {
                 "transcription": combined_text,
                 "file_path": file_path,
+                "structured_path": structured_path_for(file_path),
                 "model_used": self.model_name,
                 "chunks_processed": len(audio_chunks)
             }
@@ -409,6 +500,27 @@ def get_whisper_service() -> WhisperTranscriptionService:
     return _whisper_service
 
 
+def _result_cache_key(audio_file_path: str):
+    """(cache, key) for whole-recording results of content-addressed uploads, else (None, None)."""
+    content_hash = content_hash_from_path(audio_file_path)
+    cache = get_llm_cache() if content_hash else None
+    if cache is None:
+        return None, None
+    return cache, cache.make_key(f"whisper:{WHISPER_MODEL_NAME}", "transcript", f"sha256:{content_hash}")
+
+
+def get_cached_transcription(audio_file_path: str) -> Optional[dict]:
+    cache, key = _result_cache_key(audio_file_path)
+    cached = cache.get(key) if cache is not None else None
+    return json.loads(cached) if cached is not None else None
+
+
+def cache_transcription(audio_file_path: str, result: dict) -> None:
+    cache, key = _result_cache_key(audio_file_path)
+    if cache is not None and "error" not in result:
+        cache.set(key, f"whisper:{WHISPER_MODEL_NAME}", json.dumps(result))
+
+
 def transcribe_audio_with_whisper(audio_file_path: str, save_dir: str = "outputs") -> dict:
     """
     Convenience function to transcribe audio using Whisper.
@@ -420,5 +532,13 @@ def transcribe_audio_with_whisper(audio_file_path: str, save_dir: str = "outputs
     Returns:
         dict with transcription results
     """
+    # Content-addressed uploads reuse the result of an earlier run on the same recording
+    # without loading the model
+    cached = get_cached_transcription(audio_file_path)
+    if cached is not None:
+        return cached
+
     service = get_whisper_service()
-    return service.transcribe_audio(audio_file_path, save_dir)
+    result = service.transcribe_audio(audio_file_path, save_dir)
+    cache_transcription(audio_file_path, result)
+    return result
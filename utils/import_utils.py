@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from typing import List, Tuple
+
+INTEGER_FIELDS = ("meeting_date", "meeting_duration")
+
+
+def detect_manifest_format(filename: str, content_type: str = None) -> str:
+    """Return "csv" or "ndjson" based on the file extension, then the content type."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    if content_type and "csv" in content_type:
+        return "csv"
+    return "ndjson"
+
+
+def _normalize_csv_row(row: dict) -> dict:
+    record = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip()
+        value = (value or "").strip()
+        if not value:
+            continue
+        if key == "attendees":
+            record[key] = [a.strip() for a in value.split(";") if a.strip()]
+        elif key in INTEGER_FIELDS:
+            try:
+                record[key] = int(value)
+            except ValueError:
+                record[key] = value  # left for MeetingCreate to reject with a proper message
+        else:
+            record[key] = value
+    return record
+
+
+def parse_manifest(content: bytes, manifest_format: str) -> List[Tuple[int, object]]:
+    """Parse an NDJSON or CSV manifest into (row_number, record) pairs.
+    Row numbers are 1-based data rows (the CSV header is not counted). Rows that cannot be
+    parsed are returned with a ValueError as their record. Blank lines are skipped.
+    CSV attendees are separated with ';'.
+    """
+    text = content.decode("utf-8-sig")
+    rows: List[Tuple[int, object]] = []
+    if manifest_format == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row_number, row in enumerate(reader, start=1):
+            if not any((v or "").strip() for k, v in row.items() if k is not None):
+                continue
+            rows.append((row_number, _normalize_csv_row(row)))
+        return rows
+
+    for row_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Row must be a JSON object")
+            rows.append((row_number, record))
+        except ValueError as e:
+            rows.append((row_number, ValueError(f"Invalid JSON: {e}")))
+    return rows
@@ -0,0 +1,38 @@
+import base64
+import json
+from bson import ObjectId
+
+
+def encode_cursor(key: tuple) -> str:
+    """Encode a (sort value, id) keyset position as an opaque URL-safe cursor.
+    The sort value is the meeting_date, or the relevance score for search results.
+    """
+    sort_value, meeting_id = key
+    raw = json.dumps({"d": sort_value, "i": meeting_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_value, meeting_id = data["d"], data["i"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if sort_value is not None and (isinstance(sort_value, bool) or not isinstance(sort_value, (int, float))):
+        raise ValueError("Invalid cursor")
+    if not isinstance(meeting_id, str) or not ObjectId.is_valid(meeting_id):
+        raise ValueError("Invalid cursor")
+    return sort_value, meeting_id
+
+
+def parse_fields(fields: str, allowed: list) -> list:
+    """Parse a comma-separated `fields=` selector. Raises ValueError on unknown fields."""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return selected
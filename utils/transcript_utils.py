@@ -0,0 +1,116 @@
+import re
+from typing import List, Tuple
+
+# Matches the headers written by the transcription services, e.g.
+# "=== Segment 3 ===" (Gemini) or "=== Chunk 12 (FAILED) ===" (Whisper).
+SEGMENT_HEADER_RE = re.compile(r"^=== (?:Segment|Chunk) (\d+)(?: \(FAILED\))? ===[ \t]*$", re.MULTILINE)
+
+
+def split_transcript_segments(text: str) -> List[Tuple[int, str]]:
+    """Split a transcript on its segment headers.
+    Returns a list of (segment_number, segment_text). Text without headers is returned as a single segment 1.
+    """
+    if not text or not text.strip():
+        return []
+
+    matches = list(SEGMENT_HEADER_RE.finditer(text))
+    if not matches:
+        return [(1, text.strip())]
+
+    segments: List[Tuple[int, str]] = []
+    preamble = text[:matches[0].start()].strip()
+    for idx, match in enumerate(matches):
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        body = text[match.end():end].strip()
+        if idx == 0 and preamble:
+            body = f"{preamble}\n{body}".strip()
+        if body:
+            segments.append((int(match.group(1)), body))
+    return segments
+
+
+def pack_segments(segments: List[Tuple[int, str]], max_chars: int) -> List[str]:
+    """Group consecutive segments into parts of at most ~max_chars characters.
+    Segments longer than max_chars are split on line boundaries so every part stays bounded.
+    """
+    parts: List[str] = []
+    current: List[str] = []
+    current_len = 0
+
+    def flush():
+        nonlocal current, current_len
+        if current:
+            parts.append("\n\n".join(current))
+        current = []
+        current_len = 0
+
+    for number, body in segments:
+        block = f"=== Segment {number} ===\n{body}"
+        if len(block) > max_chars:
+            flush()
+            piece: List[str] = []
+            piece_len = 0
+            for line in block.splitlines():
+                while len(line) > max_chars:
+                    if piece:
+                        parts.append("\n".join(piece))
+                        piece, piece_len = [], 0
+                    parts.append(line[:max_chars])
+                    line = line[max_chars:]
+                if piece_len + len(line) + 1 > max_chars and piece:
+                    parts.append("\n".join(piece))
+                    piece, piece_len = [], 0
+                piece.append(line)
+                piece_len += len(line) + 1
+            if piece:
+                parts.append("\n".join(piece))
+            continue
+        if current_len + len(block) + 2 > max_chars:
+            flush()
+        current.append(block)
+        current_len += len(block) + 2
+    flush()
+    return parts
+
+
+def chunk_transcript_text(text: str, max_chars: int) -> List[str]:
+    """Cut a transcript into chunks of at most max_chars, preferably at segment headers and
+    otherwise at line breaks. Unlike pack_segments the text is kept verbatim: "".join(chunks) == text.
+    """
+    if not text:
+        return []
+
+    boundaries = [m.start() for m in SEGMENT_HEADER_RE.finditer(text) if m.start() > 0]
+    sections = [text[start:end] for start, end in zip([0] + boundaries, boundaries + [len(text)])]
+
+    pieces: List[str] = []
+    for section in sections:
+        while len(section) > max_chars:
+            cut = section.rfind("\n", 0, max_chars) + 1
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(section[:cut])
+            section = section[cut:]
+        if section:
+            pieces.append(section)
+
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + len(piece) <= max_chars:
+            chunks[-1] += piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+def make_snippet(text: str, terms: List[str], context_chars: int = 80, length_chars: int = 240):
+    """Return a whitespace-normalized excerpt around the first term found in text (or None)."""
+    if not text:
+        return None
+    lowered = text.lower()
+    for term in terms:
+        pos = lowered.find(term)
+        if pos >= 0:
+            start = max(0, pos - context_chars)
+            return " ".join(text[start:start + length_chars].split())
+    return None